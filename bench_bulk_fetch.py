@@ -0,0 +1,131 @@
+import json
+import random
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fpl_xp.bulk_fetch import BulkFetcher
+from fpl_xp.fpl_data import SnapshotStore
+
+N_PLAYERS = 670
+
+
+def summary(player_id):
+    """The mock element-summary payload for ``player_id``."""
+    history = [{'element': player_id, 'round': gameweek, 'minutes': (player_id * gameweek) % 91,
+                'total_points': (player_id + gameweek) % 9} for gameweek in range(1, 11)]
+    return json.dumps({'fixtures': [], 'history': history, 'history_past': []}).encode()
+
+
+class MockFPLServer(ThreadingHTTPServer):
+    """Serves ``/api/element-summary/<id>/`` with injected latency and errors.
+
+    Each request sleeps for ``latency`` (a (low, high) range in seconds), then
+    fails with a 500, a 429 or a dropped connection at the given rates. Ids
+    in ``missing`` always return 404.
+    """
+
+    daemon_threads = True
+    request_queue_size = 256
+
+    def __init__(self, latency=(0.02, 0.06), error_rate=0.05, throttle_rate=0.02, drop_rate=0.01, missing=(), seed=0):
+        super().__init__(('127.0.0.1', 0), MockHandler)
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.drop_rate = drop_rate
+        self.missing = set(missing)
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.requests = 0
+
+    @property
+    def url_template(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/api/element-summary/{{}}/"
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+
+class MockHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'  # Keep-alive, so the client's connection pool is exercised
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body=b'', headers=()):
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.requests += 1
+            roll = server.rng.random()
+            delay = server.rng.uniform(*server.latency)
+        time.sleep(delay)
+        parts = self.path.strip('/').split('/')
+        if len(parts) != 3 or parts[:2] != ['api', 'element-summary'] or int(parts[2]) in server.missing:
+            return self._send(404, b'"The game is being updated."')
+        if roll < server.drop_rate:
+            self.close_connection = True
+            return self.connection.shutdown(2)  # Hang up without answering
+        roll -= server.drop_rate
+        if roll < server.error_rate:
+            return self._send(500, b'Internal Server Error')
+        roll -= server.error_rate
+        if roll < server.throttle_rate:
+            return self._send(429, b'Too Many Requests', [('Retry-After', '0.05')])
+        self._send(200, summary(int(parts[2])), [('Content-Type', 'application/json')])
+
+
+def check_store(store, url_template, ids):
+    """Asserts every fetched body in ``store`` is the payload the server sent."""
+    for player_id in ids:
+        assert store.read(store.get(url_template.format(player_id))['digest']) == summary(player_id), player_id
+
+
+def run_benchmark(levels=(1, 4, 16, 64)):
+    """Times a full element-summary sweep against concurrency and checks failures are reported."""
+    ids = list(range(1, N_PLAYERS + 1))
+    missing = set(ids[::97])
+    print(f"{N_PLAYERS} players, 20-60 ms latency, 5% 500s, 2% 429s, 1% dropped connections, "
+          f"{len(missing)} missing players")
+    for concurrency in levels:
+        with MockFPLServer(missing=missing) as server, tempfile.TemporaryDirectory() as cache_dir:
+            store = SnapshotStore(cache_dir)
+            fetcher = BulkFetcher(server.url_template, store, concurrency=concurrency, rate=10000,
+                                  retries=6, backoff=0.05, timeout=5)
+            report = fetcher.fetch(ids)
+            assert set(report.failed) == missing, report
+            assert sorted(report.fetched) == sorted(set(ids) - missing)
+            check_store(SnapshotStore(cache_dir), server.url_template, report.fetched)  # Index made it to disk
+            print(f"  concurrency {concurrency:>3}: {report.elapsed:6.2f} s, {server.requests} requests, "
+                  f"{report.retries} retries, {len(report.failed)} failed")
+
+            resumed = BulkFetcher(server.url_template, store, concurrency=concurrency, rate=10000,
+                                  retries=0, ttl=3600).fetch(ids)
+            assert len(resumed.cached) == len(report.fetched), resumed
+
+    # The token bucket holds the rate no matter how many workers are waiting
+    rate, burst, n = 100, 10, 200
+    with MockFPLServer(latency=(0, 0), error_rate=0, throttle_rate=0, drop_rate=0) as server, \
+            tempfile.TemporaryDirectory() as cache_dir:
+        report = BulkFetcher(server.url_template, SnapshotStore(cache_dir), concurrency=64,
+                             rate=rate, burst=burst).fetch(range(1, n + 1))
+        assert report.ok and report.elapsed >= (n - burst) / rate * 0.95, report
+        print(f"  rate limit {rate}/s: {n} requests in {report.elapsed:.2f} s ({n / report.elapsed:.0f}/s)")
+
+
+if __name__ == '__main__':
+    run_benchmark()
@@ -0,0 +1,73 @@
+import json
+import subprocess
+import sys
+import time
+
+# Cold-start budgets (seconds, best of several runs) for the light subcommands,
+# and the heavy packages each of them must not import
+TARGETS = {
+    ('--help',): (0.15, ('numpy', 'pandas', 'requests', 'scipy', 'sklearn')),
+    ('score', '--offline', '--top', '5'): (1.0, ('requests', 'scipy', 'sklearn', 'joblib')),
+    ('team', '--offline', '--method', 'simple'): (1.0, ('requests', 'scipy', 'sklearn', 'joblib')),
+}
+# Heavy subcommands are reported for reference only
+REFERENCE = [
+    ('team', '--offline'),
+    ('score', '--offline', '--top', '5', '--model', 'random_forest'),
+]
+HEAVY_MODULES = ('numpy', 'pandas', 'requests', 'scipy', 'sklearn', 'joblib')
+
+# Runs the CLI in a fresh interpreter and reports which heavy modules it loaded
+HARNESS = """
+import contextlib, io, json, sys
+from fpl_xp.cli import main
+with contextlib.redirect_stdout(io.StringIO()):
+    try:
+        main(sys.argv[1:])
+    except SystemExit:
+        pass
+print(json.dumps(sorted(name for name in {heavy} if name in sys.modules)))
+"""
+
+
+def cold_start(argv, repeats=5):
+    """Returns (best wall time, heavy modules imported) for ``fpl-xp argv`` in a fresh interpreter."""
+    best, loaded = float('inf'), None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', HARNESS.format(heavy=HEAVY_MODULES), *argv],
+                                capture_output=True, text=True, check=True)
+        best = min(best, time.perf_counter() - start)
+        loaded = json.loads(result.stdout.strip().splitlines()[-1])
+    return best, loaded
+
+
+def run_benchmark(repeats=5):
+    """Measures every subcommand and returns the list of budget violations."""
+    start = time.perf_counter()
+    for _ in range(repeats):
+        subprocess.run([sys.executable, '-c', 'pass'], check=True)
+    print(f"{'python -c pass':<50} {(time.perf_counter() - start) / repeats * 1000:7.0f} ms")
+
+    failures = []
+    for argv, (budget, forbidden) in TARGETS.items():
+        elapsed, loaded = cold_start(argv, repeats)
+        bad_imports = sorted(set(loaded) & set(forbidden))
+        status = 'ok' if elapsed <= budget and not bad_imports else 'FAIL'
+        print(f"{'fpl-xp ' + ' '.join(argv):<50} {elapsed * 1000:7.0f} ms (budget {budget * 1000:.0f} ms) "
+              f"loads {', '.join(loaded) or 'nothing heavy'} [{status}]")
+        if elapsed > budget:
+            failures.append(f"{' '.join(argv)}: {elapsed:.2f} s > {budget:.2f} s")
+        if bad_imports:
+            failures.append(f"{' '.join(argv)}: imported {', '.join(bad_imports)}")
+    for argv in REFERENCE:
+        elapsed, loaded = cold_start(argv, repeats=1)
+        print(f"{'fpl-xp ' + ' '.join(argv):<50} {elapsed * 1000:7.0f} ms loads {', '.join(loaded)}")
+    return failures
+
+
+if __name__ == '__main__':
+    failures = run_benchmark()
+    if failures:
+        print("Cold-start targets missed:\n  " + "\n  ".join(failures))
+        sys.exit(1)
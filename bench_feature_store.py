@@ -0,0 +1,109 @@
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from fpl_xp.feature_store import FeatureStore
+from fpl_xp.history import build_player_history
+from fpl_xp.storage import read_table
+from fpl_xp.synthetic import synthetic_dataset
+
+INCREMENTAL_STEPS = 5
+
+
+def as_of(fixtures, gameweek):
+    """Returns the fixture list as it stood when ``gameweek`` was the next one to play."""
+    fixtures = fixtures.copy()
+    fixtures.loc[fixtures['event'] >= gameweek, 'finished'] = False
+    return fixtures
+
+
+def fetched_history(players, fixtures):
+    """Returns element-summary style history: one row per player and finished fixture of their team.
+
+    Stats come from the rebuild from fixture stats (zeros when the player
+    did not feature), so the table grows with the player pool as the API's does.
+    """
+    finished = fixtures[fixtures['finished'].astype(bool)]
+    sides = pd.concat([
+        pd.DataFrame({'fixture': finished['id'], 'round': finished['event'], 'team': finished['team_h'],
+                      'was_home': True}),
+        pd.DataFrame({'fixture': finished['id'], 'round': finished['event'], 'team': finished['team_a'],
+                      'was_home': False}),
+    ])
+    rows = sides.merge(players[['id', 'team']].rename(columns={'id': 'element'}), on='team').drop(columns='team')
+    stats = build_player_history(fixtures, players).rename(columns={'event': 'round'})
+    columns = ['total_points', 'minutes', 'goals_scored', 'assists', 'bps']
+    rows = rows.merge(stats[['element', 'round'] + columns], on=['element', 'round'], how='left')
+    rows[columns] = rows[columns].fillna(0).astype(np.int64)
+    rows['expected_goals'] = rows['goals_scored'] * 0.9  # The rebuild has no xG
+    return rows.sort_values(['round', 'element'], ignore_index=True)
+
+
+def same_tables(full_root, incremental_root, gameweeks):
+    """Checks both stores hold the same features (players unseen so far count as zeros)."""
+    for gameweek in gameweeks:
+        full = read_table(os.path.join(full_root, f"gw{gameweek}.table")).set_index('id')
+        incremental = read_table(os.path.join(incremental_root, f"gw{gameweek}.table")).set_index('id')
+        incremental = incremental.reindex(full.index).fillna(0)
+        assert np.allclose(full.to_numpy(dtype=np.float64), incremental.to_numpy(dtype=np.float64)), gameweek
+
+
+def run(scale, seasons):
+    players, fixtures = synthetic_dataset(scale, seasons=seasons, next_gameweek=30)
+    history = fetched_history(players, fixtures)
+    last = int(fixtures.loc[fixtures['finished'].astype(bool), 'event'].max())
+    print(f"{scale:g}x, {seasons} season(s): {len(players)} players, {len(history)} player-gameweeks, "
+          f"{last} finished gameweeks")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        full_root, incremental_root = os.path.join(tmp_dir, 'full'), os.path.join(tmp_dir, 'incremental')
+        start = time.perf_counter()
+        FeatureStore(full_root).update(history, fixtures)
+        full_time = time.perf_counter() - start
+
+        # Build up to a few gameweeks ago, then add the rest one finished gameweek at a time
+        FeatureStore(incremental_root).update(history, as_of(fixtures, last - INCREMENTAL_STEPS + 1))
+        step_times = []
+        for gameweek in range(last - INCREMENTAL_STEPS + 2, last + 2):
+            start = time.perf_counter()
+            report = FeatureStore(incremental_root).update(history, as_of(fixtures, gameweek))
+            step_times.append(time.perf_counter() - start)
+            assert not report['full'] and report['built'] == [gameweek], report
+        start = time.perf_counter()
+        assert FeatureStore(incremental_root).update(history, fixtures)['built'] == []
+        hit_time = time.perf_counter() - start
+        same_tables(full_root, incremental_root, FeatureStore(full_root).gameweeks())
+
+        # A late correction to a stored gameweek's minutes or points rebuilds the store
+        for column in ('minutes', 'total_points'):
+            corrected = history.copy()
+            corrected.loc[corrected.index[corrected['round'] == last - 1][:1], column] += 1
+            assert FeatureStore(incremental_root).update(corrected, fixtures)['full'], column
+        FeatureStore(incremental_root).update(history, fixtures)
+
+        start = time.perf_counter()
+        training = FeatureStore(full_root).training_frame(history, players, fixtures)
+        training_time = time.perf_counter() - start
+
+    print(f"  full build           {full_time * 1000:9.1f} ms")
+    print(f"  incremental gameweek {np.median(step_times) * 1000:9.1f} ms (median of {len(step_times)}, "
+          f"{full_time / np.median(step_times):.0f}x faster), identical features")
+    print(f"  up-to-date check     {hit_time * 1000:9.1f} ms")
+    print(f"  training frame       {training_time * 1000:9.1f} ms ({len(training)} rows)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Full vs incremental rolling-form feature builds.')
+    parser.add_argument('--scales', type=float, nargs='+', default=[1, 10])
+    parser.add_argument('--seasons', type=int, default=3)
+    args = parser.parse_args()
+    for scale in args.scales:
+        run(scale, args.seasons)
+
+
+if __name__ == '__main__':
+    main()
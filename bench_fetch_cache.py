@@ -0,0 +1,163 @@
+import json
+import tempfile
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from fpl_xp.fpl_data import FPLDataFetcher
+
+
+class CachingFPLServer(ThreadingHTTPServer):
+    """Serves ``/api/bootstrap-static/`` and ``/api/fixtures/`` with ETag and Last-Modified validators.
+
+    A request whose ``If-None-Match`` matches the current version gets a 304.
+    ``publish`` bumps the version, as a gameweek update does. The headers of
+    every request are kept in ``log``.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), CachingHandler)
+        self.lock = threading.Lock()
+        self.log = []
+        self.version = 0
+        self.modified = formatdate(usegmt=True)
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/api/"
+
+    def publish(self):
+        with self.lock:
+            self.version += 1
+            self.modified = formatdate(time.time() + self.version, usegmt=True)
+
+    def body(self, path):
+        return json.dumps({'path': path, 'version': self.version}).encode()
+
+    def requests_since(self, start):
+        with self.lock:
+            return self.log[start:]
+
+    def __enter__(self):
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.shutdown()
+        self.server_close()
+
+
+class CachingHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.log.append((self.path, self.headers.get('If-None-Match'), self.headers.get('If-Modified-Since')))
+            etag, modified, body = f'"v{server.version}"', server.modified, server.body(self.path)
+        if self.path not in ('/api/bootstrap-static/', '/api/fixtures/'):
+            body, status = b'{}', 404
+        elif self.headers.get('If-None-Match') == etag:
+            body, status = b'', 304
+        else:
+            status = 200
+        self.send_response(status)
+        self.send_header('ETag', etag)
+        self.send_header('Last-Modified', modified)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - start
+
+
+def run_checks():
+    """Walks the fetcher through every cache layer and asserts what reaches the server."""
+    with CachingFPLServer() as server, tempfile.TemporaryDirectory() as cache_dir:
+        def fetcher(**options):
+            return FPLDataFetcher(cache_dir=cache_dir, base_url=server.base_url, **options)
+
+        FPLDataFetcher.clear_memory_cache()
+        url = fetcher().PLAYER_URL
+
+        # Cold: one unconditional request, stored with its validators
+        mark = len(server.log)
+        data, cold_time = timed(lambda: fetcher(ttl=3600).get_json(url))
+        assert data == {'path': '/api/bootstrap-static/', 'version': 0}
+        assert server.requests_since(mark) == [('/api/bootstrap-static/', None, None)]
+        entry = fetcher().store.get(url)
+        assert entry['etag'] == '"v0"' and entry['last_modified'] == server.modified
+
+        # In-process cache: shared by every fetcher, even one with an expired TTL
+        mark = len(server.log)
+        _, memory_time = timed(lambda: fetcher(ttl=0).get_json(url))
+        assert len(server.requests_since(mark)) == 0
+        assert (None, url) in FPLDataFetcher._memory_cache
+
+        # Disk cache within the TTL: no request
+        FPLDataFetcher.clear_memory_cache()
+        mark = len(server.log)
+        data, disk_time = timed(lambda: fetcher(ttl=3600).get_json(url))
+        assert data['version'] == 0 and len(server.requests_since(mark)) == 0
+
+        # TTL expired: a conditional request, answered with 304 and served from disk
+        FPLDataFetcher.clear_memory_cache()
+        fetched_at = fetcher().store.get(url)['fetched_at']
+        mark = len(server.log)
+        data, revalidate_time = timed(lambda: fetcher(ttl=0).get_json(url))
+        assert data['version'] == 0
+        assert server.requests_since(mark) == [('/api/bootstrap-static/', '"v0"', entry['last_modified'])]
+        assert fetcher().store.get(url)['fetched_at'] > fetched_at  # 304 refreshes the entry
+
+        # Revalidated entries are fresh again for the TTL
+        FPLDataFetcher.clear_memory_cache()
+        mark = len(server.log)
+        fetcher(ttl=3600).get_json(url)
+        assert len(server.requests_since(mark)) == 0
+
+        # New content on the server: the conditional request gets a 200 and the store moves on
+        server.publish()
+        FPLDataFetcher.clear_memory_cache()
+        mark = len(server.log)
+        data = fetcher(ttl=0).get_json(url)
+        assert data['version'] == 1
+        assert server.requests_since(mark) == [('/api/bootstrap-static/', '"v0"', entry['last_modified'])]
+        assert fetcher().store.get(url)['etag'] == '"v1"'
+
+        # Replay: a saved snapshot is served without any request, even after the server moves on
+        recorder = fetcher(ttl=3600)
+        recorder.get_json(url)
+        recorder.get_json(recorder.FIXTURE_URL)
+        recorder.save_snapshot('gw1')
+        server.publish()
+        FPLDataFetcher.clear_memory_cache()
+        mark = len(server.log)
+        replayer = fetcher(ttl=0, replay='gw1')
+        assert replayer.get_json(url)['version'] == 1
+        assert replayer.get_json(replayer.FIXTURE_URL) == {'path': '/api/fixtures/', 'version': 1}
+        assert len(server.requests_since(mark)) == 0
+        try:
+            replayer.get_json(replayer.ELEMENT_SUMMARY_URL.format(1))
+        except LookupError:
+            pass
+        else:
+            raise AssertionError('Replay fetched a URL missing from the snapshot')
+        assert len(server.requests_since(mark)) == 0
+        FPLDataFetcher.clear_memory_cache()
+
+    print(f"{len(server.log)} requests in total; cold {cold_time * 1000:.1f} ms, disk {disk_time * 1000:.2f} ms, "
+          f"memory {memory_time * 1e6:.0f} us, 304 revalidation {revalidate_time * 1000:.1f} ms, replay 0 requests")
+
+
+if __name__ == '__main__':
+    run_checks()
@@ -0,0 +1,127 @@
+import copy
+import statistics
+import time
+
+import numpy as np
+import pandas as pd
+
+from fpl_xp.fixture_matrix import FixtureMatrix
+from fpl_xp.incremental import POSITIONS, RESCORE_SIZE, IncrementalScorer
+from fpl_xp.xp_engine import project_expected_points
+
+MIN_SPEEDUP = 1.5
+MIN_PLAYERS = 50_000  # Smaller pools rescore fully in a few milliseconds, mostly fixed per-call costs
+SMALL_REPEATS = 51  # Runs per update for pools below MIN_PLAYERS, whose updates take well under 5 ms
+MAX_SLOWDOWN = 1.1  # Timing noise allowed when checking that small pools are no slower than a full rescore
+
+
+def scale_players(player_df, factor):
+    """Repeats the player table ``factor`` times with fresh ids."""
+    players = pd.concat([player_df] * factor, ignore_index=True)
+    players['id'] = np.arange(1, len(players) + 1)
+    return players
+
+
+def changes(player_df, fixtures_df, seed=0):
+    """Yields (label, players, fixtures) snapshots, each applying one kind of change to the last."""
+    rng = np.random.default_rng(seed)
+    players, fixtures = player_df.copy(), fixtures_df.copy()
+    upcoming = fixtures.index[~fixtures['finished'].astype(bool)]
+    next_gameweek = fixtures.loc[upcoming, 'event'].min()
+    next_fixtures = fixtures.index[fixtures['event'] == next_gameweek]
+
+    yield 'no change', players.copy(), fixtures.copy()
+
+    rows = rng.choice(len(players), 5, replace=False)
+    players.loc[rows, 'now_cost'] += 1
+    yield 'price change (5 players)', players.copy(), fixtures.copy()
+
+    rows = rng.choice(len(players), 10, replace=False)
+    players.loc[rows, 'minutes'] += 90
+    players.loc[rows[:4], 'goals_scored'] += 1
+    yield 'stats update (10 players)', players.copy(), fixtures.copy()
+
+    fixture = next_fixtures[0]
+    fixtures.loc[fixture, 'team_h_difficulty'] = fixtures.loc[fixture, 'team_h_difficulty'] % 5 + 1
+    yield 'difficulty change (1 fixture)', players.copy(), fixtures.copy()
+
+    fixture = next_fixtures[1]
+    fixtures.loc[fixture, 'event'] = next_gameweek + 5
+    yield 'fixture rescheduled', players.copy(), fixtures.copy()
+
+    yield 'shuffled rows', players.sample(frac=1, random_state=seed).copy(), fixtures.copy()
+
+    rows = rng.choice(len(players), len(players) // 2, replace=False)
+    players.loc[rows, 'minutes'] += 90
+    yield 'half the pool changed', players.copy(), fixtures.copy()
+
+
+def check_against_full(scorer, players, fixtures):
+    """Asserts the incremental state equals a from-scratch scoring of the same snapshot."""
+    matrix = FixtureMatrix.from_fixtures(fixtures, horizon=scorer.horizon)
+    full = project_expected_points(players, matrix, rule=scorer.rule)
+    stored = pd.DataFrame(scorer.points, index=scorer.ids).loc[players['id']].to_numpy()
+    np.testing.assert_allclose(stored, full, rtol=0, atol=1e-12)
+
+    scores = scorer.scores
+    for position in (None,) + POSITIONS:
+        rows = np.arange(len(scores))
+        if position is not None:
+            rows = rows[scorer.element_type == position]
+        expected = rows[np.lexsort((rows, -scores[rows]))]
+        assert np.array_equal(scorer.rankings[position].rows, expected), position
+
+
+def timed_updates(scorer, players, fixtures, repeats):
+    """Median times of applying one snapshot incrementally and with a fresh scorer.
+
+    Every incremental run starts from its own copy of ``scorer``'s state,
+    all made up front, and the two kinds of runs alternate so that both see
+    the same cache and clock conditions.
+    """
+    states = [copy.deepcopy(scorer) for _ in range(repeats)]
+    incremental, full = [], []
+    for state in states:
+        start = time.perf_counter()
+        report = state.update(players, fixtures)
+        incremental.append(time.perf_counter() - start)
+        fresh = IncrementalScorer(horizon=scorer.horizon)
+        start = time.perf_counter()
+        fresh.update(players, fixtures)
+        full.append(time.perf_counter() - start)
+    return statistics.median(incremental), statistics.median(full), report
+
+
+def run_benchmark(player_df, fixtures_df, scales=(1, 10, 100), horizon=3, repeats=7, min_speedup=MIN_SPEEDUP,
+                  min_players=MIN_PLAYERS):
+    """Times incremental updates against full rescoring for each kind of change.
+
+    In pools of up to ``RESCORE_SIZE`` players no update may be slower than
+    a full rescore of the same snapshot (within ``MAX_SLOWDOWN`` of timing
+    noise). From ``min_players`` up, every update that stays incremental
+    must be at least ``min_speedup`` times faster.
+    """
+    slow = []
+    for factor in scales:
+        players = scale_players(player_df, factor)
+        scorer = IncrementalScorer(horizon=horizon)
+        scorer.update(players, fixtures_df)
+        print(f"{factor}x ({len(players)} players)")
+        runs = SMALL_REPEATS if len(players) < min_players else repeats
+        for label, new_players, new_fixtures in changes(players, fixtures_df):
+            incremental, full, report = timed_updates(scorer, new_players, new_fixtures, runs)
+            scorer.update(new_players, new_fixtures)
+            check_against_full(scorer, new_players, new_fixtures)
+            print(f"  {label:<30} rescored {report['rescored']:>6} ({'full' if report['full'] else 'incremental'}), "
+                  f"{incremental * 1000:7.2f} ms vs full {full * 1000:7.2f} ms ({full / incremental:4.1f}x)")
+            if len(players) <= RESCORE_SIZE and incremental > full * MAX_SLOWDOWN:
+                slow.append(f"{factor}x {label} (slower than a full rescore)")
+            elif not report['full'] and len(players) >= min_players and full < min_speedup * incremental:
+                slow.append(f"{factor}x {label} (less than {min_speedup}x faster)")
+    assert not slow, f"Incremental updates too slow: {slow}"
+    print(f"No update of a pool up to {RESCORE_SIZE} players is slower than a full rescore, and every incremental "
+          f"update from {min_players} players up is at least {min_speedup}x faster")
+
+
+if __name__ == '__main__':
+    run_benchmark(pd.read_csv('fpl_player_data.csv'), pd.read_csv('fixture_info.csv'))
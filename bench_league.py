@@ -0,0 +1,138 @@
+import os
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from fpl_xp.analyzers import FixtureAnalyzer, PlayerAnalyzer
+from fpl_xp.league import RULED_OUT, LeagueSquads
+from fpl_xp.squad_evaluator import XI_LIMITS, XI_SIZE
+from fpl_xp.storage import PICKS_SCHEMA, read_table, write_table
+from fpl_xp.synthetic import synthetic_picks
+
+N_MANAGERS = 100_000
+LOOP_MANAGERS = 5_000
+
+
+def loop_projection(picks, player_df, plays):
+    """Per-manager reference: walks each squad's picks in Python, as a TeamSelector-style loop would.
+
+    Players who do not play score nothing, the vice-captain takes the armband
+    from an absent captain and the bench, in order, replaces absent starters
+    when the formation can still reach its minimums.
+    """
+    expected = dict(zip(player_df['id'], player_df['expected_points']))
+    playing = dict(zip(player_df['id'], plays))
+    kind = dict(zip(player_df['id'], player_df['element_type']))
+    points = {}
+    for entry, squad in picks.groupby('entry', sort=True):
+        total, captain, vice_captain = 0.0, None, None
+        starters, bench = [], []
+        for pick in squad.sort_values('position').itertuples():
+            if playing[pick.element]:
+                total += pick.multiplier * expected[pick.element]
+            if pick.is_captain:
+                captain = pick
+            if pick.is_vice_captain:
+                vice_captain = pick
+            (starters if pick.position <= XI_SIZE else bench).append(pick.element)
+        if captain is not None and vice_captain is not None and not playing[captain.element] \
+                and playing[vice_captain.element]:
+            total += (captain.multiplier - 1) * expected[vice_captain.element]
+
+        keeper_absent = any(kind[element] == 1 and not playing[element] for element in starters)
+        on = {position: sum(kind[element] == position and playing[element] for element in starters)
+              for position in (2, 3, 4)}
+        empty = sum(kind[element] != 1 and not playing[element] for element in starters)
+        for element in bench:
+            if not playing[element]:
+                continue
+            if kind[element] == 1:
+                if keeper_absent:
+                    total += expected[element]
+                    keeper_absent = False
+                continue
+            on[kind[element]] += 1
+            missing = sum(max(XI_LIMITS[position][0] - on[position], 0) for position in on)
+            if empty > 0 and missing <= empty - 1:
+                total += expected[element]
+                empty -= 1
+            else:
+                on[kind[element]] -= 1
+        points[entry] = total
+    return pd.Series(points)
+
+
+def timed(function, repeats=5):
+    times = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        times.append(time.perf_counter() - start)
+    return result, min(times)
+
+
+def main():
+    players = pd.read_csv('fpl_player_data.csv')
+    fixtures = pd.read_csv('fixture_info.csv')
+    player_df = PlayerAnalyzer(players, FixtureAnalyzer(fixtures)).player_df
+    expected_points = player_df['expected_points'].to_numpy()
+    plays = ~player_df['status'].astype(str).isin(RULED_OUT).to_numpy()
+
+    start = time.perf_counter()
+    picks = synthetic_picks(player_df, N_MANAGERS)
+    print(f"Generated {N_MANAGERS} squads ({len(picks)} picks) in {time.perf_counter() - start:.2f} s")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        table, csv = os.path.join(tmp_dir, 'picks.table'), os.path.join(tmp_dir, 'picks.csv')
+        write_table(picks, table, PICKS_SCHEMA)
+        picks.to_csv(csv, index=False)
+        _, table_time = timed(lambda: read_table(table), repeats=3)
+        _, csv_time = timed(lambda: read_table(csv, schema=PICKS_SCHEMA), repeats=3)
+        print(f"Load picks: table {table_time * 1000:.1f} ms, CSV {csv_time * 1000:.1f} ms")
+        picks = read_table(table)
+
+    squads, build_time = timed(lambda: LeagueSquads.from_picks(picks, player_df['id'].to_numpy(),
+                                                               player_df['element_type'].to_numpy()), repeats=3)
+    _, project_time = timed(lambda: squads.project(expected_points, plays))
+    league, evaluate_time = timed(lambda: squads.evaluate(expected_points, plays))
+    print(f"Build matrix: {build_time * 1000:.1f} ms ({squads.matrix.nnz} non-zeros, "
+          f"{(squads.matrix.data.nbytes + squads.matrix.indices.nbytes + squads.matrix.indptr.nbytes) / 1e6:.1f} MB)")
+    print(f"Project {N_MANAGERS} managers: {project_time * 1000:.2f} ms; with ranks: {evaluate_time * 1000:.2f} ms")
+
+    tracemalloc.start()
+    squads.evaluate(expected_points, plays)
+    print(f"Peak memory of one evaluation: {tracemalloc.get_traced_memory()[1] / 1e6:.1f} MB")
+    tracemalloc.stop()
+
+    # Check against the per-manager loop on a subset and extrapolate its time
+    subset = picks[picks['entry'] <= LOOP_MANAGERS]
+    start = time.perf_counter()
+    reference = loop_projection(subset, player_df, plays)
+    loop_time = (time.perf_counter() - start) * N_MANAGERS / LOOP_MANAGERS
+    projected = league.set_index('entry')['projected_points'].reindex(reference.index)
+    assert np.allclose(projected.to_numpy(), reference.to_numpy()), "Sparse projection differs from the loop"
+    ranks = league.set_index('entry')['projected_rank']
+    assert (ranks.sort_values().diff().dropna() >= 0).all() and ranks.min() == 1
+    print(f"Matches the per-manager loop on {LOOP_MANAGERS} managers; the loop would take "
+          f"~{loop_time:.1f} s for {N_MANAGERS} ({loop_time / evaluate_time:.0f}x slower)")
+
+    # Everyone playing, and a third of the players (every subset manager's captain among them) ruled out
+    subset_squads = LeagueSquads.from_picks(subset, player_df['id'].to_numpy(), player_df['element_type'].to_numpy())
+    everyone = np.ones(len(player_df), dtype=bool)
+    rng = np.random.default_rng(0)
+    absent = rng.random(len(player_df)) < 1 / 3
+    absent[np.isin(player_df['id'].to_numpy(), subset.loc[subset['is_captain'], 'element'].to_numpy())] = True
+    for label, check_plays in (('without plays', None), ('everyone playing', everyone), ('a third ruled out', ~absent)):
+        reference = loop_projection(subset, player_df, everyone if check_plays is None else check_plays)
+        projected = subset_squads.project(expected_points, check_plays)
+        assert np.allclose(projected, reference.reindex(subset_squads.entries).to_numpy()), \
+            f"Sparse projection differs from the loop ({label})"
+    print(f"Matches the loop on {LOOP_MANAGERS} managers without plays, with everyone playing and with a third "
+          f"of the players (every captain among them) ruled out")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+import argparse
+import os
+import tempfile
+import time
+
+from fpl_xp.feature_store import FeatureStore
+from fpl_xp.history import build_player_history
+from fpl_xp.model_search import ModelSearch, expand_grid
+from fpl_xp.synthetic import synthetic_dataset
+
+GRID = {
+    'random_forest': {'n_estimators': [50], 'min_samples_leaf': [1, 5]},
+    'gradient_boosting': {'learning_rate': [0.1]},
+    'ridge': {'alpha': [1.0, 10.0]},
+    'mean': {},
+}
+
+
+def timed(label, function):
+    start = time.perf_counter()
+    result = function()
+    print(f"  {label:<34} {time.perf_counter() - start:8.2f} s")
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Cold, cached and one-extra-point model search runs.')
+    parser.add_argument('--seasons', type=int, default=1)
+    parser.add_argument('--workers', type=int, nargs='+', default=sorted({1, os.cpu_count()}))
+    args = parser.parse_args()
+
+    players, fixtures = synthetic_dataset(1, seasons=args.seasons, next_gameweek=30)
+    history = build_player_history(fixtures, players)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        feature_store = FeatureStore(os.path.join(tmp_dir, 'features'))
+        feature_store.update(history, fixtures)
+        training = feature_store.training_frame(history, players, fixtures)
+        print(f"{len(training)} rows x {training['gameweek'].nunique()} gameweeks, "
+              f"{len(expand_grid(GRID))} candidates x 5 folds")
+        leaderboards = []
+        for workers in args.workers:
+            cache_dir = os.path.join(tmp_dir, f"search{workers}")
+            print(f"{workers} worker(s):")
+            leaderboards.append(timed("cold cache", lambda: ModelSearch(training, cache_dir=cache_dir).run(GRID, workers)))
+            timed("everything cached", lambda: ModelSearch(training, cache_dir=cache_dir).run(GRID, workers))
+            extra = dict(GRID, ridge={'alpha': [1.0, 10.0, 100.0]})
+            leaderboard = timed("one extra grid point", lambda: ModelSearch(training, cache_dir=cache_dir).run(extra, workers))
+            assert leaderboard['cached_folds'].sum() == (len(leaderboard) - 1) * 5
+        for leaderboard in leaderboards[1:]:
+            assert leaderboard[['model', 'params', 'mse']].equals(leaderboards[0][['model', 'params', 'mse']])
+        print(leaderboards[0][['rank', 'model', 'params', 'mse', 'mae', 'fit_seconds']].to_string(index=False))
+
+
+if __name__ == '__main__':
+    main()
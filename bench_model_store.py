@@ -0,0 +1,47 @@
+import shutil
+import tempfile
+import time
+
+import pandas as pd
+
+from fpl_xp.fixture_matrix import FixtureMatrix
+from fpl_xp.ml_model import predict_points, train_model
+from fpl_xp.model_store import ModelStore
+from fpl_xp.xp_engine import project_expected_points
+
+
+def scored_players(player_df, fixtures_df, gameweek):
+    """Returns the player table with ml_xp's training target for ``gameweek``."""
+    fixture_matrix = FixtureMatrix.from_fixtures(fixtures_df, start_gameweek=gameweek)
+    return player_df.assign(expected_points=project_expected_points(player_df, fixture_matrix, rule='positive')[:, 0])
+
+
+def timed(label, function):
+    start = time.perf_counter()
+    result = function()
+    print(f"{label:<38} {(time.perf_counter() - start) * 1000:8.1f} ms")
+    return result
+
+
+def run_benchmark(player_df, fixtures_df, gameweek=10):
+    """Compares training from scratch against store hits and warm starts."""
+    this_week = scored_players(player_df, fixtures_df, gameweek)
+    next_week = scored_players(player_df, fixtures_df, gameweek + 1)
+    root = tempfile.mkdtemp()
+    try:
+        timed("Train, 1 core (original ml_xp)", lambda: train_model(this_week))
+        timed("Train, all cores", lambda: train_model(this_week, n_jobs=-1))
+        store = ModelStore(root)
+        timed("Store miss (train + save)", lambda: store.get_or_train(this_week, gameweek=gameweek))
+        model, info = timed("Store hit (memory-mapped load)", lambda: ModelStore(root).get_or_train(this_week, gameweek=gameweek))
+        assert info['source'] == 'cache'
+        timed("Predict, all cores", lambda: predict_points(model, this_week))
+        model, info = timed("New gameweek (warm start +20 trees)",
+                            lambda: store.get_or_train(next_week, gameweek=gameweek + 1))
+        assert info['source'] == 'warm_start', info['source']
+    finally:
+        shutil.rmtree(root)
+
+
+if __name__ == '__main__':
+    run_benchmark(pd.read_csv('fpl_player_data.csv'), pd.read_csv('fixture_info.csv'))
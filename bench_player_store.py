@@ -0,0 +1,135 @@
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from fpl_xp.player_store import PlayerStore, TeamSelector
+from fpl_xp.squad_evaluator import FORMATIONS, SQUAD_QUOTAS
+
+
+# Row-wise reference implementation of the original properfplcalc classes, kept
+# here so the player store can be checked and timed against it.
+class LegacyPlayer:
+    def __init__(self, player_data):
+        self.id = player_data['id']
+        self.first_name = player_data['first_name']
+        self.second_name = player_data['second_name']
+        self.team = player_data['team']
+        self.position = player_data['element_type']
+        self.total_points = player_data['total_points']
+        self.minutes = player_data['minutes']
+        self.goals_scored = player_data['goals_scored']
+        self.assists = player_data['assists']
+        self.clean_sheets = player_data['clean_sheets']
+        self.bonus = player_data['bonus']
+        self.status = player_data['status']
+
+    def is_available(self):
+        return self.status == 'a'
+
+    def calculate_expected_points(self):
+        return self.total_points + self.goals_scored * 4 + self.assists * 3 + self.clean_sheets * 1 + self.bonus
+
+
+class LegacyTeamSelector:
+    def __init__(self, players_data):
+        self.players = [LegacyPlayer(player) for _, player in players_data.iterrows()
+                        if LegacyPlayer(player).is_available()]
+
+    def select_squad(self):
+        # Best 2/5/5/3 by total points, then the formation with the most expected points;
+        # available players are certain to play, so the bench never comes on
+        sorted_players = sorted(self.players, key=lambda player: player.total_points, reverse=True)
+        by_position = {position: sorted([player for player in sorted_players if player.position == position][:quota],
+                                        key=lambda player: player.calculate_expected_points(), reverse=True)
+                       for position, quota in SQUAD_QUOTAS.items()}
+        best_points, starting_11 = None, None
+        for defenders, midfielders, forwards in FORMATIONS:
+            candidate = (by_position[1][:1] + by_position[2][:defenders] + by_position[3][:midfielders] +
+                         by_position[4][:forwards])
+            points = sum(player.calculate_expected_points() for player in candidate)
+            if best_points is None or points > best_points:
+                best_points, starting_11 = points, candidate
+        outfield_bench = [player for position in (2, 3, 4) for player in by_position[position]
+                          if player not in starting_11]
+        outfield_bench.sort(key=lambda player: player.calculate_expected_points(), reverse=True)
+        return starting_11, by_position[1][1:] + outfield_bench
+
+    def calculate_squad_expected_points(self):
+        starting_11, bench = self.select_squad()
+        return sum(player.calculate_expected_points() for player in starting_11), 0.0
+
+
+def scale_players(player_df, factor):
+    """Repeats the player table ``factor`` times with fresh ids, like a multi-season archive."""
+    players = pd.concat([player_df] * factor, ignore_index=True)
+    players['id'] = np.arange(1, len(players) + 1)
+    return players
+
+
+def check_equivalence(player_df):
+    """Asserts the store-backed selector picks the same squad and points as the legacy one."""
+    legacy, current = LegacyTeamSelector(player_df), TeamSelector(player_df)
+    for legacy_players, players in zip(legacy.select_squad(), current.select_squad()):
+        # Players on equal expected points may come in either order
+        assert sorted(p.id for p in legacy_players) == sorted(p.id for p in players)
+        legacy_players = sorted(legacy_players, key=lambda p: p.id)
+        for legacy_player, player in zip(legacy_players, sorted(players, key=lambda p: p.id)):
+            for attribute in ('first_name', 'second_name', 'team', 'position', 'total_points', 'minutes',
+                              'goals_scored', 'assists', 'clean_sheets', 'bonus', 'status'):
+                assert getattr(legacy_player, attribute) == getattr(player, attribute), attribute
+    np.testing.assert_allclose(current.calculate_squad_expected_points(),
+                               legacy.calculate_squad_expected_points(), rtol=0, atol=1e-9)
+    assert len(legacy.players) == len(current.players)
+    store = current.store
+    for row in range(len(store)):
+        assert store.row_for_id(store.ids[row]) == row
+    for team in np.unique(store.team):
+        assert np.array_equal(np.sort(store.rows_for_team(team)), np.flatnonzero(store.team == team))
+    print(f"{len(player_df)} players: squads, attributes and points match")
+
+
+def measure(build):
+    """Returns (seconds, bytes retained) for building an object with ``build``."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    built = build()
+    elapsed = time.perf_counter() - start
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del built
+    return elapsed, retained
+
+
+def run_benchmark(player_df, scales=(1, 10, 100)):
+    """Times and sizes the legacy per-row selector against the player store at several pool sizes."""
+    results = []
+    for factor in scales:
+        players = scale_players(player_df, factor)
+        legacy_time, legacy_bytes = measure(lambda: LegacyTeamSelector(players))
+        store_time, store_bytes = measure(lambda: TeamSelector(players))
+        # tracemalloc slows allocation-heavy code, so time the store again untraced
+        start = time.perf_counter()
+        selector = TeamSelector(players)
+        store_time = min(store_time, time.perf_counter() - start)
+        start = time.perf_counter()
+        selector.calculate_squad_expected_points()
+        squad_time = time.perf_counter() - start
+        results.append((factor, len(players), legacy_time, store_time, legacy_bytes, store_bytes))
+        print(f"{factor:>4}x ({len(players):>6} players): build legacy {legacy_time * 1000:9.1f} ms, "
+              f"store {store_time * 1000:6.2f} ms ({legacy_time / store_time:6.0f}x); "
+              f"memory legacy {legacy_bytes / 2 ** 20:7.2f} MiB, store {store_bytes / 2 ** 20:5.2f} MiB "
+              f"({legacy_bytes / store_bytes:4.1f}x); squad {squad_time * 1000:.2f} ms")
+    return results
+
+
+if __name__ == '__main__':
+    player_data = pd.read_csv('fpl_player_data.csv')
+    check_equivalence(player_data)
+    check_equivalence(scale_players(player_data, 3))
+    archive = PlayerStore.from_frame(scale_players(player_data, 100))
+    assert archive.ids.dtype == np.int32 and archive.row_for_id(archive.ids[-1]) == len(archive) - 1
+    print(f"PlayerStore.nbytes for {len(player_data)} players: {PlayerStore.from_frame(player_data).nbytes()} bytes")
+    run_benchmark(player_data)
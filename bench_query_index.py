@@ -0,0 +1,96 @@
+import argparse
+import time
+
+import numpy as np
+
+from fpl_xp.analyzers import FixtureAnalyzer, PlayerAnalyzer
+from fpl_xp.query_index import PlayerIndex
+from fpl_xp.synthetic import synthetic_dataset
+
+N_QUERIES = 500
+
+
+def random_queries(rng, count):
+    """Returns a mix of the service's queries: top-N with and without position, price and minutes filters."""
+    positions = [None, 'Goalkeeper', 'Defender', 'Midfielder', 'Forward']
+    queries = []
+    for _ in range(count):
+        queries.append({
+            'n': int(rng.choice([5, 10, 20, 50])),
+            'position': positions[rng.integers(len(positions))],
+            'max_cost': float(rng.choice([4.5, 5.0, 5.5, 6.5, 8.0, 10.0])) if rng.random() < 0.7 else None,
+            'min_minutes': int(rng.choice([0, 0, 450, 900, 1350])),
+            'by': 'value' if rng.random() < 0.2 else 'points',
+        })
+    return queries
+
+
+def filter_and_sort(player_df, n, position, max_cost, min_minutes, by):
+    """Reference: what the service and CLI did before the index, filtering and re-sorting per query."""
+    selected = player_df
+    if position is not None:
+        selected = selected[selected['position'] == position]
+    if max_cost is not None:
+        selected = selected[selected['now_cost'] <= round(max_cost * 10)]
+    if min_minutes:
+        selected = selected[selected['minutes'] >= min_minutes]
+    if by == 'value':
+        selected = selected.assign(value=selected['expected_points'] / selected['now_cost'] * 10)
+    return selected.sort_values('expected_points' if by == 'points' else 'value', ascending=False).head(n)
+
+
+def same_answer(player_df, expected, rows, by):
+    """Both must return the same scores in order (players tied on score may swap)."""
+    got = player_df.iloc[rows]
+    if by == 'points':
+        return np.allclose(expected['expected_points'].to_numpy(), got['expected_points'].to_numpy())
+    return np.allclose(expected['value'].to_numpy(), (got['expected_points'] / got['now_cost'] * 10).to_numpy())
+
+
+def check_frontier(player_df, index):
+    """Every frontier player beats all cheaper players; best_under matches a brute-force scan."""
+    points, cost = player_df['expected_points'].to_numpy(), player_df['now_cost'].to_numpy()
+    frontier = index.frontier()
+    assert np.all(np.diff(cost[frontier]) > 0) and np.all(np.diff(points[frontier]) > 0)
+    for max_cost in np.arange(3.5, 15.0, 0.5):
+        affordable = cost <= round(max_cost * 10)
+        row = index.best_under(max_cost)
+        assert (row is None) == (not affordable.any())
+        if row is not None:
+            assert points[row] == points[affordable].max()
+
+
+def run(scale):
+    players, fixtures = synthetic_dataset(scale)
+    player_df = PlayerAnalyzer(players, FixtureAnalyzer(fixtures)).player_df
+    queries = random_queries(np.random.default_rng(0), N_QUERIES)
+
+    start = time.perf_counter()
+    index = PlayerIndex(player_df)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    expected = [filter_and_sort(player_df, **query) for query in queries]
+    reference_time = (time.perf_counter() - start) / len(queries)
+    start = time.perf_counter()
+    answers = [index.top(**query) for query in queries]
+    index_time = (time.perf_counter() - start) / len(queries)
+
+    for query, reference, rows in zip(queries, expected, answers):
+        assert same_answer(player_df, reference, rows, query['by']), query
+    check_frontier(player_df, index)
+    print(f"{scale:g}x ({len(player_df)} players): build {build_time * 1000:.1f} ms; per query "
+          f"filter-and-sort {reference_time * 1e6:.0f} us, index {index_time * 1e6:.1f} us "
+          f"({reference_time / index_time:.0f}x faster), {len(queries)} identical answers")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Indexed top-N queries vs filter-and-sort.')
+    parser.add_argument('--scales', type=float, nargs='+', default=[1, 10, 100])
+    args = parser.parse_args()
+    for scale in args.scales:
+        run(scale)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+import argparse
+import time
+import tracemalloc
+
+import numpy as np
+
+from fpl_xp.analyzers import FixtureAnalyzer, PlayerAnalyzer
+from fpl_xp.scenarios import MAX_CELLS, ScenarioSweep, scenario_grid
+from fpl_xp.synthetic import synthetic_dataset
+from fpl_xp.xp_engine import APPEARANCE_BONUS, MINUTES_POINTS, POSITION_POINTS, project_expected_points
+
+LOOP_SCENARIOS = 50
+
+
+def grid(n_slopes):
+    """About 150 x ``n_slopes`` scenarios over multiplier slopes, goal values and appearance bonuses."""
+    return scenario_grid(slopes=np.linspace(0, 0.3, n_slopes), goal_scales=np.linspace(0.5, 1.5, 10),
+                         minutes_points=[0.005, 0.01, 0.02], appearance_bonus=[0, 1, 2, 3, 4])
+
+
+def loop_points(player_df, fixture_matrix, scenario):
+    """Reference: one full ``project_expected_points`` run per scenario, as when editing the constants."""
+    position_points = {position: dict(points, **scenario.get('position_points', {}).get(position, {}))
+                       for position, points in POSITION_POINTS.items()}
+    return project_expected_points(player_df, fixture_matrix, difficulty_multiplier=scenario['difficulty_multiplier'],
+                                   position_points=position_points,
+                                   minutes_points=scenario.get('minutes_points', MINUTES_POINTS),
+                                   appearance_bonus=scenario.get('appearance_bonus', APPEARANCE_BONUS)).sum(axis=1)
+
+
+def run(scale, n_slopes, horizon):
+    players, fixtures = synthetic_dataset(scale, next_gameweek=10)
+    fixture_analyzer = FixtureAnalyzer(fixtures, horizon=horizon)
+    player_df = PlayerAnalyzer(players, fixture_analyzer).player_df
+    scenarios = grid(n_slopes)
+    sweep = ScenarioSweep(player_df, fixture_analyzer.fixture_matrix)
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    by_scenario, by_player = sweep.run(scenarios)
+    sweep_time = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    chunk = max(1, MAX_CELLS // len(player_df))
+    start = time.perf_counter()
+    for first in range(0, len(scenarios), chunk):
+        sweep.points(scenarios[first:first + chunk])
+    points_time = time.perf_counter() - start
+
+    # Checked scenarios are spread evenly over the whole grid, so every kind of override is covered
+    subset = [scenarios[i] for i in np.unique(np.linspace(0, len(scenarios) - 1, LOOP_SCENARIOS).round().astype(int))]
+    start = time.perf_counter()
+    reference = np.array([loop_points(player_df, fixture_analyzer.fixture_matrix, scenario) for scenario in subset])
+    loop_time = (time.perf_counter() - start) * len(scenarios) / len(subset)
+    assert np.allclose(sweep.points(subset), reference), "Sweep differs from project_expected_points"
+
+    print(f"{scale:g}x, horizon {horizon}: {len(scenarios)} scenarios x {len(player_df)} players: points in "
+          f"{points_time * 1000:.0f} ms, with rankings and picks {sweep_time * 1000:.0f} ms (peak {peak / 1e6:.0f} MB); "
+          f"a per-scenario loop would take ~{loop_time:.1f} s ({loop_time / points_time:.0f}x slower for the points); "
+          f"matches it on {len(subset)} scenarios from across the grid")
+    print(f"  captains: {by_scenario['captain'].value_counts().head(3).to_dict()}, "
+          f"rank correlation {by_scenario['rank_correlation'].min():.3f}-{by_scenario['rank_correlation'].max():.3f}, "
+          f"{int((by_player['top_share'] > 0).sum())} players reach the top 10")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Batched scenario sweep vs one projection per scenario.')
+    parser.add_argument('--scales', type=float, nargs='+', default=[1, 10])
+    parser.add_argument('--slopes', type=int, default=20, help='Slopes in the grid (x150 scenarios)')
+    parser.add_argument('--horizon', type=int, default=1)
+    args = parser.parse_args()
+    for scale in args.scales:
+        run(scale, args.slopes, args.horizon)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+import time
+
+import numpy as np
+import pandas as pd
+
+from fpl_xp.fixture_matrix import FixtureMatrix
+from fpl_xp.xp_engine import project_expected_points
+
+# Row-wise reference implementations of the three legacy code paths, kept here
+# so the vectorized engine can be checked against them.
+LEGACY_POSITION_POINTS = {
+    1: (10, 3, 4),
+    2: (6, 3, 4),
+    3: (5, 3, 1),
+    4: (4, 3, 0),
+}
+LEGACY_MULTIPLIER = {1: 1.2, 2: 1.1, 3: 1.0, 4: 0.9, 5: 0.8}
+
+GAMES_PLAYED_RULES = {
+    'above_one': lambda minutes: minutes / 90 if minutes > 1 else 1,   # xp_fpl.py
+    'positive': lambda minutes: minutes / 90 if minutes > 0 else 1,    # ml_xp.py
+    'clip': lambda minutes: max(minutes / 90, 1),                      # xp_fpl_c.py
+}
+
+
+def legacy_difficulty_dict(fixtures_df, keep):
+    """Builds the team difficulty dict the way the original scripts did."""
+    team_difficulty_dict = {}
+    for _, row in fixtures_df.iterrows():
+        for team, difficulty in ((row['team_h'], row['team_h_difficulty']), (row['team_a'], row['team_a_difficulty'])):
+            if keep == 'last' or team not in team_difficulty_dict:
+                team_difficulty_dict[team] = difficulty
+    return team_difficulty_dict
+
+
+def legacy_expected_points(player_df, team_difficulty_dict, rule):
+    """Scores every player with the original per-row apply."""
+    games_played_rule = GAMES_PLAYED_RULES[rule]
+
+    def calculate_expected_points(player_row):
+        fixture_difficulty = team_difficulty_dict.get(player_row['team'], 3)
+        difficulty_factor = LEGACY_MULTIPLIER.get(fixture_difficulty, 1.0)
+        goal_points, assist_points, clean_sheet_points = LEGACY_POSITION_POINTS.get(player_row['element_type'], (0, 0, 0))
+        games_played = games_played_rule(player_row['minutes'])
+        points = (
+            (player_row['goals_scored'] / games_played) * goal_points +
+            (player_row['assists'] / games_played) * assist_points +
+            (player_row['clean_sheets'] / games_played) * clean_sheet_points +
+            (player_row['minutes'] / games_played) * 0.01
+        )
+        points = points * difficulty_factor
+        if player_row['minutes'] >= 60:
+            points += 1
+        return points
+
+    return player_df.apply(calculate_expected_points, axis=1).to_numpy()
+
+
+def scale_players(player_df, factor):
+    """Repeats the player table ``factor`` times to simulate larger pools."""
+    return pd.concat([player_df] * factor, ignore_index=True)
+
+
+def next_gameweek_points(player_df, fixtures_df, rule='clip', gameweek=None):
+    """Scores one gameweek with the engine: a horizon-1 projection."""
+    fixture_matrix = FixtureMatrix.from_fixtures(fixtures_df, start_gameweek=gameweek, horizon=1)
+    return project_expected_points(player_df, fixture_matrix, rule=rule)[:, 0]
+
+
+def check_equivalence(player_df, fixtures_df, gameweeks=(None,)):
+    """Asserts a horizon-1 projection matches all three legacy code paths, one gameweek at a time.
+
+    Every team plays once in these gameweeks, so first- and last-wins
+    difficulty dicts agree and no team blanks.
+    """
+    for gameweek in gameweeks:
+        gameweek_fixtures = fixtures_df if gameweek is None else fixtures_df[fixtures_df['event'] == gameweek]
+        team_difficulty_dict = legacy_difficulty_dict(gameweek_fixtures, 'last')
+        for rule in GAMES_PLAYED_RULES:
+            expected = legacy_expected_points(player_df, team_difficulty_dict, rule)
+            actual = next_gameweek_points(player_df, gameweek_fixtures, rule, gameweek)
+            np.testing.assert_allclose(actual, expected, rtol=0, atol=1e-12)
+    print(f"Rules {', '.join(GAMES_PLAYED_RULES)}: {len(player_df)} players match on {len(gameweeks)} gameweek(s)")
+
+
+def run_benchmark(player_df, fixtures_df, scales=(1, 10, 100), repeats=3):
+    """Times the row-wise apply against the vectorized engine at several pool sizes."""
+    team_difficulty_dict = legacy_difficulty_dict(fixtures_df, 'last')
+    fixture_matrix = FixtureMatrix.from_fixtures(fixtures_df, horizon=1)
+    results = []
+    for factor in scales:
+        players = scale_players(player_df, factor)
+        timings = {}
+        for name, score in (('apply', lambda: legacy_expected_points(players, team_difficulty_dict, 'clip')),
+                            ('vectorized', lambda: project_expected_points(players, fixture_matrix))):
+            best = float('inf')
+            for _ in range(repeats if name == 'vectorized' or factor < 100 else 1):
+                start = time.perf_counter()
+                score()
+                best = min(best, time.perf_counter() - start)
+            timings[name] = best
+        results.append((factor, len(players), timings['apply'], timings['vectorized']))
+        print(f"{factor:>4}x ({len(players):>6} players): apply {timings['apply'] * 1000:9.2f} ms, "
+              f"vectorized {timings['vectorized'] * 1000:7.2f} ms, "
+              f"speedup {timings['apply'] / timings['vectorized']:8.1f}x")
+    return results
+
+
+if __name__ == '__main__':
+    player_data = pd.read_csv('fpl_player_data.csv')
+    fixtures_next_gameweek = pd.read_csv('fixtures_next_gameweek.csv')
+    check_equivalence(player_data, fixtures_next_gameweek)
+    fixture_info = pd.read_csv('fixture_info.csv')
+    check_equivalence(player_data, fixture_info, gameweeks=sorted(fixture_info['event'].dropna().unique().astype(int)))
+    run_benchmark(player_data, fixtures_next_gameweek)
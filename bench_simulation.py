@@ -0,0 +1,61 @@
+import os
+import sys
+import time
+
+import pandas as pd
+
+from fpl_xp.fixture_matrix import FixtureMatrix
+from fpl_xp.simulation import MAX_POINTS, PointsSimulator
+from fpl_xp.xp_engine import POSITION_POINTS
+
+TARGET_THROUGHPUT = 10_000_000  # Simulated player-gameweeks per second on one core
+CHECK_SIMS = 20_000
+
+
+def run_benchmark(player_df, fixtures_df, n_sims=100_000, chunk_sizes=(2_000, 10_000), workers=(1, os.cpu_count())):
+    """Times 100k-simulation gameweeks and reports player-gameweeks per second."""
+    simulator = PointsSimulator(player_df, FixtureMatrix.from_fixtures(fixtures_df))
+    best = 0.0
+    for chunk_size in chunk_sizes:
+        for worker_count in sorted(set(workers)):
+            start = time.perf_counter()
+            simulator.simulate(n_sims, chunk_size=chunk_size, workers=worker_count)
+            elapsed = time.perf_counter() - start
+            throughput = n_sims * len(player_df) / elapsed
+            best = max(best, throughput / worker_count)
+            print(f"{n_sims} sims, chunk {chunk_size:>6}, {worker_count} worker(s): {elapsed:6.2f} s, "
+                  f"{throughput / 1e6:6.1f}M player-gameweeks/s")
+    return best
+
+
+def check_subsets(player_df, fixtures_df):
+    """Subsets of the players match the full run, and assist and threshold settings are honoured."""
+    fixture_matrix = FixtureMatrix.from_fixtures(fixtures_df)
+    full = PointsSimulator(player_df, fixture_matrix).simulate(CHECK_SIMS)
+
+    # Whole teams keep their team rates, so their players' means agree within the simulation noise
+    teams = sorted(player_df['team'].unique())[:3]
+    subset = player_df[player_df['team'].isin(teams)]
+    partial = PointsSimulator(subset, fixture_matrix).simulate(CHECK_SIMS)
+    noise = 5 * (full.loc[subset.index, 'std_points'] + 0.1) / CHECK_SIMS ** 0.5
+    assert (abs(partial['mean_points'] - full.loc[subset.index, 'mean_points']) <= noise).all()
+    PointsSimulator(player_df.head(10), fixture_matrix).simulate(1000)
+
+    no_assists = {position: dict(points, assist=0) for position, points in POSITION_POINTS.items()}
+    without = PointsSimulator(player_df, fixture_matrix, position_points=no_assists).simulate(CHECK_SIMS)
+    assert without['mean_points'].sum() < full['mean_points'].sum()
+    try:
+        PointsSimulator(subset, fixture_matrix).simulate(1000, thresholds=(MAX_POINTS + 1,))
+    except ValueError:
+        pass
+    else:
+        raise AssertionError('Threshold above MAX_POINTS accepted')
+    print(f"Subsets of {len(subset)} and 10 players simulate; assist override removes "
+          f"{full['mean_points'].sum() - without['mean_points'].sum():.0f} points in total")
+
+
+if __name__ == '__main__':
+    check_subsets(pd.read_csv('fpl_player_data.csv'), pd.read_csv('fixture_info.csv'))
+    per_core = run_benchmark(pd.read_csv('fpl_player_data.csv'), pd.read_csv('fixture_info.csv'))
+    print(f"Best per-core throughput {per_core / 1e6:.1f}M/s (target {TARGET_THROUGHPUT / 1e6:.0f}M/s)")
+    sys.exit(0 if per_core >= TARGET_THROUGHPUT else 1)
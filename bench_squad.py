@@ -0,0 +1,105 @@
+import itertools
+import time
+
+import numpy as np
+import pandas as pd
+
+from fpl_xp.fixture_matrix import FixtureMatrix
+from fpl_xp.squad_optimizer import SQUAD_QUOTAS, XI_LIMITS, XI_SIZE, optimize_squad
+from fpl_xp.xp_engine import project_expected_points
+
+FORMATIONS = [
+    (d, m, XI_SIZE - 1 - d - m)
+    for d in range(XI_LIMITS[2][0], XI_LIMITS[2][1] + 1)
+    for m in range(XI_LIMITS[3][0], XI_LIMITS[3][1] + 1)
+    if XI_LIMITS[4][0] <= XI_SIZE - 1 - d - m <= XI_LIMITS[4][1]
+]
+
+
+def best_xi_points(points_by_position):
+    """Returns the best starting XI total for one squad, trying every valid formation."""
+    ordered = {position: np.sort(points)[::-1] for position, points in points_by_position.items()}
+    return ordered[1][0] + max(
+        ordered[2][:d].sum() + ordered[3][:m].sum() + ordered[4][:f].sum() for d, m, f in FORMATIONS
+    )
+
+
+def brute_force(pool, budget, bench_weight, locked=(), max_per_club=3):
+    """Enumerates every squad in a small pool and returns the best objective (or None)."""
+    best = None
+    by_position = {position: pool[pool['element_type'] == position] for position in SQUAD_QUOTAS}
+    combos = [itertools.combinations(range(len(by_position[position])), quota)
+              for position, quota in SQUAD_QUOTAS.items()]
+    for picks in itertools.product(*combos):
+        squad = pd.concat([by_position[position].iloc[list(pick)] for position, pick in zip(SQUAD_QUOTAS, picks)])
+        if squad['now_cost'].sum() > budget * 10 or squad['team'].value_counts().max() > max_per_club:
+            continue
+        if not set(locked) <= set(squad['id']):
+            continue
+        points = {position: squad.loc[squad['element_type'] == position, 'expected_points'].to_numpy()
+                  for position in SQUAD_QUOTAS}
+        xi = best_xi_points(points)
+        objective = bench_weight * squad['expected_points'].sum() + (1 - bench_weight) * xi
+        best = objective if best is None else max(best, objective)
+    return best
+
+
+def check_small_pools(player_df, trials=5, seed=0):
+    """Checks the optimizer against brute force on random small pools."""
+    rng = np.random.default_rng(seed)
+    sizes = {1: 3, 2: 6, 3: 6, 4: 4}
+    for trial in range(trials):
+        # Few clubs so the club cap binds, a tight budget so the budget binds
+        clubs = rng.choice(player_df['team'].unique(), size=7, replace=False)
+        candidates = player_df[player_df['team'].isin(clubs)]
+        pool = pd.concat([candidates[candidates['element_type'] == position].sample(size, random_state=int(rng.integers(1 << 30)))
+                          for position, size in sizes.items()])
+        cheapest = sum(pool.loc[pool['element_type'] == position, 'now_cost'].nsmallest(quota).sum()
+                       for position, quota in SQUAD_QUOTAS.items())
+        priciest = sum(pool.loc[pool['element_type'] == position, 'now_cost'].nlargest(quota).sum()
+                       for position, quota in SQUAD_QUOTAS.items())
+        budget = (cheapest + (priciest - cheapest) * rng.uniform(0.2, 0.6)) / 10
+        locked = [int(pool['id'].iloc[rng.integers(len(pool))])] if trial % 2 else []
+        bench_weight = [0.0, 0.1, 0.5][trial % 3]
+        expected = brute_force(pool, budget, bench_weight, locked)
+        selection = optimize_squad(pool, budget=budget, bench_weight=bench_weight, locked=locked)
+        actual = None if selection is None else selection.objective
+        if expected is None or actual is None:
+            assert expected is None and actual is None, (expected, actual)
+        else:
+            assert abs(expected - actual) < 1e-6, (expected, actual)
+        print(f"Trial {trial}: budget {budget:.1f}, bench weight {bench_weight}, locked {locked}: "
+              f"brute force {expected} == optimizer {actual}")
+
+
+def check_pruning(player_df):
+    """Checks dominance pruning does not change the optimum on the full pool."""
+    for budget in (80, 100, 120):
+        pruned = optimize_squad(player_df, budget=budget)
+        full = optimize_squad(player_df, budget=budget, prune=False)
+        assert abs(pruned.objective - full.objective) < 1e-6, (budget, pruned.objective, full.objective)
+        print(f"Budget {budget}: pruned and unpruned optimum agree ({pruned.objective:.3f})")
+
+
+def run_benchmark(player_df, scenarios=50, seed=0):
+    """Times repeated solves on the full pool under perturbed xP scenarios."""
+    rng = np.random.default_rng(seed)
+    timings = []
+    for _ in range(scenarios):
+        scenario = player_df.assign(expected_points=player_df['expected_points'] * rng.uniform(0.8, 1.2, len(player_df)))
+        start = time.perf_counter()
+        optimize_squad(scenario)
+        timings.append(time.perf_counter() - start)
+    timings = np.array(timings) * 1000
+    print(f"{scenarios} solves over {len(player_df)} players: mean {timings.mean():.1f} ms, "
+          f"p50 {np.percentile(timings, 50):.1f} ms, max {timings.max():.1f} ms")
+    return timings
+
+
+if __name__ == '__main__':
+    player_data = pd.read_csv('fpl_player_data.csv')
+    fixture_matrix = FixtureMatrix.from_fixtures(pd.read_csv('fixture_info.csv'))
+    player_data['expected_points'] = project_expected_points(player_data, fixture_matrix)[:, 0]
+    check_small_pools(player_data)
+    check_pruning(player_data)
+    run_benchmark(player_data)
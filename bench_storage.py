@@ -0,0 +1,86 @@
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from fpl_xp.incremental import SCORING_COLUMNS
+from fpl_xp.storage import PLAYER_SCHEMA, apply_schema, read_table, write_table
+
+# Loads one file in a fresh interpreter and reports load time and the RSS it added
+_PROBE = """
+import json, sys, time
+import pandas as pd
+from fpl_xp.storage import PLAYER_SCHEMA, read_table
+def peak_kb():  # VmHWM, unlike ru_maxrss, is not inherited from the parent process
+    return next(int(line.split()[1]) for line in open('/proc/self/status') if line.startswith('VmHWM'))
+path, mode, columns = sys.argv[1], sys.argv[2], json.loads(sys.argv[3])
+before = peak_kb()
+start = time.perf_counter()
+if mode == 'csv':
+    frame = pd.read_csv(path, usecols=columns)
+else:
+    frame = read_table(path, columns=columns, mmap=mode == 'mmap', schema=PLAYER_SCHEMA)
+if mode == 'mmap':
+    frame['minutes'].sum()  # Touch a column so the mapped pages count
+elapsed = time.perf_counter() - start
+print(json.dumps({'seconds': elapsed, 'rss_mb': (peak_kb() - before) / 1024,
+                  'rows': len(frame)}))
+"""
+
+
+def multi_season_archive(player_df, seasons=5, gameweeks=38, seed=0):
+    """Stacks a per-gameweek snapshot of every player for ``seasons`` seasons, with jittered stats."""
+    rng = np.random.default_rng(seed)
+    archive = pd.concat([player_df] * (seasons * gameweeks), ignore_index=True)
+    archive['season'] = np.repeat(np.arange(seasons), gameweeks * len(player_df)) + 2020
+    archive['gameweek'] = np.tile(np.repeat(np.arange(1, gameweeks + 1), len(player_df)), seasons)
+    for column in ('minutes', 'goals_scored', 'assists', 'total_points', 'bps'):
+        archive[column] = (archive[column] * rng.uniform(0.5, 1.5, len(archive))).round().astype(np.int64)
+    for column in ('form', 'influence', 'creativity', 'threat', 'selected_by_percent'):
+        archive[column] = (archive[column] * rng.uniform(0.5, 1.5, len(archive))).round(1)
+    return archive
+
+
+def probe(path, mode, columns=None):
+    result = subprocess.run([sys.executable, '-c', _PROBE, path, mode, json.dumps(columns)],
+                            capture_output=True, text=True, check=True,
+                            env=dict(os.environ, PYTHONPATH=os.path.dirname(os.path.abspath(__file__))))
+    return json.loads(result.stdout)
+
+
+def check_round_trip(frame, path):
+    """Asserts the table holds the same values as the CSV typed with the schema."""
+    expected, actual = apply_schema(frame, PLAYER_SCHEMA), read_table(path)
+    assert list(actual.columns) == list(expected.columns)
+    for column in expected.columns:
+        pd.testing.assert_series_equal(actual[column], expected[column], check_categorical=False, obj=column)
+
+
+def run_benchmark(player_df, repeats=3):
+    datasets = [('shipped data', player_df), ('5-season archive', multi_season_archive(player_df))]
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for label, frame in datasets:
+            csv_path, table_path = os.path.join(tmp_dir, 'players.csv'), os.path.join(tmp_dir, 'players.table')
+            frame.to_csv(csv_path, index=False)
+            start = time.perf_counter()
+            write_table(frame, table_path, PLAYER_SCHEMA)
+            written = time.perf_counter() - start
+            check_round_trip(frame, table_path)
+            table_bytes = sum(entry.stat().st_size for entry in os.scandir(table_path))
+            print(f"{label}: {len(frame)} rows x {frame.shape[1]} columns, CSV {os.path.getsize(csv_path) / 1e6:.1f} MB, "
+                  f"table {table_bytes / 1e6:.1f} MB (written in {written:.2f} s)")
+            for columns in (None, SCORING_COLUMNS):
+                print(f"  {'all columns' if columns is None else 'scoring columns'}:")
+                for mode, path in (('csv', csv_path), ('table', table_path), ('mmap', table_path)):
+                    runs = [probe(path, mode, columns) for _ in range(repeats)]
+                    best = min(runs, key=lambda run: run['seconds'])
+                    print(f"    {mode:<6} {best['seconds'] * 1000:8.1f} ms, +{best['rss_mb']:7.1f} MB RSS")
+
+
+if __name__ == '__main__':
+    run_benchmark(pd.read_csv('fpl_player_data.csv'))
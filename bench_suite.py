@@ -0,0 +1,208 @@
+"""Offline benchmark suite for the main hot paths on synthetic data.
+
+Times CSV and table loading, fixture difficulty building, scoring, squad
+selection (exact and simple) and the form Random Forest's training and inference on
+synthetic pools at several scales. It also times difficulty building on a
+multi-season fixture archive, and league projection for 1000 managers per
+unit of scale on the real-sized pool. Results are written as JSON; when a
+baseline file exists the run is compared against it and exits with status
+1 if any case got slower than the threshold allows.
+
+    python bench_suite.py --save-baseline      # record a baseline
+    python bench_suite.py                      # compare against it
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+import scipy
+import sklearn
+
+from fpl_xp.analyzers import FixtureAnalyzer, PlayerAnalyzer
+from fpl_xp.feature_store import FORM_FEATURES, FORM_TARGET, FeatureStore
+from fpl_xp.history import build_player_history
+from fpl_xp.league import LeagueSquads
+from fpl_xp.ml_model import predict_points, train_model
+from fpl_xp.player_store import TeamSelector
+from fpl_xp.squad_optimizer import optimize_squad
+from fpl_xp.storage import FIXTURE_SCHEMA, PLAYER_SCHEMA, read_table, write_table
+from fpl_xp.synthetic import synthetic_dataset, synthetic_picks
+
+FORMAT = 'fpl-xp-bench/1'
+SCALE_CASES = ('csv_load', 'table_load', 'scoring', 'squad_selection', 'team_selector', 'rf_train', 'rf_predict')
+CASES = SCALE_CASES + ('fixture_difficulty', 'league_projection')
+LEAGUE_MANAGERS = 1000  # Managers per unit of scale in the league case
+
+
+def measure(function, repeats, max_seconds):
+    """Runs ``function`` up to ``repeats`` times (at least once, stopping after ``max_seconds``) and returns timings."""
+    times = []
+    start = time.perf_counter()
+    while len(times) < repeats and (not times or time.perf_counter() - start < max_seconds):
+        begin = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - begin)
+    return times
+
+
+def scale_cases(players, fixtures, tmp_dir):
+    """Yields (case, rows, function) for one synthetic pool."""
+    players_csv, fixtures_csv = os.path.join(tmp_dir, 'players.csv'), os.path.join(tmp_dir, 'fixtures.csv')
+    players_table, fixtures_table = os.path.join(tmp_dir, 'players.table'), os.path.join(tmp_dir, 'fixtures.table')
+    players.to_csv(players_csv, index=False)
+    fixtures.to_csv(fixtures_csv, index=False)
+    write_table(players, players_table, PLAYER_SCHEMA)
+    write_table(fixtures, fixtures_table, FIXTURE_SCHEMA)
+    players, fixtures = pd.read_csv(players_csv), pd.read_csv(fixtures_csv)  # What the scripts score
+
+    yield 'csv_load', len(players), lambda: (pd.read_csv(players_csv), pd.read_csv(fixtures_csv))
+    yield 'table_load', len(players), lambda: (read_table(players_table), read_table(fixtures_table))
+    fixture_analyzer = FixtureAnalyzer(fixtures)
+    analyzer = PlayerAnalyzer(players.copy(), fixture_analyzer)
+    yield 'scoring', len(players), analyzer.calculate_expected_points
+    scored = analyzer.player_df
+    yield 'squad_selection', len(players), lambda: optimize_squad(scored)
+    yield 'team_selector', len(players), lambda: TeamSelector(players).calculate_squad_expected_points()
+
+    # The form model: trained on every finished gameweek's features, predicting the next one for the whole pool
+    history = build_player_history(fixtures, players)
+    feature_store = FeatureStore(os.path.join(tmp_dir, f"features_{len(players)}"))
+    feature_store.update(history, fixtures)
+    training = feature_store.training_frame(history, players, fixtures)
+    features = feature_store.features(int(history['event'].max()) + 1, players, fixtures)
+    model, _ = train_model(training, FORM_FEATURES, FORM_TARGET, n_jobs=1)
+    yield 'rf_train', len(training), lambda: train_model(training, FORM_FEATURES, FORM_TARGET, n_jobs=1)
+    yield 'rf_predict', len(features), lambda: predict_points(model, features, FORM_FEATURES)
+
+
+def run_suite(scales=(1, 10, 100), seasons=5, repeats=5, max_seconds=10.0, seed=0, cases=CASES, log=print):
+    """Runs every case and returns the results document."""
+    results = {}
+
+    def record(case, size, rows, function):
+        times = measure(function, repeats, max_seconds)
+        key = f"{case}@{size}"
+        results[key] = {'case': case, 'size': size, 'rows': rows, 'runs': len(times),
+                        'min': min(times), 'median': statistics.median(times)}
+        log(f"  {key:<28} {rows:>7} rows  median {results[key]['median'] * 1000:10.2f} ms  "
+            f"min {results[key]['min'] * 1000:10.2f} ms  ({len(times)} runs)")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for scale in scales if set(cases) & set(SCALE_CASES) else ():
+            players, fixtures = synthetic_dataset(scale, seed=seed)
+            log(f"{scale}x: {len(players)} players")
+            for case, rows, function in scale_cases(players, fixtures, tmp_dir):
+                if case in cases:
+                    record(case, f"{scale}x", rows, function)
+
+    if 'fixture_difficulty' in cases:
+        log(f"Fixture archives: 1 and {seasons} seasons")
+        for n_seasons in sorted({1, seasons}):
+            _, fixtures = synthetic_dataset(1, seasons=n_seasons, seed=seed)
+            for horizon in (1, 6):
+                record('fixture_difficulty', f"{n_seasons}s_h{horizon}", len(fixtures),
+                       lambda: FixtureAnalyzer(fixtures, horizon=horizon))
+
+    if 'league_projection' in cases:
+        players, fixtures = synthetic_dataset(1, seed=seed)
+        player_df = PlayerAnalyzer(players, FixtureAnalyzer(fixtures)).player_df
+        log(f"League: {', '.join(str(int(scale * LEAGUE_MANAGERS)) for scale in scales)} managers")
+        for scale in scales:
+            picks = synthetic_picks(player_df, int(scale * LEAGUE_MANAGERS), seed=seed)
+            squads = LeagueSquads.from_picks(picks, player_df['id'].to_numpy())
+            record('league_projection', f"{scale}x", len(squads),
+                   lambda: squads.evaluate(player_df['expected_points'].to_numpy()))
+
+    return {
+        'format': FORMAT,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'environment': {
+            'python': platform.python_version(), 'platform': platform.platform(), 'cpus': os.cpu_count(),
+            'numpy': np.__version__, 'pandas': pd.__version__, 'scipy': scipy.__version__,
+            'scikit-learn': sklearn.__version__,
+        },
+        'settings': {'scales': list(scales), 'seasons': seasons, 'repeats': repeats, 'seed': seed},
+        'results': results,
+    }
+
+
+def compare(baseline, current, threshold=0.25, min_delta=0.002):
+    """Returns (rows, regressions) comparing median times case by case.
+
+    A case regresses when it is more than ``threshold`` slower and at least
+    ``min_delta`` seconds slower, so sub-millisecond jitter is not flagged.
+    """
+    rows, regressions = [], []
+    for key, result in sorted(current['results'].items()):
+        old = baseline['results'].get(key)
+        if old is None:
+            continue
+        ratio = result['median'] / old['median'] if old['median'] else float('inf')
+        regressed = ratio > 1 + threshold and result['median'] - old['median'] > min_delta
+        rows.append((key, old['median'], result['median'], ratio, regressed))
+        if regressed:
+            regressions.append(key)
+    return rows, regressions
+
+
+def write_json(document, path):
+    with open(path, 'w') as f:
+        json.dump(document, f, indent=1, sort_keys=True)
+        f.write('\n')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scales', type=float, nargs='+', default=[1, 10, 100])
+    parser.add_argument('--seasons', type=int, default=5, help='Seasons in the multi-season fixture archive')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--max-seconds', type=float, default=10.0, help='Stop repeating a case after this long')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--cases', nargs='+', choices=CASES, default=list(CASES))
+    parser.add_argument('--output', default='bench_results.json')
+    parser.add_argument('--baseline', default='bench_baseline.json')
+    parser.add_argument('--save-baseline', action='store_true', help='Write the results as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.25, help='Allowed slowdown (0.25 = 25%%)')
+    args = parser.parse_args(argv)
+
+    scales = [int(scale) if scale == int(scale) else scale for scale in args.scales]
+    document = run_suite(scales, args.seasons, args.repeats, args.max_seconds, args.seed, args.cases)
+    write_json(document, args.output)
+    print(f"Results written to {args.output}")
+    if args.save_baseline:
+        write_json(document, args.baseline)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to record one")
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    if baseline.get('format') != FORMAT:
+        raise SystemExit(f"{args.baseline} is not a {FORMAT} results file")
+    changed = {name: (baseline['environment'].get(name), value) for name, value in document['environment'].items()
+               if baseline['environment'].get(name) != value}
+    if changed:
+        print(f"Note: environment differs from the baseline: {changed}")
+    rows, regressions = compare(baseline, document, args.threshold)
+    print(f"\n{'case':<28} {'baseline ms':>12} {'current ms':>12} {'ratio':>7}")
+    for key, old, new, ratio, regressed in rows:
+        print(f"{key:<28} {old * 1000:12.2f} {new * 1000:12.2f} {ratio:7.2f}{'  REGRESSION' if regressed else ''}")
+    if regressions:
+        print(f"\n{len(regressions)} case(s) regressed by more than {args.threshold:.0%}: {', '.join(regressions)}")
+        return 1
+    print(f"\nNo regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
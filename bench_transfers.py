@@ -0,0 +1,29 @@
+import time
+
+import pandas as pd
+
+from fpl_xp.fixture_matrix import FixtureMatrix
+from fpl_xp.squad_optimizer import optimize_squad
+from fpl_xp.transfer_planner import TransferPlanner
+from fpl_xp.xp_engine import project_expected_points
+
+
+def run_benchmark(player_df, fixtures_df, horizons=(1, 3, 5), beam_widths=(10, 40)):
+    """Times transfer planning from a deliberately stale squad over several horizons."""
+    # Start from the best squad by season points so there is something to fix
+    squad = optimize_squad(player_df.assign(expected_points=player_df['total_points'].astype(float)), budget=95)
+    for horizon in horizons:
+        fixture_matrix = FixtureMatrix.from_fixtures(fixtures_df, horizon=horizon)
+        projected = project_expected_points(player_df, fixture_matrix)
+        for beam_width in beam_widths:
+            planner = TransferPlanner(player_df, projected, fixture_matrix.gameweeks)
+            hold = planner.squad_values(tuple(sorted(planner.row_for_id[i] for i in squad.squad['id']))).sum()
+            start = time.perf_counter()
+            plan = planner.plan(squad.squad['id'], bank=5.0, free_transfers=1, beam_width=beam_width)
+            elapsed = time.perf_counter() - start
+            print(f"Horizon {horizon}, beam {beam_width:>3}: {elapsed:6.2f} s, {len(planner._values):>6} squads scored, "
+                  f"plan {plan.total_points:7.2f} pts vs hold {hold:7.2f} pts")
+
+
+if __name__ == '__main__':
+    run_benchmark(pd.read_csv('fpl_player_data.csv'), pd.read_csv('fixture_info.csv'))
@@ -0,0 +1,48 @@
+"""Fantasy Premier League expected points models.
+
+Public names are imported lazily on first access, so ``import fpl_xp`` stays
+cheap and pandas, scipy or scikit-learn are only loaded when something that
+needs them is used.
+"""
+
+import importlib
+
+__version__ = '0.1.0'
+
+_EXPORTS = {
+    'FPLDataFetcher': 'fpl_data',
+    'SnapshotStore': 'fpl_data',
+    'BulkFetcher': 'bulk_fetch',
+    'FixtureMatrix': 'fixture_matrix',
+    'FixtureAnalyzer': 'analyzers',
+    'PlayerAnalyzer': 'analyzers',
+    'PlayerIndex': 'query_index',
+    'PlayerStore': 'player_store',
+    'TeamSelector': 'player_store',
+    'LeagueSquads': 'league',
+    'project_expected_points': 'xp_engine',
+    'optimize_squad': 'squad_optimizer',
+    'SquadEvaluator': 'squad_evaluator',
+    'TransferPlanner': 'transfer_planner',
+    'PointsSimulator': 'simulation',
+    'ScenarioSweep': 'scenarios',
+    'ModelStore': 'model_store',
+    'FeatureStore': 'feature_store',
+    'ModelSearch': 'model_search',
+    'run_backtest': 'backtest',
+    'XPService': 'xp_service',
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module 'fpl_xp' has no attribute '{name}'")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,112 @@
+import math
+
+import pandas as pd
+
+from .fixture_matrix import FixtureMatrix
+from .profiling import stage
+from .xp_engine import DIFFICULTY_MULTIPLIER, project_expected_points
+
+def minutes_above(threshold):
+    """Returns the inclusive minimum for "more than ``threshold`` minutes" (minutes are whole numbers)."""
+    return max(math.floor(threshold) + 1, 0)
+
+
+class FixtureAnalyzer:
+    """Class to analyze fixture data and calculate fixture difficulties."""
+    
+    def __init__(self, fixtures_df, horizon=1, start_gameweek=None):
+        self.fixtures_df = fixtures_df
+        with stage('fixture_matrix', rows=len(fixtures_df)):
+            self.fixture_matrix = FixtureMatrix.from_fixtures(fixtures_df, start_gameweek=start_gameweek,
+                                                              horizon=horizon)
+        self.next_gameweek = int(self.fixture_matrix.gameweeks[0])
+        self.team_difficulty_dict = self._build_team_difficulty_dict()
+
+    def _build_team_difficulty_dict(self):
+        """Builds a dictionary of team fixture difficulties for the next gameweek."""
+        return self.fixture_matrix.difficulty_dict(0)
+
+    def get_difficulty_for_team(self, team_id):
+        """Returns the difficulty for a team based on the fixture."""
+        return self.team_difficulty_dict.get(team_id, 3)  # Defaults to 3 (neutral)
+
+
+class PlayerAnalyzer:
+    """Class to analyze player data and calculate expected points, including position information."""
+    
+    difficulty_multiplier = DIFFICULTY_MULTIPLIER
+    position_map = {1: 'Goalkeeper', 2: 'Defender', 3: 'Midfielder', 4: 'Forward'}
+
+    def __init__(self, player_df, fixture_analyzer, rule='clip'):
+        self.player_df = player_df
+        self.fixture_analyzer = fixture_analyzer
+        self.rule = rule  # How games played is derived from minutes (see xp_engine.games_played)
+        self._indexes = {}
+        with stage('score', rows=len(player_df)):
+            self.player_df['position'] = self.player_df['element_type'].map(self.position_map)  # Map position
+            self.player_df['expected_points'] = self.calculate_expected_points()
+
+    def calculate_expected_points(self):
+        """Calculates next-gameweek expected points for all players, summing double gameweeks."""
+        return self._project()[:, 0]
+
+    def _project(self):
+        return project_expected_points(self.player_df, self.fixture_analyzer.fixture_matrix, rule=self.rule,
+                                       difficulty_multiplier=self.difficulty_multiplier)
+
+    def project_expected_points(self):
+        """Returns expected points per player for every gameweek in the fixture analyzer's horizon."""
+        gameweeks = self.fixture_analyzer.fixture_matrix.gameweeks
+        return pd.DataFrame(self._project(), index=self.player_df.index, columns=gameweeks.tolist())
+
+    def get_top_players_over_horizon(self, min_minutes_threshold):
+        """Filters and returns top players by total expected points over the whole horizon."""
+        projected = self.project_expected_points()
+        players = self.player_df.assign(horizon_points=projected.sum(axis=1))
+        filtered_players = players[players['minutes'] > min_minutes_threshold]
+        return filtered_players.sort_values('horizon_points', ascending=False)
+
+    def query_index(self, column='expected_points'):
+        """Returns the ``PlayerIndex`` over ``column``, built on first use for this scoring run."""
+        from .query_index import PlayerIndex
+
+        if column not in self._indexes:
+            with stage('query_index', rows=len(self.player_df)):
+                self._indexes[column] = PlayerIndex(self.player_df, column)
+        return self._indexes[column]
+
+    def get_top_players_for_next_gameweek(self, min_minutes_threshold, n=None, position=None, max_cost=None):
+        """Filters and returns top players by expected points for the next gameweek."""
+        rows = self.query_index().top(n, position, max_cost, minutes_above(min_minutes_threshold))
+        return self.player_df.iloc[rows]
+    
+    def simulate_points(self, n_sims=100_000, **options):
+        """Simulates the next gameweek and returns per-player points distributions."""
+        from .simulation import PointsSimulator
+
+        simulator = PointsSimulator(self.player_df, self.fixture_analyzer.fixture_matrix)
+        with stage('simulate', rows=n_sims):
+            return simulator.simulate(n_sims, **options)
+
+    def plan_transfers(self, squad_ids, bank=0.0, free_transfers=1, **search_options):
+        """Plans transfers for an existing squad over the fixture analyzer's horizon."""
+        from .transfer_planner import TransferPlanner
+
+        planner = TransferPlanner(self.player_df, self._project(), self.fixture_analyzer.fixture_matrix.gameweeks)
+        with stage('plan_transfers'):
+            return planner.plan(squad_ids, bank=bank, free_transfers=free_transfers, **search_options)
+
+    def create_team(self, budget=100, locked=(), excluded=(), bench_weight=0.1):
+        """Selects the best squad and starting XI within the budget, position, club and formation rules."""
+        from .squad_optimizer import optimize_squad  # Needs scipy, so only imported when selecting a team
+
+        with stage('select_team', rows=len(self.player_df)):
+            selection = optimize_squad(self.player_df, budget=budget, bench_weight=bench_weight,
+                                       locked=locked, excluded=excluded)
+        if selection is None:
+            print("No valid team fits the budget and constraints.")
+            return None
+
+        print(f"Team selected within budget of {budget}: Total cost = {selection.total_cost} "
+              f"(formation {selection.formation})")
+        return selection.squad[['web_name', 'position', 'expected_points', 'now_cost', 'starting']]
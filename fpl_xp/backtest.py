@@ -0,0 +1,133 @@
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .analyzers import FixtureAnalyzer, PlayerAnalyzer
+from .feature_store import FORM_FEATURES, FORM_TARGET, FeatureStore
+from .history import build_player_history
+from .ml_model import predict_points, train_model
+from .profiling import stage
+
+FORM_WINDOW = 4  # Gameweeks averaged for the rebuilt ``form`` column (FPL uses 30 days)
+STATE_COLUMNS = ['minutes', 'goals_scored', 'assists', 'clean_sheets', 'bonus', 'total_points']
+MODELS = ('statistical', 'random_forest')
+
+# Read-only inputs shared with worker processes, set once per worker by _init_worker
+_inputs = {}
+
+
+def gameweek_state(history, player_df, gameweek):
+    """Rebuilds the player table as it stood before ``gameweek`` from finished fixtures.
+
+    Prices and availability news of past gameweeks are not in the fixture
+    stats, so they are marked unknown rather than copied from today's table:
+    every player is available ('a', no ``chance_of_playing_next_round``)
+    and has no price.
+    """
+    past = history[history['event'] < gameweek]
+    totals = past.groupby('element')[STATE_COLUMNS].sum()
+    recent = past[past['event'] >= gameweek - FORM_WINDOW]
+    form = recent.groupby('element')['total_points'].sum() / min(FORM_WINDOW, max(gameweek - 1, 1))
+    latest_team = past.sort_values('event').groupby('element')['team'].last()
+
+    state = player_df[['id', 'web_name', 'element_type', 'team']].copy()
+    state['now_cost'] = np.nan
+    state['status'] = 'a'
+    state['chance_of_playing_next_round'] = np.nan
+    state[STATE_COLUMNS] = totals.reindex(state['id']).fillna(0).to_numpy()
+    state['form'] = form.reindex(state['id']).fillna(0).to_numpy()
+    state['team'] = latest_team.reindex(state['id']).fillna(state.set_index('id')['team']).to_numpy(dtype=np.int64)
+    return state
+
+
+def _init_worker(history, player_df, fixtures_df, training, feature_root):
+    _inputs.update(history=history, player_df=player_df, fixtures_df=fixtures_df, training=training,
+                   feature_store=FeatureStore(feature_root))
+
+
+def backtest_gameweek(gameweek):
+    """Scores both models as of ``gameweek`` and returns one row per player who played.
+
+    The Random Forest is the form model of ``predict_form_points``, trained
+    only on the gameweeks before ``gameweek``.
+    """
+    history, player_df, fixtures_df = _inputs['history'], _inputs['player_df'], _inputs['fixtures_df']
+    state = gameweek_state(history, player_df, gameweek)
+
+    fixture_analyzer = FixtureAnalyzer(fixtures_df, start_gameweek=gameweek)
+    player_analyzer = PlayerAnalyzer(state, fixture_analyzer)
+    state = player_analyzer.player_df
+    training = _inputs['training']
+    training = training[training['gameweek'] < gameweek]
+    if training.empty:
+        raise ValueError(f"No finished gameweeks before gameweek {gameweek} to train on")
+    rf_model, _ = train_model(training, FORM_FEATURES, FORM_TARGET, n_jobs=1)
+    features = _inputs['feature_store'].features(gameweek, state, fixtures_df)
+    state['random_forest'] = predict_points(rf_model, features, FORM_FEATURES)
+    state['statistical'] = state['expected_points']
+
+    actual = history.loc[history['event'] == gameweek, ['element', 'total_points', 'estimated_minutes']]
+    scored = state[['id', 'web_name', 'position'] + list(MODELS)].merge(
+        actual.rename(columns={'element': 'id', 'total_points': 'actual_points'}), on='id')
+    scored['estimated_minutes'] = scored['estimated_minutes'] > 0
+    scored.insert(0, 'gameweek', gameweek)
+    return scored
+
+
+def summarize(predictions, by):
+    """Returns MAE, bias and over/under counts for each model grouped by ``by``."""
+    frames = []
+    for model in MODELS:
+        error = predictions[model] - predictions['actual_points']
+        frame = pd.DataFrame({
+            'model': model,
+            by: predictions[by],
+            'abs_error': error.abs(),
+            'error': error,
+            'over': error > 0,
+            'under': error < 0,
+        })
+        frames.append(frame)
+    errors = pd.concat(frames)
+    return errors.groupby(['model', by]).agg(
+        players=('error', 'size'),
+        mae=('abs_error', 'mean'),
+        bias=('error', 'mean'),
+        overpredicted=('over', 'sum'),
+        underpredicted=('under', 'sum'),
+    ).reset_index()
+
+
+def run_backtest(fixtures_df, player_df, gameweeks=None, workers=None, fixture_minutes=None):
+    """Backtests both models over past gameweeks in parallel and returns the per-player predictions.
+
+    Form features are built once, in a temporary feature store, from the
+    history rebuilt from fixture stats. Appearances missing from
+    ``fixture_minutes`` (the fetched history) get season-average minutes,
+    which leak later gameweeks into their actual points and into the
+    features; ``estimated_minutes`` flags the predictions scored against them.
+    """
+    with stage('build_history', rows=len(fixtures_df)):
+        history = build_player_history(fixtures_df, player_df, fixture_minutes)
+    finished_gameweeks = sorted(history['event'].unique())
+    if gameweeks is None:
+        # The first gameweek has no prior data to score from, the second none to train on
+        gameweeks = finished_gameweeks[2:]
+
+    with tempfile.TemporaryDirectory() as feature_root:
+        feature_store = FeatureStore(feature_root)
+        feature_store.update(history, fixtures_df)
+        training = feature_store.training_frame(history, player_df, fixtures_df)
+        inputs = (history, player_df, fixtures_df, training, feature_root)
+        workers = workers or os.cpu_count()
+        with stage('backtest_gameweeks', rows=len(gameweeks)):
+            if workers > 1:
+                with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=inputs) as pool:
+                    results = list(pool.map(backtest_gameweek, gameweeks))
+            else:
+                _init_worker(*inputs)
+                results = [backtest_gameweek(gameweek) for gameweek in gameweeks]
+    return pd.concat(results, ignore_index=True)
@@ -0,0 +1,227 @@
+import asyncio
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+
+from .profiling import stage
+
+# Statuses worth retrying: rate limited, or the server (or a proxy in front of it) struggling
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class TransientError(Exception):
+    """Raised by a transport when a request failed in a way worth retrying."""
+
+
+class TokenBucket:
+    """Class to limit the request rate to ``rate`` per second with bursts of up to ``burst``."""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1.0, self.rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self):
+        """Waits until a token is available and takes it."""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class RequestsTransport:
+    """Class to run requests on one pooled ``requests.Session`` from a bounded thread pool."""
+
+    def __init__(self, concurrency, timeout):
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        self.errors = (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError)
+        self.session = requests.Session()
+        # One keep-alive connection per worker, so no request waits for a free connection
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=concurrency)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.executor = ThreadPoolExecutor(max_workers=concurrency)
+        self.timeout = timeout
+
+    async def get(self, url):
+        """Returns (status, headers, body) for ``url``."""
+        loop = asyncio.get_running_loop()
+        try:
+            response = await loop.run_in_executor(self.executor, partial(self.session.get, url, timeout=self.timeout))
+        except self.errors as error:
+            raise TransientError(f"{type(error).__name__}: {error}") from error
+        return response.status_code, response.headers, response.content
+
+    async def close(self):
+        self.session.close()
+        self.executor.shutdown(wait=False)
+
+
+class AiohttpTransport:
+    """Class to run requests on one ``aiohttp`` session with a connection pool of ``concurrency``."""
+
+    def __init__(self, concurrency, timeout):
+        import aiohttp
+
+        self.errors = (aiohttp.ClientError, asyncio.TimeoutError)
+        self.session = aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=concurrency),
+                                             timeout=aiohttp.ClientTimeout(total=timeout))
+
+    async def get(self, url):
+        """Returns (status, headers, body) for ``url``."""
+        try:
+            async with self.session.get(url) as response:
+                return response.status, response.headers, await response.read()
+        except self.errors as error:
+            raise TransientError(f"{type(error).__name__}: {error}") from error
+
+    async def close(self):
+        await self.session.close()
+
+
+def default_transport(concurrency, timeout):
+    """Returns the aiohttp transport when aiohttp is installed, else the pooled requests one."""
+    try:
+        import aiohttp  # noqa: F401
+    except ImportError:
+        return RequestsTransport(concurrency, timeout)
+    return AiohttpTransport(concurrency, timeout)
+
+
+class BulkFetchReport:
+    """Class to collect the outcome of a bulk fetch: what was fetched, reused, retried and failed."""
+
+    def __init__(self):
+        self.fetched = []
+        self.cached = []
+        self.failed = {}  # key -> last error
+        self.retries = 0
+        self.elapsed = 0.0
+
+    @property
+    def ok(self):
+        return not self.failed
+
+    def __str__(self):
+        text = (f"Fetched {len(self.fetched)}, reused {len(self.cached)} cached, "
+                f"{len(self.failed)} failed, {self.retries} retries in {self.elapsed:.2f} s")
+        if self.failed:
+            shown = ', '.join(f"{key} ({error})" for key, error in list(self.failed.items())[:5])
+            text += f"\nFailed: {shown}{', ...' if len(self.failed) > 5 else ''}"
+        return text
+
+
+class BulkFetcher:
+    """Class to fetch many URLs of one endpoint concurrently into a ``SnapshotStore``.
+
+    ``concurrency`` workers share one pooled transport, a token bucket keeps
+    the overall rate under ``rate`` requests per second, and timeouts,
+    connection errors, 429 and 5xx responses are retried with exponential
+    backoff and jitter (or the server's ``Retry-After``). Each body is written
+    to the store as soon as it arrives, and the store index is flushed every
+    ``flush_every`` responses, so an interrupted run keeps what it fetched.
+    Failures do not stop the run; they are listed in the returned report.
+    """
+
+    def __init__(self, url_template, store, concurrency=16, rate=20, burst=None, retries=4,
+                 backoff=0.5, max_backoff=30, timeout=30, ttl=0, flush_every=50, transport_factory=None):
+        self.url_template = url_template
+        self.store = store
+        self.concurrency = concurrency
+        self.rate = rate
+        self.burst = burst
+        self.retries = retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.timeout = timeout
+        self.ttl = ttl
+        self.flush_every = flush_every
+        self.transport_factory = transport_factory or default_transport
+
+    def url(self, key):
+        return self.url_template.format(key)
+
+    def _is_fresh(self, url):
+        entry = self.store.get(url)
+        return entry is not None and time.time() - entry['fetched_at'] < self.ttl
+
+    def _delay(self, attempt, headers):
+        """Seconds to wait before retry number ``attempt``."""
+        retry_after = headers.get('Retry-After') if headers is not None else None
+        if retry_after is not None:
+            try:
+                return min(float(retry_after), self.max_backoff)
+            except ValueError:
+                pass  # An HTTP date; fall back to our own backoff
+        # Full jitter keeps the workers from retrying in lockstep
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+    async def _fetch_one(self, transport, bucket, key, report):
+        url = self.url(key)
+        for attempt in range(self.retries + 1):
+            await bucket.acquire()
+            headers = None
+            try:
+                status, headers, body = await transport.get(url)
+            except TransientError as error:
+                last_error = str(error)
+            else:
+                if status == 200:
+                    self.store.put(url, body, headers.get('ETag'), headers.get('Last-Modified'), write_index=False)
+                    report.fetched.append(key)
+                    return
+                last_error = f"HTTP {status}"
+                if status not in RETRY_STATUSES:
+                    break  # 404 and friends will not get better
+            if attempt < self.retries:
+                report.retries += 1
+                await asyncio.sleep(self._delay(attempt, headers))
+        report.failed[key] = last_error
+
+    async def _worker(self, queue, transport, bucket, report):
+        while True:
+            try:
+                key = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            await self._fetch_one(transport, bucket, key, report)
+            if (len(report.fetched) + len(report.failed)) % self.flush_every == 0:
+                self.store.flush()
+
+    async def run(self, keys):
+        """Fetches every key in ``keys`` and returns a ``BulkFetchReport``."""
+        report = BulkFetchReport()
+        start = time.perf_counter()
+        queue = asyncio.Queue()
+        for key in keys:
+            if self.ttl and self._is_fresh(self.url(key)):
+                report.cached.append(key)
+            else:
+                queue.put_nowait(key)
+
+        transport = self.transport_factory(self.concurrency, self.timeout)
+        bucket = TokenBucket(self.rate, self.burst)
+        try:
+            with stage('fetch_summaries', rows=queue.qsize()):
+                await asyncio.gather(*(self._worker(queue, transport, bucket, report)
+                                       for _ in range(min(self.concurrency, queue.qsize()))))
+        finally:
+            await transport.close()
+            self.store.flush()
+        report.elapsed = time.perf_counter() - start
+        return report
+
+    def fetch(self, keys):
+        """Synchronous wrapper around ``run``."""
+        return asyncio.run(self.run(keys))
+
@@ -0,0 +1,488 @@
+"""``fpl-xp`` command line interface.
+
+Only argparse is imported up front: every subcommand imports what it needs
+when it runs, so ``fpl-xp --help`` never loads pandas, and ``score`` and
+``team --method simple`` never load scikit-learn or scipy.
+"""
+
+import argparse
+import os
+import time
+
+PLAYERS_TABLE = 'fpl_player_data.table'
+FIXTURES_TABLE = 'fixture_info.table'
+HISTORY_TABLE = 'player_history.table'
+NEXT_FIXTURES_CSV = 'fixtures_next_gameweek.csv'
+MODELS = ('statistical', 'random_forest')
+SCORE_COLUMNS = {'statistical': 'expected_points', 'random_forest': 'predicted_points'}
+
+
+def _load_data(args, ttl=None):
+    """Returns (players, fixtures) from the API (through the snapshot cache) or from the saved tables."""
+    if args.offline:
+        from .storage import FIXTURE_SCHEMA, PLAYER_SCHEMA, read_table
+
+        return read_table(args.players, schema=PLAYER_SCHEMA), read_table(args.fixtures, schema=FIXTURE_SCHEMA)
+    from .fpl_data import FPLDataFetcher
+
+    fetcher = FPLDataFetcher(ttl=ttl)
+    return fetcher.fetch_player_data(), fetcher.fetch_fixture_data()
+
+
+def _min_minutes(args, next_gameweek):
+    # Default: players who have played at least half of the season's minutes so far
+    return args.min_minutes if args.min_minutes is not None else (next_gameweek * 90) / 2
+
+
+def fetch(args):
+    """Downloads players and fixtures, saves them as typed tables and updates the match-event table."""
+    from .fpl_data import FPLDataFetcher
+    from .storage import FIXTURE_SCHEMA, HISTORY_SCHEMA, PLAYER_SCHEMA, apply_schema, write_table
+
+    fetcher = FPLDataFetcher()
+    players = apply_schema(fetcher.fetch_player_data(), PLAYER_SCHEMA)
+    fixtures = apply_schema(fetcher.fetch_fixture_data(), FIXTURE_SCHEMA)
+    write_table(players, args.players)
+    print(f"Data saved to {args.players}")
+    write_table(fixtures, args.fixtures)
+    print(f"Fixture data saved to {args.fixtures}")
+    if args.csv:
+        for frame, table in ((players, args.players), (fixtures, args.fixtures)):
+            export = os.path.splitext(table)[0] + '.csv'
+            write_table(frame, export)
+            print(f"Exported {export}")
+
+    next_gameweek = fixtures.loc[~fixtures['finished'].astype(bool), 'event'].min()
+    fixtures[fixtures['event'] == next_gameweek].to_csv(NEXT_FIXTURES_CSV, index=False)
+    print(f"Fixture data for gameweek {next_gameweek} saved to {NEXT_FIXTURES_CSV}")
+
+    if not args.no_events:
+        from .match_events import EVENT_TABLE_PATH, update_event_table
+
+        new_fixtures = update_event_table(fixtures)
+        print(f"Parsed {new_fixtures} newly finished fixtures into {EVENT_TABLE_PATH}")
+    if args.history:
+        ids = players['id'].tolist()
+        report = fetcher.fetch_player_summaries(ids, concurrency=args.concurrency, rate=args.rate)
+        print(report)
+        write_table(fetcher.load_player_history(ids, skip=report.failed), args.history, HISTORY_SCHEMA)
+        print(f"Per-gameweek player history saved to {args.history}")
+    if args.snapshot:
+        fetcher.save_snapshot(args.snapshot)
+        print(f"Saved snapshot '{args.snapshot}'")
+    return 0
+
+
+def _watch(args):
+    """Polls for new data and rescores only what changed, printing the table whenever it moves."""
+    from .analyzers import PlayerAnalyzer
+    from .fpl_data import FPLDataFetcher
+    from .incremental import IncrementalScorer
+
+    position = {name: element_type for element_type, name in PlayerAnalyzer.position_map.items()}.get(args.position)
+    scorer = IncrementalScorer(horizon=args.horizon, rule=args.rule)
+    previous_top = None
+    while True:
+        FPLDataFetcher.clear_memory_cache()
+        start = time.perf_counter()
+        report = scorer.update(*_load_data(args, ttl=args.watch))
+        top = scorer.top(args.top or len(scorer.player_df), position)
+        print(f"[{time.strftime('%H:%M:%S')}] rescored {report['rescored']} players "
+              f"({'full' if report['full'] else 'incremental'}) in {(time.perf_counter() - start) * 1000:.1f} ms")
+        if previous_top is None or not top[['id', 'expected_points']].equals(previous_top):
+            print(top.to_string(index=False))
+            previous_top = top[['id', 'expected_points']]
+        time.sleep(args.watch)
+
+
+def score(args):
+    """Scores every player for the next gameweek (and horizon) and prints the top of the table."""
+    if args.watch:
+        if args.model != 'statistical':
+            raise SystemExit("--watch only supports the statistical model")
+        return _watch(args)
+    from .analyzers import FixtureAnalyzer, PlayerAnalyzer, minutes_above
+
+    players, fixtures = _load_data(args)
+    fixture_analyzer = FixtureAnalyzer(fixtures, horizon=args.horizon)
+    player_analyzer = PlayerAnalyzer(players, fixture_analyzer, rule=args.rule)
+    players = player_analyzer.player_df
+    next_gameweek = fixture_analyzer.next_gameweek
+    column = SCORE_COLUMNS[args.model]
+
+    if args.model == 'random_forest':
+        from .ml_model import predict_form_points
+        from .model_store import ModelStore
+
+        # Trained on rolling-form features against real gameweek points; the stored
+        # forest is reused for unchanged inputs, warm starting last gameweek's otherwise
+        players[column], model_info = predict_form_points(players, fixtures, next_gameweek, model_store=ModelStore())
+        mse = 'none (no unseen gameweek held out)' if model_info['mse'] is None else f"{model_info['mse']:.4f}"
+        print(f"Model {model_info['key'][:12]} ({model_info['source']}, {model_info['n_estimators']} trees), "
+              f"Mean Squared Error: {mse}")
+
+    rows = player_analyzer.query_index(column).top(args.top or None, args.position or None,
+                                                   min_minutes=minutes_above(_min_minutes(args, next_gameweek)))
+    top = players.iloc[rows]
+    print(f"\nPlayers with {column.replace('_', ' ').title()} for Next Gameweek ({next_gameweek}):")
+    print(top[['web_name', 'position', column]].to_string())
+
+    if fixture_analyzer.fixture_matrix.horizon > 1:
+        over_horizon = player_analyzer.get_top_players_over_horizon(_min_minutes(args, next_gameweek))
+        if args.position:
+            over_horizon = over_horizon[over_horizon['position'] == args.position]
+        print(f"\nTop players over the next {fixture_analyzer.fixture_matrix.horizon} gameweeks:")
+        print(over_horizon[['web_name', 'position', 'horizon_points']].head(args.top or None).to_string())
+
+    if args.output:
+        filename = args.output.format(gameweek=next_gameweek)
+        from .storage import write_table
+
+        write_table(players[['id', 'web_name', 'position', 'team', 'now_cost', column]], filename)
+        print(f"File '{filename}' created successfully!")
+    return 0
+
+
+def team(args):
+    """Selects a squad: the exact optimizer by default, or the simple points-ranked selector."""
+    players, fixtures = _load_data(args)
+    if args.method == 'simple':
+        from .player_store import TeamSelector
+
+        team_selector = TeamSelector(players)
+        starting_11_points, bench_points = team_selector.calculate_squad_expected_points()
+        starting_11, bench = team_selector.select_squad()
+        print("Starting 11:", ', '.join(f"{player.first_name} {player.second_name}" for player in starting_11))
+        print("Bench:", ', '.join(f"{player.first_name} {player.second_name}" for player in bench))
+        print("Expected Points of Starting 11:", starting_11_points)
+        print("Expected Points from Auto-Substitutions:", bench_points)
+        return 0
+
+    from .analyzers import FixtureAnalyzer, PlayerAnalyzer
+
+    player_analyzer = PlayerAnalyzer(players, FixtureAnalyzer(fixtures), rule=args.rule)
+    selected_team = player_analyzer.create_team(budget=args.budget, bench_weight=args.bench_weight)
+    if selected_team is None:
+        return 1
+    print(selected_team.to_string())
+    return 0
+
+
+def league(args):
+    """Projects every manager's points and rank for the next gameweek from a saved picks file."""
+    from .analyzers import FixtureAnalyzer, PlayerAnalyzer
+    from .league import RULED_OUT, LeagueSquads
+    from .storage import PICKS_SCHEMA, read_table
+
+    players, fixtures = _load_data(args)
+    fixture_analyzer = FixtureAnalyzer(fixtures)
+    players = PlayerAnalyzer(players, fixture_analyzer, rule=args.rule).player_df
+    column = SCORE_COLUMNS[args.model]
+    if args.model == 'random_forest':
+        from .ml_model import predict_form_points
+        from .model_store import ModelStore
+
+        players[column], _ = predict_form_points(players, fixtures, fixture_analyzer.next_gameweek,
+                                                 model_store=ModelStore())
+
+    squads = LeagueSquads.from_picks(read_table(args.picks, schema=PICKS_SCHEMA), players['id'].to_numpy(),
+                                     players['element_type'].to_numpy())
+    current_points = None
+    if args.standings:
+        standings = read_table(args.standings, columns=['entry', 'total']).set_index('entry')['total']
+        current_points = standings.reindex(squads.entries).fillna(0).to_numpy()
+    plays = ~players['status'].astype(str).isin(RULED_OUT).to_numpy()
+    projection = squads.evaluate(players[column].to_numpy(), plays, current_points)
+    print(f"Projected gameweek {fixture_analyzer.next_gameweek} for {len(squads)} managers:")
+    print(projection.head(args.top or None).to_string(index=False, float_format='%.2f'))
+    if args.output:
+        from .storage import write_table
+
+        write_table(projection, args.output)
+        print(f"File '{args.output}' created successfully!")
+    return 0
+
+
+def backtest(args):
+    """Backtests both models on past gameweeks and prints MAE, bias and over/under counts."""
+    import pandas as pd
+
+    from .backtest import run_backtest, summarize
+    from .storage import FIXTURE_SCHEMA, HISTORY_SCHEMA, PLAYER_SCHEMA, read_table
+
+    start = time.perf_counter()
+    fixture_minutes = None
+    if args.history and os.path.exists(args.history):
+        fixture_minutes = read_table(args.history, columns=['element', 'fixture', 'minutes'], schema=HISTORY_SCHEMA)
+    predictions = run_backtest(read_table(args.fixtures, schema=FIXTURE_SCHEMA),
+                               read_table(args.players, schema=PLAYER_SCHEMA),
+                               gameweeks=args.gameweeks, workers=args.workers, fixture_minutes=fixture_minutes)
+    elapsed = time.perf_counter() - start
+
+    pd.set_option('display.width', 120)
+    print("Per gameweek:")
+    print(summarize(predictions, 'gameweek').to_string(index=False, float_format='%.2f'))
+    print("\nPer position:")
+    print(summarize(predictions, 'position').to_string(index=False, float_format='%.2f'))
+    print(f"\nBacktested {predictions['gameweek'].nunique()} gameweeks in {elapsed:.2f} s")
+    estimated = predictions['estimated_minutes'].mean()
+    if estimated > 0:
+        print(f"Not out-of-sample: {estimated:.0%} of the actual points (and the minutes behind the form features) "
+              f"use season-average minutes from today's totals. Run 'fpl-xp fetch --history' for real minutes.")
+    if args.output:
+        from .storage import write_table
+
+        write_table(predictions, args.output)
+    return 0
+
+
+def _parse_param(option):
+    """Parses ``model.name=v1,v2`` into (model, name, [values]); values are Python literals where possible."""
+    import ast
+
+    key, _, values = option.partition('=')
+    model, _, name = key.partition('.')
+    if not (model and name and values):
+        raise SystemExit(f"--param expects model.name=value[,value...], got '{option}'")
+    parsed = []
+    for value in values.split(','):
+        try:
+            parsed.append(ast.literal_eval(value))
+        except (ValueError, SyntaxError):
+            parsed.append(value)
+    return model, name, parsed
+
+
+def evaluate(args):
+    """Cross-validates the candidate models by gameweek and prints a ranked leaderboard."""
+    import pandas as pd
+
+    from .feature_store import FeatureStore, load_history
+    from .model_search import MODEL_GRID, ModelSearch
+
+    players, fixtures = _load_data(args)
+    grid = {model: dict(space) for model, space in MODEL_GRID.items() if not args.models or model in args.models}
+    for option in args.param or ():
+        model, name, values = _parse_param(option)
+        if model not in grid:
+            raise SystemExit(f"Unknown or unselected model in --param: {model}")
+        grid[model][name] = values
+
+    history = load_history(fixtures, players)
+    feature_store = FeatureStore()
+    feature_store.update(history, fixtures)
+    training = feature_store.training_frame(history, players, fixtures)
+    start = time.perf_counter()
+    leaderboard = ModelSearch(training, n_splits=args.folds).run(grid, workers=args.workers)
+    computed = len(leaderboard) * args.folds - leaderboard['cached_folds'].sum()
+
+    pd.set_option('display.width', 160)
+    pd.set_option('display.max_colwidth', 70)
+    print(leaderboard.to_string(index=False, float_format='%.4f'))
+    print(f"\n{len(leaderboard)} candidates x {args.folds} gameweek folds over {len(training)} rows: "
+          f"{computed} folds computed, {len(leaderboard) * args.folds - computed} from cache, "
+          f"in {time.perf_counter() - start:.1f} s")
+    if args.output:
+        from .storage import write_table
+
+        write_table(leaderboard, args.output)
+    return 0
+
+
+def sweep(args):
+    """Scores every player under a grid (or file) of scoring-rule scenarios and prints how picks shift."""
+    import json
+
+    import pandas as pd
+
+    from .analyzers import FixtureAnalyzer
+    from .scenarios import POSITION_NAMES, ScenarioSweep, scenario_grid
+
+    if args.scenarios:
+        with open(args.scenarios) as f:
+            scenarios = json.load(f)
+    else:
+        scenarios = scenario_grid(args.slopes or (None,), args.goal_scales or (None,), args.minutes_points or (None,),
+                                  args.appearance_bonus or (None,))
+    players, fixtures = _load_data(args)
+    fixture_analyzer = FixtureAnalyzer(fixtures, horizon=args.horizon)
+    players['position'] = players['element_type'].map(POSITION_NAMES)
+    start = time.perf_counter()
+    by_scenario, by_player = ScenarioSweep(players, fixture_analyzer.fixture_matrix, rule=args.rule).run(
+        scenarios, top_n=args.top)
+    elapsed = time.perf_counter() - start
+
+    pd.set_option('display.width', 160)
+    print(by_scenario.head(args.top).to_string(index=False, float_format='%.3f'))
+    print("\nCaptain picks: " + ', '.join(f"{name} {count}" for name, count in
+                                          by_scenario['captain'].value_counts().items()))
+    print(f"\nPlayers most often in the top {args.top}:")
+    print(by_player.head(args.top).to_string(index=False, float_format='%.2f'))
+    print(f"\n{len(scenarios)} scenarios x {len(players)} players in {elapsed * 1000:.0f} ms")
+    if args.output:
+        from .storage import write_table
+
+        write_table(by_scenario, args.output)
+    return 0
+
+
+def serve(args):
+    """Runs the in-memory xP query service."""
+    import asyncio
+
+    from .xp_service import XPService, load_from_api, load_from_files
+
+    model_store = None
+    if not args.no_model:
+        from .model_store import ModelStore
+
+        model_store = ModelStore()
+    loader = (lambda: load_from_files(args.players, args.fixtures)) if args.offline else load_from_api
+    service = XPService(loader, args.refresh_interval, model_store)
+    asyncio.run(service.serve_forever(args.host, args.port))
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='fpl-xp', description='Fantasy Premier League expected points.')
+    parser.add_argument('--profile', metavar='TRACE.json',
+                        help='Record per-stage wall/CPU time, peak memory and rows to this JSON file '
+                             '(plus a Chrome trace next to it)')
+    parser.add_argument('--profile-stage', metavar='STAGE', help='Also run this stage under cProfile (e.g. score)')
+    parser.add_argument('--profile-baseline', metavar='TRACE.json',
+                        help='Flag stages that got slower than in this earlier trace')
+    parser.add_argument('--profile-threshold', type=float, default=0.2,
+                        help='Slowdown that counts as a regression (default: 0.2 = 20%%)')
+    subcommands = parser.add_subparsers(dest='command', required=True)
+
+    def add_data_options(subparser, offline=True):
+        subparser.add_argument('--players', default=PLAYERS_TABLE, help='Player table (or .csv file)')
+        subparser.add_argument('--fixtures', default=FIXTURES_TABLE, help='Fixture table (or .csv file)')
+        if offline:
+            subparser.add_argument('--offline', action='store_true',
+                                   help='Read the saved tables instead of the API')
+
+    def add_rule_option(subparser, default):
+        subparser.add_argument('--rule', default=default, choices=('clip', 'positive', 'above_one'),
+                               help='How games played is derived from minutes')
+
+    fetch_parser = subcommands.add_parser('fetch', help='Download players and fixtures to typed tables')
+    add_data_options(fetch_parser, offline=False)
+    fetch_parser.add_argument('--csv', action='store_true', help='Also export the tables as CSV')
+    fetch_parser.add_argument('--snapshot', help='Also save the responses as a named replay snapshot')
+    fetch_parser.add_argument('--no-events', action='store_true', help='Skip updating the match-event table')
+    fetch_parser.add_argument('--history', nargs='?', const=HISTORY_TABLE,
+                              help=f'Also fetch every player\'s per-gameweek history (default: {HISTORY_TABLE})')
+    fetch_parser.add_argument('--concurrency', type=int, default=16, help='Parallel history requests')
+    fetch_parser.add_argument('--rate', type=float, default=20, help='History requests per second at most')
+    fetch_parser.set_defaults(handler=fetch)
+
+    score_parser = subcommands.add_parser('score', help='Score players for the next gameweek')
+    add_data_options(score_parser)
+    add_rule_option(score_parser, 'clip')
+    score_parser.add_argument('--model', default='statistical', choices=MODELS)
+    score_parser.add_argument('--horizon', type=int, default=1, help='Gameweeks to project')
+    score_parser.add_argument('--position', choices=('Goalkeeper', 'Defender', 'Midfielder', 'Forward'))
+    score_parser.add_argument('--min-minutes', type=float, help='Minutes played threshold (default: half the season)')
+    score_parser.add_argument('--top', type=int, default=20, help='Players to print (0 for all)')
+    score_parser.add_argument('--output', help='Table (or .csv file) for the scores; may contain {gameweek}')
+    score_parser.add_argument('--watch', type=float, metavar='SECONDS',
+                              help='Keep polling and rescore only changed players and teams')
+    score_parser.set_defaults(handler=score)
+
+    team_parser = subcommands.add_parser('team', help='Select a squad')
+    add_data_options(team_parser)
+    add_rule_option(team_parser, 'clip')
+    team_parser.add_argument('--method', default='optimal', choices=('optimal', 'simple'))
+    team_parser.add_argument('--budget', type=float, default=100)
+    team_parser.add_argument('--bench-weight', type=float, default=0.1)
+    team_parser.set_defaults(handler=team)
+
+    league_parser = subcommands.add_parser('league', help="Project managers' points and ranks from their picks")
+    add_data_options(league_parser)
+    add_rule_option(league_parser, 'clip')
+    league_parser.add_argument('--picks', required=True, help='Picks table (or .csv file): entry, element, position, '
+                                                               'multiplier, is_captain, is_vice_captain')
+    league_parser.add_argument('--standings', help='Optional table (or .csv file) of entry and current total, '
+                                                   'to rank on total plus projection')
+    league_parser.add_argument('--model', default='statistical', choices=MODELS)
+    league_parser.add_argument('--top', type=int, default=20, help='Managers to print (0 for all)')
+    league_parser.add_argument('--output', help='Optional table (or .csv file) for every manager\'s projection')
+    league_parser.set_defaults(handler=league)
+
+    backtest_parser = subcommands.add_parser('backtest', help='Backtest both models on finished gameweeks')
+    add_data_options(backtest_parser, offline=False)
+    backtest_parser.add_argument('--gameweeks', type=int, nargs='*', help='Gameweeks to backtest (default: all finished)')
+    backtest_parser.add_argument('--workers', type=int, default=None)
+    backtest_parser.add_argument('--history', default=HISTORY_TABLE,
+                                 help=f'Fetched per-gameweek history with real minutes (default: {HISTORY_TABLE})')
+    backtest_parser.add_argument('--output', help='Optional table (or .csv file) for the per-player predictions')
+    backtest_parser.set_defaults(handler=backtest)
+
+    evaluate_parser = subcommands.add_parser('evaluate', help='Cross-validate models and parameter grids by gameweek')
+    add_data_options(evaluate_parser)
+    evaluate_parser.add_argument('--models', nargs='+', help='Models to compare (default: all)')
+    evaluate_parser.add_argument('--param', action='append', metavar='MODEL.NAME=V1,V2',
+                                 help='Replace one parameter\'s grid values (repeatable)')
+    evaluate_parser.add_argument('--folds', type=int, default=5, help='Gameweek-grouped folds')
+    evaluate_parser.add_argument('--workers', type=int, default=None, help='Worker processes (default: CPU count)')
+    evaluate_parser.add_argument('--output', help='Optional table (or .csv file) for the leaderboard')
+    evaluate_parser.set_defaults(handler=evaluate)
+
+    sweep_parser = subcommands.add_parser('sweep', help='Compare rankings and picks under many scoring-rule scenarios')
+    add_data_options(sweep_parser)
+    add_rule_option(sweep_parser, 'clip')
+    sweep_parser.add_argument('--scenarios', help='JSON list of scenarios (overrides of difficulty_multiplier, '
+                                                  'position_points, minutes_points, appearance_bonus)')
+    sweep_parser.add_argument('--slopes', type=float, nargs='+',
+                              help='Difficulty multiplier slopes per step from neutral (default rules: 0.1)')
+    sweep_parser.add_argument('--goal-scales', type=float, nargs='+', help='Multipliers on every position\'s goal points')
+    sweep_parser.add_argument('--minutes-points', type=float, nargs='+', help='Points per minute played per game')
+    sweep_parser.add_argument('--appearance-bonus', type=float, nargs='+', help='Bonus for 60+ minute players')
+    sweep_parser.add_argument('--horizon', type=int, default=1, help='Gameweeks to sum points over')
+    sweep_parser.add_argument('--top', type=int, default=10, help='Size of the top group compared between scenarios')
+    sweep_parser.add_argument('--output', help='Optional table (or .csv file) for the per-scenario summary')
+    sweep_parser.set_defaults(handler=sweep)
+
+    serve_parser = subcommands.add_parser('serve', help='Serve xP queries over HTTP')
+    add_data_options(serve_parser)
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8080)
+    serve_parser.add_argument('--refresh-interval', type=float, default=900, help='Seconds between background refreshes')
+    serve_parser.add_argument('--no-model', action='store_true', help='Skip the Random Forest predictions')
+    serve_parser.set_defaults(handler=serve)
+    return parser
+
+
+def _run_profiled(args, argv):
+    """Runs the subcommand under a profiler and writes the stage trace, even if the run is interrupted."""
+    import sys
+
+    from .profiling import Profiler, find_regressions
+
+    profiler = Profiler(cprofile_stage=args.profile_stage)
+    try:
+        with profiler, profiler.stage(f"fpl-xp {args.command}"):
+            return args.handler(args)
+    finally:
+        stem = os.path.splitext(args.profile)[0]
+        profiler.write_json(args.profile, command=' '.join(sys.argv[1:] if argv is None else argv))
+        profiler.write_chrome_trace(f"{stem}.chrome.json")
+        print(profiler.format_summary(), file=sys.stderr)
+        print(f"Trace written to {args.profile} and {stem}.chrome.json", file=sys.stderr)
+        if args.profile_stage:
+            if profiler.write_cprofile(f"{stem}.{args.profile_stage}.prof"):
+                print(f"cProfile of '{args.profile_stage}' written to {stem}.{args.profile_stage}.prof", file=sys.stderr)
+            else:
+                print(f"Stage '{args.profile_stage}' never ran, so nothing was profiled", file=sys.stderr)
+        if args.profile_baseline:
+            for regression in find_regressions(args.profile_baseline, profiler.to_dict(), args.profile_threshold):
+                print(f"REGRESSION {regression['name']}: {regression['baseline'] * 1000:.1f} ms -> "
+                      f"{regression['current'] * 1000:.1f} ms (+{regression['change']:.0%})", file=sys.stderr)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.profile:
+        return _run_profiled(args, argv)
+    return args.handler(args)
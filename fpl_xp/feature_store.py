@@ -0,0 +1,295 @@
+"""Rolling-form features per player and gameweek, cached on disk.
+
+Features "as of gameweek g" only use gameweeks before g: for every stat in
+``ROLLING_STATS`` and window w, the mean per gameweek over the w gameweeks
+before g (``difficulty`` is the mean opponent difficulty per fixture
+played instead). They come from dense player x gameweek cumulative sums,
+so every window is a vectorized difference of two cumulative columns.
+
+History comes from either source the package has: the API's
+element-summary history (``fpl-xp fetch --history``, one row per fixture)
+or ``build_player_history``'s rebuild from fixture stats (one row per
+gameweek, no xG and estimated minutes).
+"""
+
+import hashlib
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from .fixture_matrix import FixtureMatrix
+from .profiling import stage
+from .storage import HISTORY_SCHEMA, read_table, write_table
+
+HISTORY_TABLE = 'player_history.table'
+WINDOWS = (3, 5, 10)
+ROLLING_STATS = ('minutes', 'goals_scored', 'expected_goals', 'bps', 'total_points', 'difficulty')
+SUMMED_STATS = ('fixtures',) + ROLLING_STATS  # ``difficulty`` is summed over fixtures, then divided by them
+FORM_FEATURES = [f"{stat}_last{window}" for stat in ROLLING_STATS for window in WINDOWS] + [
+    'element_type', 'fixture_count', 'fixture_difficulty']  # No price: only today's is known for past gameweeks
+FORM_TARGET = 'gameweek_points'
+FORMAT_VERSION = 2
+FIXTURE_COLUMNS = ['id', 'team_h', 'team_a', 'team_h_difficulty', 'team_a_difficulty']  # Fingerprinted per gameweek
+
+
+def load_history(fixtures_df, player_df, path=HISTORY_TABLE):
+    """Returns the fetched history table at ``path`` if there is one, else history rebuilt from fixture stats."""
+    if path and os.path.exists(path):
+        return read_table(path, schema=HISTORY_SCHEMA)
+    from .history import build_player_history
+
+    return build_player_history(fixtures_df, player_df)
+
+
+def finished_gameweeks(fixtures_df):
+    """Returns the sorted gameweeks whose fixtures have all finished."""
+    finished = fixtures_df['finished'].astype(bool).groupby(fixtures_df['event']).all()
+    return finished.index[finished.to_numpy()].to_numpy(dtype=np.int64)
+
+
+def gameweek_history(history, fixtures_df):
+    """Returns one row per (element, event) of a finished gameweek with its summed ``SUMMED_STATS`` and team."""
+    if 'round' in history:
+        # API rows are per fixture: the player's side gives their team and difficulty
+        fixtures = fixtures_df.set_index('id')
+        fixture = fixtures.reindex(history['fixture'].to_numpy())
+        home = history['was_home'].astype(bool).to_numpy()
+        frame = pd.DataFrame({
+            'element': history['element'].to_numpy(dtype=np.int64),
+            'event': history['round'].to_numpy(dtype=np.int64),
+            'team': np.where(home, fixture['team_h'], fixture['team_a']),
+            'fixtures': 1,
+            'difficulty': np.where(home, fixture['team_h_difficulty'], fixture['team_a_difficulty']),
+        })
+        for stat in ROLLING_STATS[:-1]:
+            frame[stat] = pd.to_numeric(history[stat], errors='coerce').to_numpy() if stat in history else 0.0
+        frame = frame.groupby(['element', 'event'], as_index=False).agg(
+            team=('team', 'last'), **{stat: (stat, 'sum') for stat in SUMMED_STATS})
+    else:
+        frame = history[['element', 'event', 'team', 'fixtures']].copy()
+        for stat in ROLLING_STATS[:-1]:
+            frame[stat] = history[stat].to_numpy(dtype=np.float64) if stat in history else 0.0
+        frame['difficulty'] = history['difficulty'].to_numpy(dtype=np.float64) * history['fixtures'].to_numpy()
+    frame = frame[frame['event'].isin(finished_gameweeks(fixtures_df))]
+    frame[list(SUMMED_STATS)] = frame[list(SUMMED_STATS)].fillna(0).astype(np.float64)
+    return frame.sort_values(['event', 'element'], ignore_index=True)
+
+
+def _numeric(frame, column):
+    return pd.to_numeric(frame[column], errors='coerce').to_numpy(dtype=np.float64)
+
+
+def _event_digests(frame, event_column, columns, events):
+    """Returns {event: hash of the ``columns`` of ``frame``'s rows in that event} for the ``events`` with rows."""
+    event = _numeric(frame, event_column)
+    keep = np.isin(event, events)
+    values = np.column_stack([_numeric(frame, column)[keep] for column in columns])
+    event = event[keep]
+    if len(event) and (np.diff(event) < 0).any():
+        order = np.argsort(event, kind='stable')
+        event, values = event[order], values[order]
+    bounds = np.searchsorted(event, events)
+    ends = np.searchsorted(event, events, side='right')
+    return {int(gameweek): hashlib.sha256(np.ascontiguousarray(values[start:end]).tobytes()).digest()
+            for gameweek, start, end in zip(events, bounds, ends) if end > start}
+
+
+def _fingerprints(history, fixtures_df):
+    """Returns {event: hash} for every finished gameweek, to spot gameweeks that changed after being stored.
+
+    Each hash covers the gameweek's raw history rows (every column
+    ``gameweek_history`` reads, minutes and points included) and its
+    fixtures' teams and difficulties, so it is computed without
+    aggregating the history. History rebuilt from fixture stats estimates
+    minutes and points from season averages, so every finished gameweek
+    changes all earlier ones and the store is rebuilt; fetched history
+    (``fpl-xp fetch --history``) keeps the updates incremental.
+    """
+    events = finished_gameweeks(fixtures_df)
+    if 'round' in history:
+        event_column, columns = 'round', ['element', 'fixture', 'was_home']
+    else:
+        event_column, columns = 'event', ['element', 'team', 'fixtures', 'difficulty']
+    columns += [stat for stat in ROLLING_STATS[:-1] if stat in history]
+    rows = _event_digests(history, event_column, columns, events)
+    fixtures = _event_digests(fixtures_df, 'event', FIXTURE_COLUMNS, events)
+    return {str(event): hashlib.sha256(digest + fixtures.get(event, b'')).hexdigest() for event, digest in rows.items()}
+
+
+def fixture_features(fixtures_df, team, gameweek):
+    """Returns (fixture_count, mean fixture difficulty) of each ``team`` entry in ``gameweek``."""
+    matrix = FixtureMatrix.from_fixtures(fixtures_df, start_gameweek=gameweek, horizon=1,
+                                         n_teams=int(team.max(initial=0)))
+    team = np.clip(team, 0, len(matrix.counts) - 1)
+    count = matrix.counts[team, 0].astype(np.float64)
+    difficulty = matrix.difficulty[team, 0].sum(axis=1).astype(np.float64)
+    return count, np.divide(difficulty, count, out=np.zeros_like(difficulty), where=count > 0)
+
+
+class FeatureStore:
+    """Class to cache rolling-form features per gameweek and extend them as gameweeks finish.
+
+    Each gameweek's features are written to ``<root>/gw<g>.table``. The
+    cumulative sums of the last ``max(windows)`` gameweeks are kept in
+    ``state.npz`` next to a fingerprint per stored gameweek, so ``update``
+    only adds the gameweeks that finished since the last call. If a stored
+    gameweek changed (late bonus or data corrections) it rebuilds everything.
+    """
+
+    def __init__(self, root='.feature_store', windows=WINDOWS):
+        self.root = root
+        self.windows = tuple(windows)
+        self.index_path = os.path.join(root, 'index.json')
+        self.state_path = os.path.join(root, 'state.npz')
+        os.makedirs(root, exist_ok=True)
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+
+    def _table_path(self, gameweek):
+        return os.path.join(self.root, f"gw{gameweek}.table")
+
+    def _write_index(self):
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.index, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    def gameweeks(self):
+        """Returns the gameweeks that have stored features."""
+        return sorted(int(gameweek) for gameweek in self.index.get('tables', []))
+
+    def _is_current(self, fingerprints):
+        stored = self.index.get('fingerprints', {})
+        return (self.index.get('version') == FORMAT_VERSION and self.index.get('windows') == list(self.windows)
+                and all(fingerprints.get(event) == value for event, value in stored.items())
+                and os.path.exists(self.state_path))
+
+    def update(self, history, fixtures_df):
+        """Brings the store up to date with ``history`` and returns {'built': gameweeks, 'full': rebuilt}."""
+        fingerprints = _fingerprints(history, fixtures_df)
+        full = not self._is_current(fingerprints)
+        last_event = None if full else self.index['last_event']
+        new_events = sorted(int(event) for event in fingerprints if full or int(event) > last_event)
+        if not new_events:
+            return {'built': [], 'full': False}
+        if not full:
+            # Only the new gameweeks are aggregated; the stored sums cover the rest
+            history = history[_numeric(history, 'round' if 'round' in history else 'event') > last_event]
+        weekly = gameweek_history(history, fixtures_df)
+
+        with stage('feature_store', rows=len(weekly)):
+            if full:
+                for gameweek in self.gameweeks():
+                    shutil.rmtree(self._table_path(gameweek), ignore_errors=True)
+                first_event = new_events[0]
+                ids, team = np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+                tail = np.zeros((len(SUMMED_STATS), 0, 1))
+                last_event = first_event - 1
+                self.index = {'version': FORMAT_VERSION, 'windows': list(self.windows), 'first_event': first_event,
+                              'fingerprints': {}, 'tables': []}
+            else:
+                with np.load(self.state_path) as state:
+                    ids, team, tail = state['ids'], state['team'], state['tail']
+
+            # Players seen for the first time join with zero sums
+            all_ids = np.union1d(ids, weekly['element'].to_numpy(dtype=np.int64))
+            if len(all_ids) != len(ids):
+                rows = np.searchsorted(all_ids, ids)
+                grown_team = np.zeros(len(all_ids), dtype=np.int64)
+                grown_team[rows] = team
+                grown_tail = np.zeros((len(SUMMED_STATS), len(all_ids), tail.shape[2]))
+                grown_tail[:, rows] = tail
+                ids, team, tail = all_ids, grown_team, grown_tail
+
+            events = weekly['event'].to_numpy()
+            built = []
+            for event in range(last_event + 1, new_events[-1] + 1):
+                rows = weekly.iloc[np.searchsorted(events, event):np.searchsorted(events, event, side='right')]
+                player = np.searchsorted(ids, rows['element'].to_numpy(dtype=np.int64))
+                column = tail[:, :, -1].copy()
+                column[:, player] += rows[list(SUMMED_STATS)].to_numpy(dtype=np.float64).T
+                team[player] = rows['team'].to_numpy(dtype=np.int64)
+                tail = np.concatenate([tail, column[:, :, None]], axis=2)[:, :, -(max(self.windows) + 1):]
+                gameweek = event + 1
+                self._write_features(gameweek, ids, team, tail, event - self.index['first_event'] + 1)
+                self.index['fingerprints'][str(event)] = fingerprints.get(str(event))
+                self.index['tables'].append(gameweek)
+                built.append(gameweek)
+
+            tmp_path = f"{self.state_path}.{os.getpid()}.tmp.npz"
+            np.savez(tmp_path, ids=ids, team=team, tail=tail)
+            os.replace(tmp_path, self.state_path)
+            self.index['last_event'] = new_events[-1]
+            self._write_index()
+        return {'built': built, 'full': full}
+
+    def _write_features(self, gameweek, ids, team, tail, played_gameweeks):
+        """Writes the features as of ``gameweek`` from cumulative sums ending at the gameweek before it."""
+        columns = {'id': ids, 'team': team}
+        latest = tail[:, :, -1]
+        fixtures = SUMMED_STATS.index('fixtures')
+        for window in self.windows:
+            before = tail[:, :, max(tail.shape[2] - 1 - window, 0)]
+            sums = latest - before
+            for stat in ROLLING_STATS:
+                values = sums[SUMMED_STATS.index(stat)]
+                if stat == 'difficulty':
+                    count = sums[fixtures]
+                    values = np.divide(values, count, out=np.zeros_like(values), where=count > 0)
+                else:
+                    values = values / min(window, played_gameweeks)
+                columns[f"{stat}_last{window}"] = values.astype(np.float32)
+        write_table(pd.DataFrame(columns), self._table_path(gameweek))
+
+    def features(self, gameweek, player_df, fixtures_df):
+        """Returns ``FORM_FEATURES`` as of ``gameweek`` for the rows of ``player_df`` (current team).
+
+        Past a run of unfinished gameweeks the latest stored features are used.
+        """
+        stored_gameweeks = [stored for stored in self.gameweeks() if stored <= gameweek]
+        if not stored_gameweeks:
+            raise KeyError(f"No features stored for gameweek {gameweek} or earlier")
+        stored = read_table(self._table_path(stored_gameweeks[-1])).set_index('id')
+        ids = player_df['id'].to_numpy()
+        frame = stored.drop(columns='team').reindex(ids).fillna(0).reset_index(drop=True)
+        frame.insert(0, 'id', ids)
+        frame['element_type'] = player_df['element_type'].to_numpy()
+        frame['fixture_count'], frame['fixture_difficulty'] = fixture_features(
+            fixtures_df, player_df['team'].to_numpy(dtype=np.int64), gameweek)
+        return frame
+
+    def training_frame(self, history, player_df, fixtures_df):
+        """Returns one row per player and finished gameweek: features as of that gameweek and its real points.
+
+        Rows cover players with minutes in the longest window or in the
+        gameweek itself; ``FORM_TARGET`` is 0 for players who did not play.
+        """
+        weekly = gameweek_history(history, fixtures_df)
+        players = player_df.set_index('id')
+        longest = f"minutes_last{max(self.windows)}"
+        stored_gameweeks = set(self.gameweeks())
+        frames = []
+        for gameweek in weekly['event'].unique():
+            if gameweek not in stored_gameweeks:
+                continue
+            stored = read_table(self._table_path(gameweek))
+            played = weekly[weekly['event'] == gameweek].set_index('element')
+            keep = (stored[longest] > 0) | stored['id'].isin(played.index)
+            stored = stored[keep & stored['id'].isin(players.index)].reset_index(drop=True)
+            # The team a player played for that gameweek, else the last one they played for
+            played_team = played['team'].reindex(stored['id']).to_numpy()
+            team = np.where(np.isnan(played_team), stored['team'].to_numpy(), played_team)
+            stored['element_type'] = players['element_type'].reindex(stored['id']).to_numpy()
+            stored['fixture_count'], stored['fixture_difficulty'] = fixture_features(
+                fixtures_df, team.astype(np.int64), int(gameweek))
+            stored[FORM_TARGET] = played['total_points'].reindex(stored['id']).fillna(0).to_numpy()
+            stored.insert(1, 'gameweek', int(gameweek))
+            frames.append(stored.drop(columns='team'))
+        if not frames:
+            return pd.DataFrame(columns=['id', 'gameweek'] + FORM_FEATURES + [FORM_TARGET])
+        return pd.concat(frames, ignore_index=True)
@@ -0,0 +1,85 @@
+import numpy as np
+
+
+class FixtureMatrix:
+    """Dense team x gameweek view of the fixture list over a fixed horizon.
+
+    ``counts[t, g]`` is the number of fixtures team ``t`` plays in gameweek
+    ``gameweeks[g]`` (0 for a blank, 2+ for a double) and ``home[t, g]`` how many
+    of them are at home. Per-fixture details live in ``slots`` trailing arrays:
+    ``difficulty[t, g, s]``, ``opponent[t, g, s]`` and ``is_home[t, g, s]`` with
+    difficulty 0 marking an empty slot. Team ids index the first axis directly.
+    """
+
+    def __init__(self, gameweeks, counts, home, difficulty, opponent, is_home):
+        self.gameweeks = gameweeks
+        self.counts = counts
+        self.home = home
+        self.difficulty = difficulty
+        self.opponent = opponent
+        self.is_home = is_home
+
+    @property
+    def horizon(self):
+        return len(self.gameweeks)
+
+    @property
+    def slots(self):
+        return self.difficulty.shape[2]
+
+    @classmethod
+    def from_fixtures(cls, fixtures_df, start_gameweek=None, horizon=1, n_teams=None):
+        """Builds the matrix in one vectorized pass over ``fixtures_df``.
+
+        ``start_gameweek`` defaults to the first event with an unfinished fixture.
+        Fixtures without an event (postponed and not yet rescheduled) are ignored.
+        Any mapping of column arrays works in place of the DataFrame.
+        """
+        event = np.asarray(fixtures_df['event'], dtype=np.float64)
+        if start_gameweek is None:
+            unfinished = ~np.asarray(fixtures_df['finished']).astype(bool)
+            start_gameweek = int(np.nanmin(event[unfinished]))
+        gameweeks = np.arange(start_gameweek, start_gameweek + horizon)
+        in_horizon = (event >= start_gameweek) & (event < start_gameweek + horizon)
+
+        team_h = np.asarray(fixtures_df['team_h'], dtype=np.int64)
+        team_a = np.asarray(fixtures_df['team_a'], dtype=np.int64)
+        size = max(int(max(team_h.max(), team_a.max())) + 1 if len(team_h) else 0, (n_teams or 0) + 1)
+
+        # One entry per (fixture, side), in fixture order
+        mask = np.repeat(in_horizon, 2)
+        teams = np.column_stack([team_h, team_a]).ravel()[mask]
+        opponents = np.column_stack([team_a, team_h]).ravel()[mask]
+        difficulty = np.column_stack([np.asarray(fixtures_df['team_h_difficulty'], dtype=np.int64),
+                                      np.asarray(fixtures_df['team_a_difficulty'], dtype=np.int64)]).ravel()[mask]
+        is_home = np.tile([True, False], len(team_h))[mask]
+        gw_index = np.repeat(event, 2)[mask].astype(np.int64) - start_gameweek
+
+        # Slot number = position of each entry within its (team, gameweek) group
+        cell = teams * horizon + gw_index
+        order = np.argsort(cell, kind='stable')
+        sorted_cell = cell[order]
+        group_start = np.r_[0, np.flatnonzero(np.diff(sorted_cell)) + 1] if len(cell) else np.empty(0, np.int64)
+        starts = np.repeat(group_start, np.diff(np.r_[group_start, len(cell)]))
+        slot = np.empty(len(cell), dtype=np.int64)
+        slot[order] = np.arange(len(cell)) - starts
+        n_slots = max(int(slot.max()) + 1 if len(slot) else 0, 1)
+
+        counts = np.zeros((size, horizon), dtype=np.int8)
+        home = np.zeros((size, horizon), dtype=np.int8)
+        np.add.at(counts, (teams, gw_index), 1)
+        np.add.at(home, (teams, gw_index), is_home.astype(np.int8))
+        difficulty_matrix = np.zeros((size, horizon, n_slots), dtype=np.int8)
+        opponent_matrix = np.zeros((size, horizon, n_slots), dtype=np.int16)
+        home_matrix = np.zeros((size, horizon, n_slots), dtype=bool)
+        difficulty_matrix[teams, gw_index, slot] = difficulty
+        opponent_matrix[teams, gw_index, slot] = opponents
+        home_matrix[teams, gw_index, slot] = is_home
+        return cls(gameweeks, counts, home, difficulty_matrix, opponent_matrix, home_matrix)
+
+    def difficulty_dict(self, gameweek_index=0):
+        """Returns {team: difficulty} for one gameweek, using the last fixture of a double."""
+        counts = self.counts[:, gameweek_index]
+        teams = np.flatnonzero(counts)
+        last = self.difficulty[teams, gameweek_index, counts[teams] - 1]
+        return dict(zip(teams.tolist(), last.tolist()))
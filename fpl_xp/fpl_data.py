@@ -0,0 +1,251 @@
+import hashlib
+import json
+import os
+import time
+
+import pandas as pd
+
+from .profiling import stage
+
+
+class SnapshotStore:
+    """Class to keep raw API responses in a content-addressed on-disk store.
+
+    Response bodies live under ``blobs/<sha256>.json`` so identical payloads are
+    stored once. ``index.json`` maps each URL to its latest blob together with the
+    validators (ETag/Last-Modified) needed for conditional requests, and named
+    snapshots pin a set of URL -> blob mappings for offline replay.
+    """
+
+    def __init__(self, root='.fpl_cache'):
+        self.root = root
+        self.blob_dir = os.path.join(root, 'blobs')
+        self.snapshot_dir = os.path.join(root, 'snapshots')
+        self.index_path = os.path.join(root, 'index.json')
+        os.makedirs(self.blob_dir, exist_ok=True)
+        os.makedirs(self.snapshot_dir, exist_ok=True)
+        self.index = self._read_json(self.index_path, {})
+
+    @staticmethod
+    def _read_json(path, default):
+        """Reads a JSON file, returning ``default`` when it does not exist."""
+        if not os.path.exists(path):
+            return default
+        with open(path) as f:
+            return json.load(f)
+
+    @staticmethod
+    def _write_json(path, data):
+        """Writes JSON atomically so a crashed run never leaves a torn file."""
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def _blob_path(self, digest):
+        return os.path.join(self.blob_dir, f"{digest}.json")
+
+    def put(self, url, content, etag=None, last_modified=None, write_index=True):
+        """Stores a response body for ``url`` and returns its content digest.
+
+        Bulk writers pass ``write_index=False`` and call ``flush`` once in a while,
+        so the index is not rewritten for every response.
+        """
+        digest = hashlib.sha256(content).hexdigest()
+        blob_path = self._blob_path(digest)
+        if not os.path.exists(blob_path):
+            tmp_path = f"{blob_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            os.replace(tmp_path, blob_path)
+        self.index[url] = {
+            'digest': digest,
+            'etag': etag,
+            'last_modified': last_modified,
+            'fetched_at': time.time(),
+        }
+        if write_index:
+            self.flush()
+        return digest
+
+    def flush(self):
+        """Writes the index to disk."""
+        self._write_json(self.index_path, self.index)
+
+    def touch(self, url):
+        """Marks the cached entry for ``url`` as fresh (after a 304 response)."""
+        self.index[url]['fetched_at'] = time.time()
+        self._write_json(self.index_path, self.index)
+
+    def get(self, url):
+        """Returns the index entry for ``url`` or None if it has never been fetched."""
+        return self.index.get(url)
+
+    def read(self, digest):
+        """Returns the raw bytes of a stored blob."""
+        with open(self._blob_path(digest), 'rb') as f:
+            return f.read()
+
+    def save_snapshot(self, name, urls=None):
+        """Pins the current blobs for ``urls`` (default: every cached URL) under ``name``."""
+        urls = self.index if urls is None else urls
+        snapshot = {url: self.index[url]['digest'] for url in urls}
+        self._write_json(os.path.join(self.snapshot_dir, f"{name}.json"), snapshot)
+        return snapshot
+
+    def load_snapshot(self, name):
+        """Returns the URL -> digest mapping of a named snapshot."""
+        path = os.path.join(self.snapshot_dir, f"{name}.json")
+        if not os.path.exists(path):
+            raise LookupError(f"No snapshot named '{name}' in {self.root}")
+        return self._read_json(path, {})
+
+    def list_snapshots(self):
+        """Returns the names of all saved snapshots."""
+        return sorted(name[:-5] for name in os.listdir(self.snapshot_dir) if name.endswith('.json'))
+
+
+class FPLDataFetcher:
+    """Class to fetch and manage FPL player and fixture data.
+
+    Responses are cached on disk in a ``SnapshotStore`` and revalidated with
+    conditional requests once older than ``ttl`` seconds. Parsed responses are
+    also shared in-process, so each endpoint is fetched at most once per run.
+    With ``replay`` set to a snapshot name, no network requests are made at all.
+    """
+
+    BASE_URL = 'https://fantasy.premierleague.com/api/'
+    PLAYER_URL = BASE_URL + 'bootstrap-static/'
+    FIXTURE_URL = BASE_URL + 'fixtures/'
+    ELEMENT_SUMMARY_URL = BASE_URL + 'element-summary/{}/'
+
+    # Shared by every fetcher in the process: url -> parsed JSON
+    _memory_cache = {}
+
+    def __init__(self, cache_dir=None, ttl=None, replay=None, base_url=None, timeout=30):
+        if cache_dir is None:
+            cache_dir = os.environ.get('FPL_CACHE_DIR', '.fpl_cache')
+        self.store = SnapshotStore(cache_dir) if cache_dir else None
+        self.ttl = float(ttl if ttl is not None else os.environ.get('FPL_CACHE_TTL', 900))
+        self.replay = replay or os.environ.get('FPL_REPLAY') or None
+        self.base_url = base_url or os.environ.get('FPL_BASE_URL', self.BASE_URL)
+        if self.base_url != self.BASE_URL:
+            # Point at a stand-in server (e.g. for tests) without touching the class constants
+            self.PLAYER_URL = self.base_url + 'bootstrap-static/'
+            self.FIXTURE_URL = self.base_url + 'fixtures/'
+            self.ELEMENT_SUMMARY_URL = self.base_url + 'element-summary/{}/'
+        self.timeout = timeout
+        self.fetched_urls = []
+        self._replay_snapshot = None
+        if self.replay:
+            if self.store is None:
+                raise ValueError("Replay mode needs a cache directory")
+            self._replay_snapshot = self.store.load_snapshot(self.replay)
+
+    @classmethod
+    def clear_memory_cache(cls):
+        """Drops the in-process cache so the next call hits the disk store or network."""
+        cls._memory_cache.clear()
+
+    def _fetch_bytes(self, url):
+        """Returns the raw response body for ``url`` from replay, disk cache or network."""
+        if self._replay_snapshot is not None:
+            if url not in self._replay_snapshot:
+                raise LookupError(f"Snapshot '{self.replay}' has no response for {url}")
+            return self.store.read(self._replay_snapshot[url])
+
+        entry = self.store.get(url) if self.store else None
+        if entry and time.time() - entry['fetched_at'] < self.ttl:
+            return self.store.read(entry['digest'])
+
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+        import requests  # Only needed on a cache miss, so cached and replayed runs skip the import
+
+        response = requests.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and entry:
+            self.store.touch(url)
+            return self.store.read(entry['digest'])
+        response.raise_for_status()
+        if self.store:
+            self.store.put(url, response.content, response.headers.get('ETag'), response.headers.get('Last-Modified'))
+        return response.content
+
+    def get_json(self, url):
+        """Returns the parsed JSON for ``url``, fetching it at most once per process."""
+        key = (self.replay, url)
+        if key not in self._memory_cache:
+            with stage('fetch'):
+                self._memory_cache[key] = json.loads(self._fetch_bytes(url))
+        if url not in self.fetched_urls:
+            self.fetched_urls.append(url)
+        return self._memory_cache[key]
+
+    def fetch_bootstrap(self):
+        """Returns the full bootstrap-static payload."""
+        return self.get_json(self.PLAYER_URL)
+
+    def fetch_player_data(self):
+        """Fetches player data from the FPL API and returns it as a DataFrame."""
+        player_data = self.fetch_bootstrap()['elements']
+        with stage('build_frame', rows=len(player_data)):
+            return pd.DataFrame(player_data)
+
+    def fetch_fixture_data(self):
+        """Fetches fixture data from the FPL API and returns it as a DataFrame."""
+        fixture_data = self.get_json(self.FIXTURE_URL)
+        with stage('build_frame', rows=len(fixture_data)):
+            return pd.DataFrame(fixture_data)
+
+    def _player_ids(self, ids):
+        return ids if ids is not None else [player['id'] for player in self.fetch_bootstrap()['elements']]
+
+    def fetch_player_summaries(self, ids=None, concurrency=16, rate=20, retries=4):
+        """Downloads ``element-summary`` for ``ids`` (default: every player) into the cache.
+
+        Summaries younger than ``ttl`` are reused. Returns a ``BulkFetchReport``;
+        failed players are listed there rather than raised.
+        """
+        if self.store is None or self._replay_snapshot is not None:
+            raise ValueError("Bulk fetches need a cache directory and cannot run in replay mode")
+        from .bulk_fetch import BulkFetcher
+
+        fetcher = BulkFetcher(self.ELEMENT_SUMMARY_URL, self.store, concurrency=concurrency, rate=rate,
+                              retries=retries, timeout=self.timeout, ttl=self.ttl)
+        report = fetcher.fetch(self._player_ids(ids))
+        for key in report.fetched:
+            self._memory_cache.pop((self.replay, self.ELEMENT_SUMMARY_URL.format(key)), None)
+        return report
+
+    def load_player_history(self, ids=None, skip=()):
+        """Returns the stored per-gameweek history of ``ids`` (default: every player) as a DataFrame.
+
+        Reads summaries already in the cache or replay snapshot; players in
+        ``skip`` (e.g. a report's failures) are left out.
+        """
+        rows = []
+        for key in self._player_ids(ids):
+            if key not in skip:
+                rows.extend(self.get_json(self.ELEMENT_SUMMARY_URL.format(key))['history'])
+        return pd.DataFrame(rows)
+
+    def fetch_player_history(self, ids=None, **options):
+        """Bulk fetches the summaries of ``ids`` and returns their per-gameweek history.
+
+        Players whose summary could not be fetched are left out. In replay mode
+        the history comes from the snapshot alone.
+        """
+        ids = self._player_ids(ids)
+        if self._replay_snapshot is not None:
+            return self.load_player_history(ids)
+        return self.load_player_history(ids, skip=self.fetch_player_summaries(ids, **options).failed)
+
+    def save_snapshot(self, name):
+        """Pins every response this fetcher has used under ``name`` for later replay."""
+        if self.store is None:
+            raise ValueError("Snapshots need a cache directory")
+        return self.store.save_snapshot(name, self.fetched_urls)
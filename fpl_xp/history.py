@@ -0,0 +1,110 @@
+import numpy as np
+import pandas as pd
+
+from .match_events import parse_stats
+from .xp_engine import POSITION_POINTS
+
+# FPL points for events not covered by POSITION_POINTS
+ASSIST_POINTS = 3
+EVENT_POINTS = {
+    'yellow_cards': -1,
+    'red_cards': -3,
+    'own_goals': -2,
+    'penalties_saved': 5,
+    'penalties_missed': -2,
+}
+SAVES_PER_POINT = 3
+GOALS_CONCEDED_PER_POINT = 2
+COUNTED_EVENTS = ('goals_scored', 'assists', 'bonus', 'bps', 'saves') + tuple(EVENT_POINTS)
+
+
+def fixture_appearances(fixtures_df):
+    """Returns one row per (fixture, element) that took part, with that fixture's event counts.
+
+    Appearances come from the ``bps`` lists, which include every player who
+    played, so the player's team at the time comes from the side they played on.
+    """
+    finished = fixtures_df[fixtures_df['finished'].astype(bool)]
+    columns, identifiers = parse_stats(finished)
+    events = pd.DataFrame(columns)
+    events['identifier'] = np.asarray(identifiers)[events['identifier']]
+
+    wide = events.pivot_table(index=['fixture_id', 'element'], columns='identifier', values='value',
+                              aggfunc='sum', fill_value=0)
+    wide = wide.reindex(columns=list(COUNTED_EVENTS), fill_value=0)
+    sides = events[events['identifier'] == 'bps'].drop_duplicates(['fixture_id', 'element'])
+    appearances = sides[['fixture_id', 'element', 'side']].join(wide, on=['fixture_id', 'element'])
+
+    fixtures = finished.set_index('id')
+    fixture = fixtures.loc[appearances['fixture_id']]
+    home = appearances['side'].to_numpy() == 0
+    appearances['event'] = fixture['event'].to_numpy(dtype=np.int64)
+    appearances['team'] = np.where(home, fixture['team_h'], fixture['team_a'])
+    appearances['opponent'] = np.where(home, fixture['team_a'], fixture['team_h'])
+    appearances['was_home'] = home
+    appearances['difficulty'] = np.where(home, fixture['team_h_difficulty'], fixture['team_a_difficulty'])
+    appearances['goals_conceded'] = np.where(home, fixture['team_a_score'], fixture['team_h_score']).astype(np.int64)
+    return appearances.drop(columns='side').reset_index(drop=True)
+
+
+def build_player_history(fixtures_df, player_df, fixture_minutes=None):
+    """Builds per-player, per-gameweek history with reconstructed FPL points.
+
+    The fixture ``stats`` carry no minutes. ``fixture_minutes`` (rows of
+    ``element``, ``fixture`` and ``minutes``, as in the fetched
+    element-summary history) gives appearances their real minutes. Other
+    appearances are credited with the player's season-average minutes per
+    appearance from ``player_df``, i.e. today's season total, so their
+    60-minute appearance points, clean sheets and goals-conceded deductions
+    use information from after the gameweek. ``estimated_minutes`` counts
+    those appearances per row.
+    """
+    appearances = fixture_appearances(fixtures_df)
+    players = player_df.set_index('id')
+    appearance_counts = appearances.groupby('element').size()
+    season_minutes = players['minutes'].reindex(appearance_counts.index).fillna(0)
+    minutes_per_appearance = np.clip(season_minutes / appearance_counts, 0, 90)
+
+    minutes = minutes_per_appearance.reindex(appearances['element']).to_numpy()
+    estimated = np.ones(len(appearances), dtype=bool)
+    if fixture_minutes is not None and len(fixture_minutes):
+        observed = fixture_minutes.groupby(['fixture', 'element'])['minutes'].sum()
+        key = pd.MultiIndex.from_arrays([appearances['fixture_id'].to_numpy(dtype=np.int64),
+                                         appearances['element'].to_numpy(dtype=np.int64)])
+        observed = observed.reindex(key).to_numpy(dtype=np.float64)
+        estimated = np.isnan(observed)
+        minutes = np.where(estimated, minutes, observed)
+    element_type = players['element_type'].reindex(appearances['element']).fillna(0).to_numpy(dtype=np.int64)
+    points_table = np.zeros((max(POSITION_POINTS) + 1, 3))
+    for position, points in POSITION_POINTS.items():
+        points_table[position] = (points['goal'], points['assist'], points['clean_sheet'])
+    position_points = points_table[np.clip(element_type, 0, len(points_table) - 1)]
+    full_game = minutes >= 60
+    defends = np.isin(element_type, (1, 2))
+
+    appearances['minutes'] = np.round(minutes).astype(np.int64)
+    appearances['estimated_minutes'] = estimated.astype(np.int64)
+    appearances['clean_sheets'] = (full_game & (appearances['goals_conceded'] == 0)).astype(np.int64)
+    points = (
+        np.where(full_game, 2, 1) +
+        appearances['goals_scored'] * position_points[:, 0] +
+        appearances['assists'] * ASSIST_POINTS +
+        appearances['clean_sheets'] * position_points[:, 2] -
+        (full_game & defends) * (appearances['goals_conceded'] // GOALS_CONCEDED_PER_POINT) +
+        appearances['saves'] // SAVES_PER_POINT +
+        appearances['bonus']
+    )
+    for identifier, value in EVENT_POINTS.items():
+        points = points + appearances[identifier] * value
+    appearances['total_points'] = points.astype(np.int64)
+
+    summed = ['minutes', 'goals_scored', 'assists', 'clean_sheets', 'goals_conceded', 'saves', 'bonus', 'bps',
+              'total_points', 'estimated_minutes'] + list(EVENT_POINTS)
+    history = appearances.groupby(['element', 'event']).agg(
+        fixtures=('fixture_id', 'size'),
+        team=('team', 'last'),
+        difficulty=('difficulty', 'mean'),
+        **{column: (column, 'sum') for column in summed},
+    ).reset_index()
+    history['element_type'] = players['element_type'].reindex(history['element']).to_numpy()
+    return history.sort_values(['event', 'element'], ignore_index=True)
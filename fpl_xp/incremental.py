@@ -0,0 +1,244 @@
+import numpy as np
+import pandas as pd
+
+from .fixture_matrix import FixtureMatrix
+from .xp_engine import DIFFICULTY_MULTIPLIER, POSITION_POINTS, base_points, project_expected_points
+
+# Player columns the statistical model reads; a change in any of them rescores the player
+SCORING_COLUMNS = ['team', 'element_type', 'minutes', 'goals_scored', 'assists', 'clean_sheets']
+# Fixture columns that can move a team's fixtures or their difficulty
+FIXTURE_COLUMNS = ['id', 'event', 'team_h', 'team_a', 'team_h_difficulty', 'team_a_difficulty', 'finished']
+POSITIONS = (1, 2, 3, 4)
+RESORT_SIZE = 2000  # Rankings up to this size are re-sorted on update rather than patched
+RESCORE_SIZE = 2000  # Pools up to this size are rescored in full on any change rather than patched
+
+
+def _columns(frame, columns, rows=None):
+    """Returns ``columns`` of ``frame`` (optionally at ``rows``) as one float array.
+
+    Reading the columns one by one avoids copying a sub-frame first, which
+    costs more than the comparison the array is used for.
+    """
+    values = [frame[column].to_numpy(dtype=np.float64) for column in columns]
+    if rows is not None:
+        values = [column[rows] for column in values]
+    return np.column_stack(values) if values else np.empty((len(frame), 0))
+
+
+class Ranking:
+    """Rows kept sorted by descending score (ties by row), patched for the rows that changed.
+
+    Entries are held as parallel arrays of negated scores (``keys``) and
+    rows. ``position[row]`` is each member's index, so removals need no
+    search. New entries are placed with a search on the float keys, and
+    ties with one more search on (run start, row) codes. An update moves
+    array blocks once instead of re-sorting the whole table.
+    """
+
+    def __init__(self, rows, scores, size, ordered=False):
+        if ordered:
+            # ``rows`` are already sorted, e.g. the overall ranking filtered to one position
+            self.keys, self.rows = -scores[rows], rows
+        else:
+            self.keys, self.rows = self._sorted(rows, scores[rows])
+        self.position = np.full(size, -1, dtype=np.int64)
+        self.position[self.rows] = np.arange(len(self.rows))
+
+    @staticmethod
+    def _sorted(rows, scores):
+        """Returns (negated scores, rows) sorted by score, then row."""
+        rows, keys = np.asarray(rows, dtype=np.int64), -np.asarray(scores, dtype=np.float64)
+        order = np.lexsort((rows, keys))
+        return keys[order], rows[order]
+
+    def __len__(self):
+        return len(self.rows)
+
+    def _insert_positions(self, keys, rows):
+        """Returns where each new (key, row) entry goes among the current ones."""
+        positions = np.searchsorted(self.keys, keys)
+        tied = positions < len(self.keys)
+        tied[tied] = self.keys[positions[tied]] == keys[tied]
+        if tied.any():
+            # Rows ascend within a run of equal keys, so (run start, row) codes are sorted like the entries
+            size = len(self.position)
+            run_start = np.flatnonzero(np.r_[True, self.keys[1:] != self.keys[:-1]])
+            runs = np.repeat(run_start, np.diff(np.r_[run_start, len(self.keys)]))
+            codes = runs * size + self.rows
+            positions[tied] = np.searchsorted(codes, positions[tied] * size + rows[tied])
+        return positions
+
+    def update(self, removed, added, added_scores):
+        """Removes the ``removed`` rows and inserts the ``added`` rows with their new scores."""
+        if len(removed):
+            positions = self.position[removed]
+            self.position[removed] = -1
+            self.keys, self.rows = np.delete(self.keys, positions), np.delete(self.rows, positions)
+        if len(added) and len(self.rows) + len(added) <= RESORT_SIZE:
+            # Small rankings sort faster than the searches and block moves take
+            self.keys, self.rows = self._sorted(np.r_[self.rows, added], np.r_[-self.keys, added_scores])
+        elif len(added):
+            keys, rows = self._sorted(added, added_scores)
+            positions = self._insert_positions(keys, rows)
+            self.keys, self.rows = np.insert(self.keys, positions, keys), np.insert(self.rows, positions, rows)
+        if len(removed) or len(added):
+            self.position[self.rows] = np.arange(len(self.rows))
+
+
+class IncrementalScorer:
+    """Class to keep expected points and rankings current as new snapshots arrive.
+
+    Each ``update`` diffs the new ``bootstrap-static`` players and fixtures
+    against the previous ones. Players whose scoring inputs changed are
+    dirty, as are all players of a team whose fixtures changed within the
+    horizon. Only dirty players are rescored (with the same engine as
+    ``PlayerAnalyzer``), and the overall and per-position rankings are
+    patched rather than re-sorted. New or removed players, a new next
+    gameweek, or a change touching more than ``full_rebuild_fraction`` of
+    the pool fall back to a full rescore. So does any change in a pool of
+    up to ``RESCORE_SIZE`` players, where scoring and sorting everyone
+    costs less than patching; the columns already read are reused.
+    """
+
+    def __init__(self, horizon=1, rule='clip', difficulty_multiplier=DIFFICULTY_MULTIPLIER,
+                 position_points=POSITION_POINTS, full_rebuild_fraction=0.25):
+        self.horizon = horizon
+        self.rule = rule
+        self.difficulty_multiplier = difficulty_multiplier
+        self.position_points = position_points
+        self.full_rebuild_fraction = full_rebuild_fraction
+        self.player_df = None
+        self.fixtures = None
+        self.fixture_matrix = None
+
+    def _score(self, inputs, base=None):
+        """Returns (per-game base points, projected points) for rows of ``inputs``."""
+        columns = dict(zip(SCORING_COLUMNS, inputs.T))  # Skips building a DataFrame for the engine
+        if base is None:
+            base = base_points(columns, self.rule, self.position_points)
+        return base, project_expected_points(columns, self.fixture_matrix, rule=self.rule,
+                                             difficulty_multiplier=self.difficulty_multiplier,
+                                             position_points=self.position_points, base=base)
+
+    def _rebuild(self, player_df):
+        """Takes ``player_df`` as the new pool, rescoring every player and rebuilding the rankings."""
+        self.player_df = player_df
+        self.frame_rows = None
+        self.ids = player_df['id'].to_numpy(dtype=np.int64)
+        return self._rescore(_columns(player_df, SCORING_COLUMNS))
+
+    def _rescore(self, inputs, base=None):
+        """Rescores every player of the current pool from ``inputs`` and rebuilds the rankings.
+
+        ``base`` is passed when no player's inputs changed, so only the fixture part is recomputed.
+        """
+        self.inputs = inputs
+        self.element_type = self.inputs[:, SCORING_COLUMNS.index('element_type')].astype(np.int64)
+        self.team = self.inputs[:, SCORING_COLUMNS.index('team')].astype(np.int64)
+        self.base, self.points = self._score(self.inputs, base)
+        self.scores = self.points.sum(axis=1)
+        size = len(self.ids)
+        ranking = Ranking(np.arange(size), self.scores, size)
+        self.rankings = {None: ranking}
+        for position in POSITIONS:
+            rows = ranking.rows[self.element_type[ranking.rows] == position]
+            self.rankings[position] = Ranking(rows, self.scores, size, ordered=True)
+        return {'full': True, 'rescored': len(self.ids)}
+
+    def _frame_rows(self, player_df):
+        """Returns (same players, row of each stored player in ``player_df`` or None if in stored order)."""
+        ids = player_df['id'].to_numpy(dtype=np.int64)
+        if len(ids) != len(self.ids):
+            return False, None
+        if np.array_equal(ids, self.ids):
+            return True, None
+        order = np.argsort(ids)
+        found = order[np.minimum(np.searchsorted(ids, self.ids, sorter=order), len(ids) - 1)]
+        return np.array_equal(ids[found], self.ids), found
+
+    def _changed_teams(self, fixtures_df):
+        """Returns the teams whose fixtures in the horizon changed (None if the gameweek window moved)."""
+        fixtures = _columns(fixtures_df, FIXTURE_COLUMNS)
+        if self.fixtures is not None and np.array_equal(fixtures, self.fixtures, equal_nan=True):
+            return np.empty(0, dtype=np.int64)  # Nothing moved: skip rebuilding the matrix
+
+        old_matrix = self.fixture_matrix
+        self.fixtures = fixtures
+        # The columns are already read, so the matrix is built from them rather than from the frame
+        self.fixture_matrix = FixtureMatrix.from_fixtures(dict(zip(FIXTURE_COLUMNS, fixtures.T)),
+                                                          horizon=self.horizon)
+        if old_matrix is None or not np.array_equal(old_matrix.gameweeks, self.fixture_matrix.gameweeks):
+            return None
+        old, new = old_matrix.difficulty, self.fixture_matrix.difficulty
+        if old.shape == new.shape:
+            return np.flatnonzero((old != new).any(axis=(1, 2)))
+        size = (max(old.shape[0], new.shape[0]), self.horizon, max(old.shape[2], new.shape[2]))
+        padded_old, padded_new = np.zeros(size, dtype=old.dtype), np.zeros(size, dtype=new.dtype)
+        padded_old[:old.shape[0], :, :old.shape[2]] = old
+        padded_new[:new.shape[0], :, :new.shape[2]] = new
+        return np.flatnonzero((padded_old != padded_new).any(axis=(1, 2)))
+
+    def update(self, player_df, fixtures_df):
+        """Applies a new pair of snapshots and returns a summary of what was rescored.
+
+        Players are matched by id, so a reordered table only costs a lookup:
+        only the scoring columns are read, and the rows stay in stored order.
+        Spotting what changed reads and compares those columns for every
+        player, so even an unchanged snapshot costs O(players); the rest of
+        the work scales with the size of the change.
+        """
+        changed_teams = self._changed_teams(fixtures_df)
+        same_players, frame_rows = self._frame_rows(player_df) if self.player_df is not None else (False, None)
+        if changed_teams is None or not same_players:
+            return dict(self._rebuild(player_df), changed_players=len(player_df), changed_teams='all')
+
+        inputs = _columns(player_df, SCORING_COLUMNS, frame_rows)
+        changed = (inputs != self.inputs).any(axis=1)
+        self.player_df, self.frame_rows = player_df, frame_rows  # Price and news columns are taken as they are
+        report = {'changed_players': int(changed.sum()), 'changed_teams': changed_teams.tolist()}
+        if len(self.ids) <= RESCORE_SIZE:
+            if report['changed_players']:
+                return dict(self._rescore(inputs), **report)
+            if len(changed_teams):
+                return dict(self._rescore(inputs, self.base), **report)
+            return dict(report, full=False, rescored=0)
+
+        dirty = changed
+        if len(changed_teams):
+            new_team = inputs[:, SCORING_COLUMNS.index('team')].astype(np.int64)
+            dirty = dirty | np.isin(self.team, changed_teams) | np.isin(new_team, changed_teams)
+        dirty_rows = np.flatnonzero(dirty)
+        if len(dirty_rows) > self.full_rebuild_fraction * len(self.ids):
+            return dict(self._rescore(inputs), **report)
+        if len(dirty_rows):
+            old_element_type = self.element_type[dirty_rows]
+            self.inputs[dirty_rows] = inputs[dirty_rows]
+            self.element_type[dirty_rows] = inputs[dirty_rows, SCORING_COLUMNS.index('element_type')]
+            self.team[dirty_rows] = inputs[dirty_rows, SCORING_COLUMNS.index('team')]
+            self.base[dirty_rows], self.points[dirty_rows] = self._score(inputs[dirty_rows])
+            self.scores[dirty_rows] = self.points[dirty_rows].sum(axis=1)
+
+            self.rankings[None].update(dirty_rows, dirty_rows, self.scores[dirty_rows])
+            for position in POSITIONS:
+                removed = dirty_rows[old_element_type == position]
+                added = dirty_rows[self.element_type[dirty_rows] == position]
+                self.rankings[position].update(removed, added, self.scores[added])
+        return dict(report, full=False, rescored=len(dirty_rows))
+
+    def top(self, n=10, position=None):
+        """Returns the top ``n`` players overall or for one position (element type)."""
+        rows = self.rankings[position].rows[:n]
+        frame_rows = rows if self.frame_rows is None else self.frame_rows[rows]
+        top = self.player_df.iloc[frame_rows][['id', 'web_name', 'element_type', 'team', 'now_cost']].copy()
+        top['expected_points'] = self.points[rows, 0]
+        if self.horizon > 1:
+            top['horizon_points'] = self.scores[rows]
+        return top
+
+    def expected_points(self):
+        """Returns the current next-gameweek expected points aligned with ``player_df``."""
+        points = self.points[:, 0]
+        if self.frame_rows is not None:
+            points = np.empty_like(points)
+            points[self.frame_rows] = self.points[:, 0]
+        return pd.Series(points, index=self.player_df.index, name='expected_points')
@@ -0,0 +1,143 @@
+"""Projected points and ranks for a whole league of managers' squads.
+
+Picks use the layout of the API's ``entry/{id}/event/{gw}/picks/`` endpoint,
+one row per pick: ``entry``, ``element``, ``position`` (1-15, 12-15 being
+the bench), ``multiplier`` (0 benched, 1 playing, 2 captain, 3 triple
+captain), ``is_captain`` and ``is_vice_captain``. ``multiplier`` may be
+left out, in which case it is derived from ``position`` and ``is_captain``.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.sparse import csr_matrix
+from scipy.stats import rankdata
+
+from .profiling import stage
+from .squad_evaluator import SQUAD_SIZE, XI_SIZE, SquadEvaluator
+
+RULED_OUT = ('i', 'n', 's', 'u')  # Statuses of players who will not play (injured, not in squad, ...)
+
+
+class LeagueSquads:
+    """Class to hold every manager's picks as a sparse manager x player matrix.
+
+    Row m of ``matrix`` holds manager m's multiplier for each player column,
+    so all projected scores are one sparse matrix-vector product with the
+    xP vector. Each manager's captain and vice-captain columns are kept as
+    well: when the captain is ruled out, the captain's extra multiplier
+    moves to the vice-captain, as the game does.
+
+    With ``element_type`` known, the 15 picks of every full squad are also
+    kept in position order (``lineups``, rows of ``lineup_managers``), so
+    ruled-out starters can be replaced by the bench as in the game's
+    auto-substitutions.
+    """
+
+    def __init__(self, entries, player_ids, matrix, captain, vice_captain, captain_extra,
+                 element_type=None, lineups=None, lineup_managers=None):
+        self.entries = entries
+        self.player_ids = player_ids
+        self.matrix = matrix
+        self.captain = captain
+        self.vice_captain = vice_captain
+        self.captain_extra = captain_extra
+        self.element_type = element_type
+        self.lineups = lineups
+        self.lineup_managers = lineup_managers
+
+    @classmethod
+    def from_picks(cls, picks, player_ids, element_type=None):
+        """Builds the matrix from a picks DataFrame; columns follow the order of ``player_ids``.
+
+        ``element_type`` (same order as ``player_ids``) enables bench
+        auto-substitutions for managers with all 15 picks.
+        """
+        with stage('build_league', rows=len(picks)):
+            player_ids = np.asarray(player_ids)
+            entries, manager = np.unique(picks['entry'].to_numpy(), return_inverse=True)
+            elements = picks['element'].to_numpy()
+            id_order = np.argsort(player_ids, kind='stable')
+            found = np.minimum(np.searchsorted(player_ids[id_order], elements), len(player_ids) - 1)
+            column = id_order[found]
+            unknown = player_ids[column] != elements
+            if unknown.any():
+                raise KeyError(f"Picked players not in the player table: {sorted(set(elements[unknown].tolist()))[:10]}")
+
+            is_captain = picks['is_captain'].to_numpy(dtype=bool)
+            is_vice_captain = picks['is_vice_captain'].to_numpy(dtype=bool)
+            if 'multiplier' in picks:
+                multiplier = picks['multiplier'].to_numpy(dtype=np.float32)
+            else:
+                multiplier = (picks['position'].to_numpy() <= XI_SIZE) * (1 + is_captain).astype(np.float32)
+            matrix = csr_matrix((multiplier, (manager, column)), shape=(len(entries), len(player_ids)))
+            matrix.sum_duplicates()
+
+            # -1 marks a manager without a captain (or vice-captain)
+            captain = np.full(len(entries), -1, dtype=np.int64)
+            captain[manager[is_captain]] = column[is_captain]
+            vice_captain = np.full(len(entries), -1, dtype=np.int64)
+            vice_captain[manager[is_vice_captain]] = column[is_vice_captain]
+            captain_extra = np.zeros(len(entries), dtype=np.float32)
+            captain_extra[manager[is_captain]] = np.maximum(multiplier[is_captain] - 1, 0)
+
+            lineups = lineup_managers = None
+            if element_type is not None:
+                element_type = np.asarray(element_type, dtype=np.int64)
+                # Picks sorted by manager then position; only squads holding positions 1-15 once get a lineup
+                position = picks['position'].to_numpy()
+                order = np.lexsort((position, manager))
+                counts = np.bincount(manager, minlength=len(entries))
+                full = np.repeat(counts == SQUAD_SIZE, counts)
+                positions = position[order][full].reshape(-1, SQUAD_SIZE)
+                in_order = (positions == np.arange(1, SQUAD_SIZE + 1)).all(axis=1)
+                lineups = column[order][full].reshape(-1, SQUAD_SIZE)[in_order]
+                lineup_managers = np.flatnonzero(counts == SQUAD_SIZE)[in_order]
+        return cls(entries, player_ids, matrix, captain, vice_captain, captain_extra,
+                   element_type, lineups, lineup_managers)
+
+    def __len__(self):
+        return len(self.entries)
+
+    def project(self, expected_points, plays=None):
+        """Returns every manager's projected points for an xP vector aligned with ``player_ids``.
+
+        ``plays`` is an optional boolean vector (same order) of players expected
+        to play. Players who will not play score nothing, managers whose
+        captain will not play get the captaincy moved to their vice-captain,
+        if the vice plays, and, for squads with a lineup, bench players come
+        on for absent starters (goalkeeper for goalkeeper, keeping the
+        formation valid). Squads without a lineup get no auto-substitutions.
+        """
+        expected_points = np.nan_to_num(np.asarray(expected_points, dtype=np.float64))
+        with stage('project_league', rows=len(self)):
+            if plays is None:
+                return self.matrix @ expected_points
+            plays = np.asarray(plays, dtype=bool)
+            playing_points = np.where(plays, expected_points, 0)
+            points = self.matrix @ playing_points
+            captain, vice_captain = self.captain, self.vice_captain
+            switch = ((captain >= 0) & (vice_captain >= 0) & ~plays[captain] & plays[vice_captain])
+            points[switch] += self.captain_extra[switch] * (
+                playing_points[vice_captain[switch]] - playing_points[captain[switch]])
+            if self.lineups is not None and len(self.lineups):
+                # Who plays is certain here, so the evaluator's substitutions are exact
+                evaluator = SquadEvaluator(expected_points, plays, self.element_type, captain=False)
+                _, substituted = evaluator.expected_points(self.lineups)
+                points[self.lineup_managers] += substituted
+        return points
+
+    def evaluate(self, expected_points, plays=None, current_points=None):
+        """Returns a DataFrame of projected points and rank per manager, best first.
+
+        ``current_points`` (aligned with ``entries``) ranks managers on their
+        current total plus the projection instead of the projection alone.
+        Ties share the best rank, as in league standings.
+        """
+        points = self.project(expected_points, plays)
+        league = pd.DataFrame({'entry': self.entries, 'projected_points': points})
+        total = points
+        if current_points is not None:
+            league['current_points'] = np.asarray(current_points, dtype=np.float64)
+            total = league['projected_total'] = league['current_points'].to_numpy() + points
+        league['projected_rank'] = rankdata(-total, method='min').astype(np.int64)
+        return league.sort_values(['projected_rank', 'entry'], ignore_index=True)
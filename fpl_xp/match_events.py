@@ -0,0 +1,135 @@
+import ast
+import os
+import re
+
+import numpy as np
+import pandas as pd
+
+EVENT_TABLE_PATH = 'match_events.npz'
+
+# Codes for the ``identifier`` column; unseen identifiers are appended at the end
+IDENTIFIERS = (
+    'goals_scored', 'assists', 'own_goals', 'penalties_saved', 'penalties_missed',
+    'yellow_cards', 'red_cards', 'saves', 'bonus', 'bps',
+)
+SIDES = ('h', 'a')
+
+COLUMNS = {
+    'fixture_id': np.int32,
+    'event': np.int16,
+    'element': np.int32,
+    'identifier': np.uint8,
+    'value': np.int16,
+    'side': np.uint8,
+}
+
+# The CSV stores ``stats`` as a Python repr, so a regex pass is far cheaper than literal_eval
+_BLOCK_RE = re.compile(r"'identifier': '(\w+)', 'a': \[(.*?)\], 'h': \[(.*?)\]")
+_ENTRY_RE = re.compile(r"'value': (-?\d+), 'element': (\d+)")
+
+
+def _iter_stats(stats):
+    """Yields (identifier, side, value, element) tuples from one fixture's ``stats``."""
+    if isinstance(stats, str):
+        blocks = _BLOCK_RE.findall(stats)
+        if blocks or stats.strip() in ('', '[]'):
+            for identifier, away, home in blocks:
+                for side, entries in (('h', home), ('a', away)):
+                    for value, element in _ENTRY_RE.findall(entries):
+                        yield identifier, side, int(value), int(element)
+            return
+        # Unexpected layout (e.g. different key order): fall back to the slow path
+        stats = ast.literal_eval(stats)
+    for block in stats or []:
+        for side in SIDES:
+            for entry in block.get(side, []):
+                yield block['identifier'], side, entry['value'], entry['element']
+
+
+def parse_stats(fixtures_df, identifiers=IDENTIFIERS):
+    """Parses the ``stats`` column of ``fixtures_df`` into typed column arrays.
+
+    Returns ``(columns, identifiers)`` where ``identifiers`` is the (possibly
+    extended) tuple that the ``identifier`` codes index into.
+    """
+    identifiers = list(identifiers)
+    codes = {name: code for code, name in enumerate(identifiers)}
+    fixture_ids, events, elements, identifier_codes, values, sides = [], [], [], [], [], []
+    for fixture_id, event, stats in zip(fixtures_df['id'].to_numpy(), fixtures_df['event'].to_numpy(),
+                                        fixtures_df['stats'].to_numpy()):
+        for identifier, side, value, element in _iter_stats(stats):
+            if identifier not in codes:
+                codes[identifier] = len(identifiers)
+                identifiers.append(identifier)
+            fixture_ids.append(fixture_id)
+            events.append(event)
+            elements.append(element)
+            identifier_codes.append(codes[identifier])
+            values.append(value)
+            sides.append(0 if side == 'h' else 1)
+
+    columns = {
+        'fixture_id': np.array(fixture_ids, dtype=COLUMNS['fixture_id']),
+        'event': np.array(events, dtype=COLUMNS['event']),
+        'element': np.array(elements, dtype=COLUMNS['element']),
+        'identifier': np.array(identifier_codes, dtype=COLUMNS['identifier']),
+        'value': np.array(values, dtype=COLUMNS['value']),
+        'side': np.array(sides, dtype=COLUMNS['side']),
+    }
+    return columns, tuple(identifiers)
+
+
+def _read_store(path):
+    """Reads the stored arrays, or an empty table when the store does not exist yet."""
+    if not os.path.exists(path):
+        empty = {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+        return empty, IDENTIFIERS, np.empty(0, dtype=np.int32)
+    with np.load(path, allow_pickle=False) as store:
+        columns = {name: store[name] for name in COLUMNS}
+        return columns, tuple(store['identifiers'].tolist()), store['parsed_fixtures']
+
+
+def update_event_table(fixtures_df, path=EVENT_TABLE_PATH):
+    """Parses fixtures that have finished since the last run and appends them to the store.
+
+    Returns the number of newly parsed fixtures.
+    """
+    columns, identifiers, parsed_fixtures = _read_store(path)
+    finished = fixtures_df['finished'].astype(bool).to_numpy()
+    new_fixtures = fixtures_df[finished & ~np.isin(fixtures_df['id'].to_numpy(), parsed_fixtures)]
+    if new_fixtures.empty and os.path.exists(path):
+        return 0
+
+    new_columns, identifiers = parse_stats(new_fixtures, identifiers)
+    columns = {name: np.concatenate([columns[name], new_columns[name]]) for name in COLUMNS}
+    parsed_fixtures = np.concatenate([parsed_fixtures, new_fixtures['id'].to_numpy(dtype=np.int32)])
+
+    tmp_path = f"{path}.{os.getpid()}.tmp.npz"
+    np.savez(tmp_path, identifiers=np.array(identifiers), parsed_fixtures=parsed_fixtures, **columns)
+    os.replace(tmp_path, path)
+    return len(new_fixtures)
+
+
+def load_event_table(path=EVENT_TABLE_PATH):
+    """Loads the match-event table as a long DataFrame with categorical identifier/side."""
+    columns, identifiers, _ = _read_store(path)
+    table = pd.DataFrame(columns)
+    table['identifier'] = pd.Categorical.from_codes(table['identifier'], categories=list(identifiers))
+    table['side'] = pd.Categorical.from_codes(table['side'], categories=list(SIDES))
+    return table
+
+
+def player_gameweek_totals(table):
+    """Pivots the event table into one row per (element, event) with a column per identifier."""
+    totals = table.pivot_table(index=['element', 'event'], columns='identifier', values='value',
+                               aggfunc='sum', fill_value=0, observed=True)
+    totals.columns = totals.columns.astype(str)
+    return totals.reset_index()
+
+
+if __name__ == '__main__':
+    from .storage import FIXTURE_SCHEMA, read_table
+
+    fixtures_df = read_table('fixture_info.table', schema=FIXTURE_SCHEMA)
+    added = update_event_table(fixtures_df)
+    print(f"Parsed {added} newly finished fixtures into {EVENT_TABLE_PATH}")
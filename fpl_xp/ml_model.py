@@ -0,0 +1,76 @@
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.metrics import mean_squared_error
+from sklearn.model_selection import train_test_split
+
+from .profiling import stage
+
+# Features for the model (we'll use form, goals, assists, clean sheets, minutes, etc.)
+FEATURES = ['now_cost', 'form', 'goals_scored', 'assists', 'clean_sheets', 'minutes']
+TARGET = 'expected_points'
+
+
+def train_model(fpl_data, features=FEATURES, target=TARGET, n_estimators=100, random_state=42, n_jobs=None,
+                warm_start_from=None, holdout=None):
+    """Trains the Random Forest on an 80/20 split and returns (model, test MSE).
+
+    With ``warm_start_from`` the given forest keeps its trees and only the
+    extra trees up to ``n_estimators`` are fitted on the new data.
+    ``holdout`` is a boolean mask of the test rows to use instead of a
+    random split; if it selects no rows, every row is trained on and the
+    MSE is None.
+    """
+    X = fpl_data[features].astype(float)
+    y = fpl_data[target]
+
+    if holdout is None:
+        # Split the data into training and testing sets (80% train, 20% test)
+        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=random_state)
+    else:
+        holdout = np.asarray(holdout, dtype=bool)
+        X_train, X_test, y_train, y_test = X[~holdout], X[holdout], y[~holdout], y[holdout]
+
+    if warm_start_from is not None:
+        rf_model = warm_start_from
+        rf_model.set_params(warm_start=True, n_estimators=n_estimators, n_jobs=n_jobs)
+    else:
+        rf_model = RandomForestRegressor(n_estimators=n_estimators, random_state=random_state, n_jobs=n_jobs)
+    with stage('train_model', rows=len(X_train)):
+        rf_model.fit(X_train, y_train)
+
+    mse = mean_squared_error(y_test, rf_model.predict(X_test)) if len(X_test) else None
+    return rf_model, mse
+
+
+def predict_points(rf_model, fpl_data, features=FEATURES):
+    """Predicts points for every player with a trained model."""
+    with stage('predict', rows=len(fpl_data)):
+        return rf_model.predict(fpl_data[features].astype(float))
+
+
+def predict_form_points(player_df, fixtures_df, gameweek, history=None, model_store=None, feature_store=None,
+                        n_jobs=-1):
+    """Predicts ``gameweek`` points from rolling-form features, trained on real gameweek points.
+
+    The feature store is brought up to date with ``history`` (default: the
+    fetched history table, else history rebuilt from fixture stats). The
+    forest is trained on every finished gameweek's features and outcomes,
+    through ``model_store`` when one is given. Returns (predictions aligned
+    with ``player_df``, model info).
+    """
+    from .feature_store import FORM_FEATURES, FORM_TARGET, FeatureStore, load_history
+
+    feature_store = feature_store or FeatureStore()
+    history = load_history(fixtures_df, player_df) if history is None else history
+    feature_store.update(history, fixtures_df)
+    training = feature_store.training_frame(history, player_df, fixtures_df)
+    if training.empty:
+        raise ValueError("No finished gameweeks with history to train on")
+    if model_store is not None:
+        rf_model, info = model_store.get_or_train(training, features=FORM_FEATURES, target=FORM_TARGET,
+                                                  lineage='ml_xp_form', gameweek=gameweek, n_jobs=n_jobs)
+    else:
+        rf_model, mse = train_model(training, FORM_FEATURES, FORM_TARGET, n_jobs=n_jobs)
+        info = {'source': 'trained', 'n_estimators': len(rf_model.estimators_), 'mse': mse, 'rows': len(training)}
+    features = feature_store.features(gameweek, player_df, fixtures_df)
+    return predict_points(rf_model, features, FORM_FEATURES), info
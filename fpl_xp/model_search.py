@@ -0,0 +1,226 @@
+"""Cross-validated comparison of regressors and hyperparameter grids.
+
+Every (model, parameters, fold) combination is one task. Folds group rows
+by gameweek, so a gameweek is never split between training and testing.
+Tasks run in a process pool whose workers map the feature matrix, target
+and fold ids from one ``SharedMemory`` block instead of receiving pickled
+copies. Each task's scores and timings are cached as JSON under a key of
+the data, model, parameters and fold, so adding a grid point only
+computes that point.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .feature_store import FORM_FEATURES, FORM_TARGET
+from .profiling import stage
+
+# Model name -> parameter grid; every combination is cross-validated
+MODEL_GRID = {
+    'random_forest': {'n_estimators': [100, 200], 'max_depth': [None, 10], 'min_samples_leaf': [1, 5]},
+    'gradient_boosting': {'learning_rate': [0.05, 0.1], 'max_leaf_nodes': [15, 31], 'max_iter': [200]},
+    'ridge': {'alpha': [0.1, 1.0, 10.0]},
+    'linear': {},
+    'mean': {},
+}
+RANDOM_STATE = 42
+
+# Worker-side views of the shared arrays, set once per worker by _attach
+_shared = {}
+
+
+def build_estimator(model, params):
+    """Returns an unfitted estimator for a ``MODEL_GRID`` name and parameters."""
+    if model == 'random_forest':
+        from sklearn.ensemble import RandomForestRegressor
+
+        return RandomForestRegressor(random_state=RANDOM_STATE, n_jobs=1, **params)
+    if model == 'gradient_boosting':
+        from sklearn.ensemble import HistGradientBoostingRegressor
+
+        return HistGradientBoostingRegressor(random_state=RANDOM_STATE, **params)
+    if model in ('ridge', 'linear'):
+        from sklearn.linear_model import LinearRegression, Ridge
+        from sklearn.pipeline import make_pipeline
+        from sklearn.preprocessing import StandardScaler
+
+        return make_pipeline(StandardScaler(), Ridge(**params) if model == 'ridge' else LinearRegression(**params))
+    if model == 'mean':
+        from sklearn.dummy import DummyRegressor
+
+        return DummyRegressor(**params)
+    raise ValueError(f"Unknown model: {model}")
+
+
+def expand_grid(grid):
+    """Returns [(model, params)] for every combination in ``grid``, in a stable order."""
+    candidates = []
+    for model, space in grid.items():
+        names = sorted(space)
+        for values in itertools.product(*(space[name] for name in names)):
+            candidates.append((model, dict(zip(names, values))))
+    return candidates
+
+
+def assign_folds(groups, n_splits):
+    """Returns the fold of every row, splitting by group (gameweek) into ``n_splits`` balanced folds."""
+    from sklearn.model_selection import GroupKFold
+
+    folds = np.empty(len(groups), dtype=np.int8)
+    for fold, (_, test) in enumerate(GroupKFold(n_splits=n_splits).split(groups, groups=groups)):
+        folds[test] = fold
+    return folds
+
+
+def _evaluate(X, y, folds, model, params, fold):
+    """Fits on every fold but ``fold``, scores on ``fold`` and returns the metrics and timings."""
+    train, test = folds != fold, folds == fold
+    estimator = build_estimator(model, params)
+    start = time.perf_counter()
+    estimator.fit(X[train], y[train])
+    fitted = time.perf_counter()
+    predicted = estimator.predict(X[test])
+    predict_seconds = time.perf_counter() - fitted
+    error = predicted - y[test]
+    return {'mse': float(np.mean(error ** 2)), 'mae': float(np.mean(np.abs(error))),
+            'fit_seconds': fitted - start, 'predict_seconds': predict_seconds,
+            'train_rows': int(train.sum()), 'test_rows': int(test.sum())}
+
+
+def _attach(name, shape):
+    """Pool initializer: maps the shared block as read-only X, y and fold arrays."""
+    from multiprocessing import shared_memory
+
+    # Pool workers share the parent's resource tracker, so the parent's unlink stays the only cleanup
+    block = shared_memory.SharedMemory(name=name)
+    rows, columns = shape
+    X = np.ndarray((rows, columns), dtype=np.float64, buffer=block.buf)
+    y = np.ndarray(rows, dtype=np.float64, buffer=block.buf, offset=X.nbytes)
+    folds = np.ndarray(rows, dtype=np.int8, buffer=block.buf, offset=X.nbytes + y.nbytes)
+    for array in (X, y, folds):
+        array.flags.writeable = False
+    _shared.update(block=block, X=X, y=y, folds=folds)
+
+
+def _run_task(task):
+    model, params, fold = task
+    return _evaluate(_shared['X'], _shared['y'], _shared['folds'], model, params, fold)
+
+
+class ModelSearch:
+    """Class to cross-validate a model grid by gameweek and rank the candidates.
+
+    ``training`` has one row per player and gameweek (see
+    ``FeatureStore.training_frame``). Results are cached per fold under
+    ``cache_dir``.
+    """
+
+    def __init__(self, training, features=FORM_FEATURES, target=FORM_TARGET, group='gameweek', n_splits=5,
+                 cache_dir='.model_search'):
+        self.X = np.ascontiguousarray(training[list(features)].to_numpy(dtype=np.float64))
+        self.y = np.ascontiguousarray(training[target].to_numpy(dtype=np.float64))
+        groups = training[group].to_numpy()
+        if len(np.unique(groups)) < n_splits:
+            raise ValueError(f"Need at least {n_splits} {group} values for {n_splits} folds")
+        self.folds = assign_folds(groups, n_splits)
+        self.n_splits = n_splits
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
+        digest = hashlib.sha256()
+        digest.update(json.dumps({'features': list(features), 'target': target}).encode())
+        for array in (self.X, self.y, self.folds):
+            digest.update(array.tobytes())
+        self.data_key = digest.hexdigest()
+
+    def _cache_path(self, model, params, fold):
+        key = json.dumps({'data': self.data_key, 'model': model, 'params': params, 'fold': fold,
+                          'random_state': RANDOM_STATE}, sort_keys=True)
+        return os.path.join(self.cache_dir, f"{hashlib.sha256(key.encode()).hexdigest()}.json")
+
+    def _load_cached(self, path):
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def _save(self, path, result):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(result, f)
+        os.replace(tmp_path, path)
+
+    def run(self, grid=MODEL_GRID, workers=None):
+        """Cross-validates every candidate in ``grid`` and returns the leaderboard, best first.
+
+        Only the (candidate, fold) pairs missing from the cache are computed.
+        """
+        candidates = expand_grid(grid)
+        tasks = [(model, params, fold) for model, params in candidates for fold in range(self.n_splits)]
+        results = {}
+        for task in tasks:
+            path = self._cache_path(*task)
+            cached = self._load_cached(path)
+            if cached is not None:
+                results[path] = dict(cached, cached=True)
+        missing = [task for task in tasks if self._cache_path(*task) not in results]
+
+        with stage('model_search', rows=len(missing)):
+            for task, result in zip(missing, self._compute(missing, workers)):
+                path = self._cache_path(*task)
+                self._save(path, result)
+                results[path] = dict(result, cached=False)
+        return self._leaderboard(candidates, results)
+
+    def _compute(self, tasks, workers):
+        """Yields the result of every task, in order."""
+        workers = min(workers or os.cpu_count(), len(tasks))
+        if workers <= 1:
+            for model, params, fold in tasks:
+                yield _evaluate(self.X, self.y, self.folds, model, params, fold)
+            return
+
+        from multiprocessing import shared_memory
+
+        size = self.X.nbytes + self.y.nbytes + self.folds.nbytes
+        block = shared_memory.SharedMemory(create=True, size=size)
+        try:
+            offset = 0
+            for array in (self.X, self.y, self.folds):
+                np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf, offset=offset)[...] = array
+                offset += array.nbytes
+            with ProcessPoolExecutor(max_workers=workers, initializer=_attach,
+                                     initargs=(block.name, self.X.shape)) as pool:
+                # Slowest tasks first so the pool does not end on one long forest
+                order = sorted(range(len(tasks)), key=lambda index: tasks[index][0] != 'random_forest')
+                futures = {index: pool.submit(_run_task, tasks[index]) for index in order}
+                for index in range(len(tasks)):
+                    yield futures[index].result()
+        finally:
+            block.close()
+            block.unlink()
+
+    def _leaderboard(self, candidates, results):
+        rows = []
+        for model, params in candidates:
+            folds = [results[self._cache_path(model, params, fold)] for fold in range(self.n_splits)]
+            mse = np.array([fold['mse'] for fold in folds])
+            rows.append({
+                'model': model,
+                'params': json.dumps(params, sort_keys=True),
+                'mse': mse.mean(),
+                'mse_std': mse.std(),
+                'mae': np.mean([fold['mae'] for fold in folds]),
+                'fit_seconds': np.mean([fold['fit_seconds'] for fold in folds]),
+                'predict_seconds': np.mean([fold['predict_seconds'] for fold in folds]),
+                'cached_folds': sum(fold['cached'] for fold in folds),
+            })
+        leaderboard = pd.DataFrame(rows).sort_values(['mse', 'model', 'params'], ignore_index=True)
+        leaderboard.insert(0, 'rank', np.arange(1, len(leaderboard) + 1))
+        return leaderboard
@@ -0,0 +1,131 @@
+import hashlib
+import json
+import os
+import time
+
+import joblib
+import numpy as np
+
+from .ml_model import FEATURES, TARGET, train_model
+from .profiling import stage
+
+
+class ModelStore:
+    """Class to persist trained Random Forests keyed by their training data.
+
+    A model's key hashes the feature matrix, the target, the feature list and
+    the training parameters, so an unchanged input is never retrained. Models
+    are saved uncompressed with joblib and loaded with ``mmap_mode='r'``, so
+    the arrays are read straight from the page cache instead of being
+    unpickled through a buffer (scikit-learn still copies tree nodes into
+    its own storage). Each model records its ``lineage`` and ``gameweek``.
+    When a newer gameweek of the same lineage arrives, the previous forest
+    is warm-started with extra trees instead of being rebuilt, until it
+    would exceed ``max_estimators``.
+    """
+
+    def __init__(self, root='.model_store'):
+        self.root = root
+        self.index_path = os.path.join(root, 'index.json')
+        os.makedirs(root, exist_ok=True)
+        self.index = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path) as f:
+                self.index = json.load(f)
+
+    def _write_index(self):
+        tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.index, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.index_path)
+
+    def _model_path(self, key):
+        return os.path.join(self.root, f"{key}.joblib")
+
+    @staticmethod
+    def data_key(fpl_data, features, target, params):
+        """Returns a content hash of the training inputs and parameters."""
+        digest = hashlib.sha256()
+        digest.update(json.dumps({'features': list(features), 'target': target, 'params': params},
+                                 sort_keys=True).encode())
+        digest.update(np.ascontiguousarray(fpl_data[list(features)].to_numpy(dtype=np.float64)).tobytes())
+        digest.update(np.ascontiguousarray(fpl_data[target].to_numpy(dtype=np.float64)).tobytes())
+        return digest.hexdigest()
+
+    def save(self, key, model, **metadata):
+        """Writes a model and its metadata to the store."""
+        tmp_path = f"{self._model_path(key)}.{os.getpid()}.tmp"
+        joblib.dump(model, tmp_path)  # Uncompressed so it can be memory-mapped
+        os.replace(tmp_path, self._model_path(key))
+        self.index[key] = dict(metadata, created=time.time())
+        self._write_index()
+
+    def load(self, key, mmap=True):
+        """Loads a stored model, memory-mapped unless ``mmap`` is False."""
+        return joblib.load(self._model_path(key), mmap_mode='r' if mmap else None)
+
+    def latest(self, lineage, features, before_gameweek):
+        """Returns the key of the newest model of ``lineage`` trained before ``before_gameweek``."""
+        candidates = [
+            (entry['gameweek'], entry['created'], key) for key, entry in self.index.items()
+            if entry.get('lineage') == lineage and entry.get('features') == list(features)
+            and entry.get('gameweek') is not None and entry['gameweek'] < before_gameweek
+            and os.path.exists(self._model_path(key))
+        ]
+        return max(candidates)[2] if candidates else None
+
+    @staticmethod
+    def newest_gameweek(fpl_data):
+        """Returns a mask of the rows of the newest gameweek in ``fpl_data``, or of no rows.
+
+        No rows are selected when there is no ``gameweek`` column or only one
+        gameweek, as then no rows are known to be new since the last model.
+        """
+        if 'gameweek' not in fpl_data:
+            return np.zeros(len(fpl_data), dtype=bool)
+        gameweek = fpl_data['gameweek'].to_numpy()
+        if len(np.unique(gameweek)) < 2:
+            return np.zeros(len(fpl_data), dtype=bool)
+        return gameweek == gameweek.max()
+
+    def get_or_train(self, fpl_data, features=FEATURES, target=TARGET, lineage='ml_xp', gameweek=None,
+                     n_estimators=100, trees_per_gameweek=20, max_estimators=300, random_state=42, n_jobs=-1):
+        """Returns ``(model, info)``, reusing, warm-starting or training a forest as needed.
+
+        ``info['source']`` is ``'cache'`` for an exact hit, ``'warm_start'`` when
+        trees were added to the previous gameweek's forest and ``'trained'``
+        for a fresh fit. A fresh fit's ``mse`` is on a random 20% of the rows.
+        A warm start's is on the newest gameweek's rows, which neither the
+        parent forest nor the added trees are fitted on (they are trained on
+        at the next warm start); without a newer gameweek it is None.
+        """
+        params = {'n_estimators': n_estimators, 'random_state': random_state, 'lineage': lineage,
+                  'gameweek': gameweek}
+        key = self.data_key(fpl_data, features, target, params)
+        if key in self.index and os.path.exists(self._model_path(key)):
+            with stage('load_model'):
+                model = self.load(key)
+            model.n_jobs = n_jobs
+            return model, dict(self.index[key], key=key, source='cache')
+
+        previous = self.latest(lineage, features, gameweek) if gameweek is not None else None
+        if previous is not None and self.index[previous]['n_estimators'] + trees_per_gameweek > max_estimators:
+            previous = None  # Start a fresh forest rather than growing without bound
+        if previous is not None:
+            base = self.load(previous, mmap=False)  # Warm starting mutates the forest
+            # The parent's trees saw a random share of the older rows, so only rows it never saw give a fair MSE
+            holdout = self.newest_gameweek(fpl_data)
+            model, mse = train_model(fpl_data, features, target,
+                                     n_estimators=len(base.estimators_) + trees_per_gameweek,
+                                     random_state=random_state, n_jobs=n_jobs, warm_start_from=base, holdout=holdout)
+            source = 'warm_start'
+        else:
+            model, mse = train_model(fpl_data, features, target, n_estimators=n_estimators,
+                                     random_state=random_state, n_jobs=n_jobs)
+            source = 'trained'
+
+        metadata = {'lineage': lineage, 'gameweek': gameweek, 'features': list(features), 'target': target,
+                    'n_estimators': len(model.estimators_), 'mse': mse, 'rows': len(fpl_data),
+                    'parent': previous}
+        self.save(key, model, **metadata)
+        return model, dict(metadata, key=key, source=source)
@@ -0,0 +1,219 @@
+import numpy as np
+
+from .profiling import stage
+
+STATUS_CODES = ('a', 'd', 'i', 'n', 's', 'u')  # Available, doubtful, injured, not in squad, suspended, unavailable
+STAT_COLUMNS = ('total_points', 'minutes', 'goals_scored', 'assists', 'clean_sheets', 'bonus')
+CHANCE_COLUMN = 'chance_of_playing_next_round'  # Kept as a stat when present; NaN means no news
+NAME_COLUMNS = ('first_name', 'second_name')
+
+
+def _group_index(keys, n_groups):
+    """Returns (order, offsets) so rows with key k are ``order[offsets[k]:offsets[k + 1]]``."""
+    order = np.argsort(keys, kind='stable').astype(np.int32)
+    offsets = np.zeros(n_groups + 1, dtype=np.int32)
+    np.cumsum(np.bincount(keys, minlength=n_groups), out=offsets[1:])
+    return order, offsets
+
+
+class PlayerStore:
+    """Class to hold the player table as typed NumPy columns (struct of arrays).
+
+    Ids are int16 while they fit (int32 for larger multi-season archives),
+    teams int16, positions and statuses uint8 and stats float32. Names stay
+    object arrays. Rows are indexed by id through a sorted id array and by
+    team and position through grouped row orders, so lookups never scan
+    the table.
+    """
+
+    def __init__(self, ids, team, position, status, stats, names):
+        self.ids = ids
+        self.team = team
+        self.position = position
+        self.status = status
+        self.stats = stats
+        self.names = names
+        self._id_order = np.argsort(ids, kind='stable').astype(np.int32)
+        self._sorted_ids = ids[self._id_order]
+        self._team_index = _group_index(team, int(team.max(initial=0)) + 1)
+        self._position_index = _group_index(position, int(position.max(initial=0)) + 1)
+
+    @classmethod
+    def from_frame(cls, players_data):
+        """Builds a store from a bootstrap-static ``elements`` DataFrame."""
+        ids = players_data['id'].to_numpy()
+        id_dtype = np.int16 if len(ids) == 0 or ids.max() <= np.iinfo(np.int16).max else np.int32
+        codes = players_data['status'].to_numpy(dtype=str)
+        unknown = ~np.isin(codes, STATUS_CODES)
+        if unknown.any():
+            raise ValueError(f"Unknown player status codes: {sorted(set(codes[unknown]))}")
+        status = np.searchsorted(STATUS_CODES, codes).astype(np.uint8)
+        stat_columns = STAT_COLUMNS + ((CHANCE_COLUMN,) if CHANCE_COLUMN in players_data else ())
+        return cls(
+            ids=ids.astype(id_dtype),
+            team=players_data['team'].to_numpy(dtype=np.int16),
+            position=players_data['element_type'].to_numpy(dtype=np.uint8),
+            status=status,
+            stats={column: players_data[column].to_numpy(dtype=np.float32) for column in stat_columns},
+            names={column: players_data[column].to_numpy(dtype=object) for column in NAME_COLUMNS},
+        )
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __getitem__(self, row):
+        return Player(self, row)
+
+    def __iter__(self):
+        return (Player(self, row) for row in range(len(self)))
+
+    def take(self, rows):
+        """Returns a new store holding only ``rows`` (an index array or boolean mask)."""
+        return PlayerStore(self.ids[rows], self.team[rows], self.position[rows], self.status[rows],
+                           {column: values[rows] for column, values in self.stats.items()},
+                           {column: values[rows] for column, values in self.names.items()})
+
+    def row_for_id(self, player_id):
+        """Returns the row of ``player_id``, raising KeyError if it is not in the store."""
+        found = np.searchsorted(self._sorted_ids, player_id)
+        if found == len(self._sorted_ids) or self._sorted_ids[found] != player_id:
+            raise KeyError(player_id)
+        return int(self._id_order[found])
+
+    def rows_for_team(self, team):
+        order, offsets = self._team_index
+        return order[offsets[team]:offsets[team + 1]] if 0 <= team < len(offsets) - 1 else order[:0]
+
+    def rows_for_position(self, position):
+        order, offsets = self._position_index
+        return order[offsets[position]:offsets[position + 1]] if 0 <= position < len(offsets) - 1 else order[:0]
+
+    def available(self):
+        """Boolean mask of players who are active and likely to play."""
+        return self.status == STATUS_CODES.index('a')
+
+    def play_probability(self):
+        """Each player's chance of playing next gameweek (see ``squad_evaluator.play_probability``)."""
+        from .squad_evaluator import play_probability
+
+        return play_probability(np.asarray(STATUS_CODES)[self.status], self.stats.get(CHANCE_COLUMN))
+
+    def expected_points(self):
+        """Vectorized ``Player.calculate_expected_points`` for every row."""
+        stats = self.stats
+        return (stats['total_points'] + stats['goals_scored'] * 4 + stats['assists'] * 3 +
+                stats['clean_sheets'] * 1 + stats['bonus'])
+
+    def nbytes(self):
+        """Returns the memory held by the typed columns and indexes (name strings excluded)."""
+        arrays = [self.ids, self.team, self.position, self.status, self._id_order, self._sorted_ids,
+                  *self._team_index, *self._position_index, *self.stats.values(), *self.names.values()]
+        return sum(array.nbytes for array in arrays)
+
+
+def _column_property(attribute, column=None):
+    """Returns a property reading ``store.<attribute>[row]`` (or ``store.<attribute>[column][row]``)."""
+    def getter(self):
+        values = getattr(self._store, attribute)
+        value = (values if column is None else values[column])[self._row]
+        return value.item() if isinstance(value, np.generic) else value
+    return property(getter)
+
+
+class Player:
+    """Represents a player with relevant stats and expected points calculation.
+
+    A lightweight view of one row of a ``PlayerStore``: attributes are read
+    from the store's columns on access rather than copied.
+    """
+
+    __slots__ = ('_store', '_row')
+
+    def __init__(self, store, row):
+        self._store = store
+        self._row = row
+
+    id = _column_property('ids')
+    team = _column_property('team')
+    position = _column_property('position')
+    first_name = _column_property('names', 'first_name')
+    second_name = _column_property('names', 'second_name')
+    total_points = _column_property('stats', 'total_points')
+    minutes = _column_property('stats', 'minutes')
+    goals_scored = _column_property('stats', 'goals_scored')
+    assists = _column_property('stats', 'assists')
+    clean_sheets = _column_property('stats', 'clean_sheets')
+    bonus = _column_property('stats', 'bonus')
+
+    @property
+    def status(self):
+        return STATUS_CODES[self._store.status[self._row]]  # Active ('a'), Injured ('i'), etc.
+
+    def __repr__(self):
+        return f"Player(id={self.id}, {self.first_name} {self.second_name})"
+
+    def is_available(self):
+        """Check if the player is active and likely to play."""
+        return self.status == 'a'
+
+    def calculate_expected_points(self):
+        """Calculate expected points based on an algorithm involving goals, assists, and recent performance."""
+        # Example formula for expected points
+        base_points = self.total_points
+        goal_contribution = self.goals_scored * 4  # Assuming 4 points per goal
+        assist_contribution = self.assists * 3     # Assuming 3 points per assist
+        clean_sheet_bonus = self.clean_sheets * 1  # Assuming 1 point per clean sheet
+
+        # Expected points formula — feel free to adjust this based on your actual algorithm
+        expected_points = base_points + goal_contribution + assist_contribution + clean_sheet_bonus + self.bonus
+        return expected_points
+
+class TeamSelector:
+    """Class to represent and select an active team and calculate expected points.
+
+    The squad is the best 2 goalkeepers, 5 defenders, 5 midfielders and 3
+    forwards by total points. The starting XI is the squad's best valid
+    formation, and the bench only scores through auto-substitutions for
+    starters who may not play (see ``SquadEvaluator``).
+    """
+
+    def __init__(self, players_data):
+        # Filter to only include players who are available (status 'a')
+        with stage('build_store', rows=len(players_data)):
+            store = players_data if isinstance(players_data, PlayerStore) else PlayerStore.from_frame(players_data)
+            self.store = store.take(store.available())
+        self._squad = None  # (lineup rows, starting points, bench points), computed on first use
+
+    @property
+    def players(self):
+        return list(self.store)
+
+    def _squad_rows(self):
+        """Returns (lineup rows, starting points, bench points), picking and scoring the squad once."""
+        if self._squad is None:
+            self._squad = self._pick_squad()
+        return self._squad
+
+    def _pick_squad(self):
+        from .squad_evaluator import SQUAD_QUOTAS, SquadEvaluator
+
+        # Stable sort keeps the original order among players on equal points
+        with stage('select_team', rows=len(self.store)):
+            order = np.argsort(-self.store.stats['total_points'], kind='stable')
+            position = self.store.position[order]
+            squad = np.concatenate([order[position == element_type][:quota]
+                                    for element_type, quota in SQUAD_QUOTAS.items()])
+            evaluator = SquadEvaluator(self.store.expected_points(), self.store.play_probability(),
+                                       self.store.position, captain=False)
+            lineups, _, _, total, substituted = evaluator.best(squad[None])
+        return lineups[0], float(total[0] - substituted[0]), float(substituted[0])
+
+    def select_squad(self):
+        """Select the best starting 11 and a 4-player bench (reserve keeper first) among active players."""
+        lineup, _, _ = self._squad_rows()
+        return [self.store[row] for row in lineup[:11]], [self.store[row] for row in lineup[11:]]
+
+    def calculate_squad_expected_points(self):
+        """Calculate the expected points of the starting 11 and those the bench adds through auto-substitutions."""
+        _, starting_points, bench_points = self._squad_rows()
+        return starting_points, bench_points
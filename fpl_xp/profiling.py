@@ -0,0 +1,287 @@
+"""Stage-level instrumentation for the pipeline.
+
+Library code marks its expensive steps with ``stage``::
+
+    with stage('score', rows=len(player_df)):
+        ...
+
+When no ``Profiler`` is active (the normal case) ``stage`` returns a shared
+no-op context, so instrumented code pays one function call. Under an
+active profiler every stage records wall and CPU time, its peak memory
+growth, RSS at exit and a row count. Peak memory is the kernel's RSS
+high-water mark, reset at each stage boundary (Linux), which costs nothing
+and includes native allocations; elsewhere it falls back to
+``tracemalloc``, which slows Python-heavy code down noticeably. One chosen
+stage can also be run under ``cProfile``. Traces are written as JSON or in
+the Chrome trace event format (open in ``chrome://tracing`` or Perfetto).
+"""
+
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+_active = None
+
+
+class _NullStage:
+    """The shared no-op stage; ``rows`` can be set like on a ``Stage`` but is not kept."""
+
+    __slots__ = ()
+
+    @property
+    def rows(self):
+        return None
+
+    @rows.setter
+    def rows(self, rows):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+def _status_bytes(field):
+    """Reads a ``VmRSS``/``VmHWM`` style field of /proc/self/status, or None where it is not available."""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith(field):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return None
+
+
+def _rss_bytes():
+    return _status_bytes('VmRSS:')
+
+
+def _reset_peak_rss():
+    """Resets the RSS high-water mark to the current RSS; returns False if the kernel does not allow it."""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        return False
+    return True
+
+
+class Stage:
+    """Class to time one named stage; set ``rows`` inside the block if the count is only known then."""
+
+    def __init__(self, profiler, name, rows, parent):
+        self.profiler = profiler
+        self.name = name
+        self.rows = rows
+        self.parent = parent
+        self.child_peak = 0
+
+    def __enter__(self):
+        profiler = self.profiler
+        if self.parent is not None:
+            # Fold the parent's peak so far in before resetting it for this stage
+            self.parent.child_peak = max(self.parent.child_peak, profiler._peak_memory())
+        self.memory_start = profiler._reset_memory()
+        if self.name == profiler.cprofile_stage and profiler.cprofiler is None:
+            import cProfile
+
+            profiler.cprofiler = cProfile.Profile()
+            profiler.cprofiler.enable()
+            self.cprofiled = True
+        else:
+            self.cprofiled = False
+        profiler._stack().append(self)
+        self.cpu_start = time.process_time()
+        self.wall_start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        wall = time.perf_counter() - self.wall_start
+        cpu = time.process_time() - self.cpu_start
+        profiler = self.profiler
+        profiler._stack().pop()
+        if self.cprofiled:
+            profiler.cprofiler.disable()
+        peak = max(self.child_peak, profiler._peak_memory())
+        if self.parent is not None:
+            self.parent.child_peak = max(self.parent.child_peak, peak)
+        profiler.records.append({
+            'name': self.name,
+            'parent': self.parent.name if self.parent is not None else None,
+            'depth': len(profiler._stack()),
+            'thread': threading.get_ident(),
+            'start': self.wall_start - profiler.started,
+            'wall': wall,
+            'cpu': cpu,
+            'peak_memory': peak - self.memory_start,
+            'rss': _rss_bytes(),
+            'rows': self.rows,
+            'error': exc_type.__name__ if exc_type is not None else None,
+        })
+        return False
+
+
+class Profiler:
+    """Class to collect stage records for one run.
+
+    Use it as a context manager to make it the active profiler. Stages
+    nest per thread. ``cprofile_stage`` names the stage to run under
+    ``cProfile`` (the first time it is entered). ``memory`` is ``'rss'``,
+    ``'tracemalloc'`` or None (no memory figures); by default RSS is used
+    where its peak can be reset.
+    """
+
+    def __init__(self, cprofile_stage=None, memory='auto'):
+        self.cprofile_stage = cprofile_stage
+        if memory == 'auto':
+            memory = 'rss' if _reset_peak_rss() else 'tracemalloc'
+        self.memory = memory
+        self.cprofiler = None
+        self.records = []
+        self._local = threading.local()
+        self.started = None
+        self._started_tracemalloc = False
+
+    def _stack(self):
+        if not hasattr(self._local, 'stack'):
+            self._local.stack = []
+        return self._local.stack
+
+    def __enter__(self):
+        global _active
+        if _active is not None:
+            raise RuntimeError("Another profiler is already active")
+        if self.memory == 'tracemalloc' and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        self.started = time.perf_counter()
+        self.started_at = time.time()
+        _active = self
+        return self
+
+    def __exit__(self, *exc_info):
+        global _active
+        _active = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+        return False
+
+    def _reset_memory(self):
+        """Starts a new peak-memory window and returns the memory in use now."""
+        if self.memory == 'rss':
+            _reset_peak_rss()
+            return _rss_bytes()
+        if self.memory == 'tracemalloc':
+            tracemalloc.reset_peak()
+            return tracemalloc.get_traced_memory()[0]
+        return 0
+
+    def _peak_memory(self):
+        if self.memory == 'rss':
+            return _status_bytes('VmHWM:')
+        if self.memory == 'tracemalloc':
+            return tracemalloc.get_traced_memory()[1]
+        return 0
+
+    def stage(self, name, rows=None):
+        stack = self._stack()
+        return Stage(self, name, rows, stack[-1] if stack else None)
+
+    def summary(self):
+        """Returns per-stage totals: calls, wall, CPU, max peak memory and rows, in first-seen order."""
+        totals = {}
+        for record in sorted(self.records, key=lambda record: record['start']):
+            total = totals.setdefault(record['name'], {'name': record['name'], 'calls': 0, 'wall': 0.0,
+                                                       'cpu': 0.0, 'peak_memory': 0, 'rows': None})
+            total['calls'] += 1
+            total['wall'] += record['wall']
+            total['cpu'] += record['cpu']
+            total['peak_memory'] = max(total['peak_memory'], record['peak_memory'])
+            if record['rows'] is not None:
+                total['rows'] = (total['rows'] or 0) + record['rows']
+        return list(totals.values())
+
+    def to_dict(self, command=None):
+        return {
+            'command': command,
+            'started_at': self.started_at,
+            'memory': self.memory,
+            'cprofile_stage': self.cprofile_stage,
+            'stages': self.summary(),
+            'records': sorted(self.records, key=lambda record: record['start']),
+        }
+
+    def write_json(self, path, command=None):
+        """Writes the per-stage summary and every stage record as JSON."""
+        with open(path, 'w') as f:
+            json.dump(self.to_dict(command), f, indent=1)
+
+    def write_chrome_trace(self, path):
+        """Writes the records as Chrome trace "complete" events (microsecond timestamps)."""
+        threads = {}
+        events = []
+        for record in self.records:
+            tid = threads.setdefault(record['thread'], len(threads))
+            args = {'cpu_ms': record['cpu'] * 1000, 'peak_memory': record['peak_memory'], 'rss': record['rss']}
+            if record['rows'] is not None:
+                args['rows'] = record['rows']
+            events.append({'name': record['name'], 'cat': 'stage', 'ph': 'X', 'pid': os.getpid(), 'tid': tid,
+                           'ts': record['start'] * 1e6, 'dur': record['wall'] * 1e6, 'args': args})
+        with open(path, 'w') as f:
+            json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+
+    def write_cprofile(self, path):
+        """Writes the ``cprofile_stage`` statistics (for ``pstats``/snakeviz); False if it never ran."""
+        if self.cprofiler is None:
+            return False
+        self.cprofiler.dump_stats(path)
+        return True
+
+    def format_summary(self):
+        lines = [f"{'stage':<24} {'calls':>5} {'wall ms':>10} {'cpu ms':>10} {'peak MB':>9} {'rows':>9}"]
+        for total in self.summary():
+            rows = '' if total['rows'] is None else str(total['rows'])
+            lines.append(f"{total['name']:<24} {total['calls']:>5} {total['wall'] * 1000:>10.1f} "
+                         f"{total['cpu'] * 1000:>10.1f} {total['peak_memory'] / 1e6:>9.1f} {rows:>9}")
+        return '\n'.join(lines)
+
+
+def stage(name, rows=None):
+    """Returns a context manager timing ``name`` under the active profiler (a no-op without one)."""
+    if _active is None:
+        return _NULL_STAGE
+    return _active.stage(name, rows)
+
+
+def find_regressions(baseline, current, threshold=0.2, min_seconds=0.005):
+    """Returns the stages whose wall time grew by more than ``threshold`` over ``baseline``.
+
+    Both arguments are traces as written by ``write_json`` (or their parsed
+    dicts). Stages faster than ``min_seconds`` in both runs are ignored as noise.
+    """
+    if isinstance(baseline, str):
+        with open(baseline) as f:
+            baseline = json.load(f)
+    if isinstance(current, str):
+        with open(current) as f:
+            current = json.load(f)
+    before = {total['name']: total for total in baseline['stages']}
+    regressions = []
+    for total in current['stages']:
+        old = before.get(total['name'])
+        if old is None or max(old['wall'], total['wall']) < min_seconds:
+            continue
+        change = total['wall'] / old['wall'] - 1 if old['wall'] else float('inf')
+        if change > threshold:
+            regressions.append({'name': total['name'], 'baseline': old['wall'], 'current': total['wall'],
+                                'change': change})
+    return regressions
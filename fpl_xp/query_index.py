@@ -0,0 +1,134 @@
+"""Read-only query index over one scoring run's players.
+
+Built once per scored table, it answers the interactive questions ("best
+defenders under 5.0m with 900+ minutes", "best value midfielders") without
+filtering and re-sorting the whole table each time.
+"""
+
+import numpy as np
+
+POSITIONS = {'Goalkeeper': 1, 'Defender': 2, 'Midfielder': 3, 'Forward': 4}
+TOP_K = 100  # Players kept per price level for price-bounded top-N queries
+
+
+class _Partition:
+    """Rows of one position (or every player) in the index's precomputed orders."""
+
+    def __init__(self, rows, points, cost, minutes, top_k):
+        # Best first, ties broken by row so results are deterministic
+        self.by_points = rows[np.lexsort((rows, -points[rows]))]
+        value = points[rows] / np.maximum(cost[rows], 1) * 10
+        self.by_value = rows[np.lexsort((rows, -value))]
+        # Sidecars: cost and minutes in each order, so filters read contiguous slices
+        self.sidecars = {
+            'points': (cost[self.by_points], minutes[self.by_points]),
+            'value': (cost[self.by_value], minutes[self.by_value]),
+        }
+
+        # Rows by price, best first within a price; each price level is then one contiguous slice
+        by_cost = rows[np.lexsort((rows, -points[rows], cost[rows]))]
+        self.levels, starts = np.unique(cost[by_cost], return_index=True)
+        stops = np.append(starts[1:], len(by_cost))
+
+        # Best ``top_k`` rows by points among players costing at most each price level
+        self.level_best = []
+        self.level_complete = stops <= top_k  # Every player up to that price fits in the list
+        best = rows[:0]
+        for start, stop in zip(starts, stops):
+            merged = np.concatenate([best, by_cost[start:min(stop, start + top_k)]])
+            best = merged[np.lexsort((merged, -points[merged]))][:top_k]
+            self.level_best.append(best)
+
+        # Pareto frontier of points against price: each step up in price buys more points
+        running_best = np.maximum.accumulate(points[by_cost]) if len(by_cost) else points[by_cost]
+        on_frontier = np.r_[True, points[by_cost][1:] > running_best[:-1]][:len(by_cost)]
+        self.frontier = by_cost[on_frontier]
+        self.frontier_cost = cost[self.frontier]
+
+
+class PlayerIndex:
+    """Class to answer top-N, price-bounded and value-per-million queries in sublinear time.
+
+    Per position (and for all players) it keeps rows sorted by points and
+    by points per million, with cost and minutes sidecars in the same
+    order. It also keeps the best ``top_k`` rows under every price level
+    and the Pareto frontier of points against price. A price-bounded top-N
+    is a binary search plus a slice; other filtered queries scan the sorted
+    rows in growing chunks and stop once ``n`` rows matched. Queries return
+    row positions into ``player_df``; costs are in millions, as on the FPL site.
+    """
+
+    def __init__(self, player_df, points_column='expected_points', top_k=TOP_K):
+        self.player_df = player_df
+        self.points = np.nan_to_num(player_df[points_column].to_numpy(dtype=np.float64), nan=-np.inf)
+        self.cost = player_df['now_cost'].to_numpy(dtype=np.int64)
+        self.minutes = player_df['minutes'].to_numpy(dtype=np.int64)
+        self.top_k = top_k
+        element_type = player_df['element_type'].to_numpy(dtype=np.int64)
+        rows = np.arange(len(player_df))
+        self.partitions = {None: _Partition(rows, self.points, self.cost, self.minutes, top_k)}
+        for position in POSITIONS.values():
+            self.partitions[position] = _Partition(rows[element_type == position], self.points, self.cost,
+                                                   self.minutes, top_k)
+
+    def _partition(self, position):
+        position = POSITIONS.get(position, position)
+        if position not in self.partitions:
+            raise KeyError(f"Unknown position: {position}")
+        return self.partitions[position]
+
+    def top(self, n=10, position=None, max_cost=None, min_minutes=0, by='points'):
+        """Returns the rows of the best ``n`` players (all matches if ``n`` is None), best first.
+
+        ``by`` is ``'points'`` or ``'value'`` (points per million). Players
+        need at least ``min_minutes`` minutes and to cost ``max_cost`` or less.
+        """
+        if by not in ('points', 'value'):
+            raise ValueError(f"Unknown ordering: {by}")
+        partition = self._partition(position)
+        max_tenths = None if max_cost is None else round(max_cost * 10)
+        if by == 'points' and max_tenths is not None and n is not None and n <= self.top_k:
+            level = np.searchsorted(partition.levels, max_tenths, side='right') - 1
+            if level < 0:
+                return partition.by_points[:0]
+            candidates = partition.level_best[level]
+            if min_minutes:
+                candidates = candidates[self.minutes[candidates] >= min_minutes]
+            if len(candidates) >= n or partition.level_complete[level]:
+                return candidates[:n]
+        return self._scan(partition, by, n, max_tenths, min_minutes)
+
+    def _scan(self, partition, by, n, max_tenths, min_minutes):
+        """Walks the sorted rows in doubling chunks until ``n`` pass the filters."""
+        order = partition.by_points if by == 'points' else partition.by_value
+        cost, minutes = partition.sidecars[by]
+        if max_tenths is None and not min_minutes:
+            return order[:n]
+        found, count, start = [], 0, 0
+        chunk = len(order) if n is None else max(4 * n, 64)
+        while start < len(order) and (n is None or count < n):
+            stop = start + chunk
+            keep = np.ones(len(order[start:stop]), dtype=bool)
+            if max_tenths is not None:
+                keep &= cost[start:stop] <= max_tenths
+            if min_minutes:
+                keep &= minutes[start:stop] >= min_minutes
+            found.append(order[start:stop][keep])
+            count += len(found[-1])
+            start, chunk = stop, chunk * 2
+        rows = np.concatenate(found) if found else order[:0]
+        return rows if n is None else rows[:n]
+
+    def frontier(self, position=None):
+        """Returns the rows on the points/price Pareto frontier, cheapest first."""
+        return self._partition(position).frontier
+
+    def best_under(self, max_cost, position=None):
+        """Returns the row of the highest-scoring player costing at most ``max_cost``, or None."""
+        partition = self._partition(position)
+        found = np.searchsorted(partition.frontier_cost, round(max_cost * 10), side='right') - 1
+        return int(partition.frontier[found]) if found >= 0 else None
+
+    def frame(self, rows):
+        """Returns the ``player_df`` rows at ``rows``, in that order."""
+        return self.player_df.iloc[rows]
@@ -0,0 +1,219 @@
+"""Scenario sweeps over the scoring rules.
+
+A scenario overrides any of the scoring constants in ``xp_engine``:
+``difficulty_multiplier`` (difficulty -> factor), ``position_points``
+(element type -> partial ``{'goal', 'assist', 'clean_sheet'}``),
+``minutes_points`` and ``appearance_bonus``; anything it leaves out keeps
+the default. Every player's expected points are linear in these
+constants, so each player is reduced once to per-game rates and fixture
+counts per difficulty. A batch of scenarios is then a few small matrix
+products, computed in chunks of scenarios to bound memory.
+"""
+
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from .profiling import stage
+from .xp_engine import (APPEARANCE_BONUS, DIFFICULTY_MULTIPLIER, MINUTES_POINTS, NEUTRAL_DIFFICULTY, POSITION_POINTS,
+                        games_played, multiplier_lookup, position_lookup)
+
+MAX_CELLS = 2 ** 22  # Scenario x player points held at once (32 MB of float64)
+POSITION_NAMES = {1: 'Goalkeeper', 2: 'Defender', 3: 'Midfielder', 4: 'Forward'}
+
+
+def multiplier_curve(slope):
+    """Returns a difficulty multiplier table moving ``slope`` per difficulty step away from neutral."""
+    return {difficulty: round(1 + slope * (NEUTRAL_DIFFICULTY - difficulty), 10) for difficulty in range(1, 6)}
+
+
+def scenario_grid(slopes=(None,), goal_scales=(None,), minutes_points=(None,), appearance_bonus=(None,)):
+    """Returns one scenario per combination of the given values (None keeps the default).
+
+    ``slopes`` feed ``multiplier_curve`` and ``goal_scales`` multiply every
+    position's goal points.
+    """
+    scenarios = []
+    for slope, goal_scale, per_minute, bonus in itertools.product(slopes, goal_scales, minutes_points,
+                                                                  appearance_bonus):
+        scenario, name = {}, []
+        if slope is not None:
+            scenario['difficulty_multiplier'] = multiplier_curve(slope)
+            name.append(f"slope={slope:g}")
+        if goal_scale is not None:
+            scenario['position_points'] = {position: {'goal': points['goal'] * goal_scale}
+                                           for position, points in POSITION_POINTS.items()}
+            name.append(f"goals x{goal_scale:g}")
+        if per_minute is not None:
+            scenario['minutes_points'] = per_minute
+            name.append(f"minutes={per_minute:g}")
+        if bonus is not None:
+            scenario['appearance_bonus'] = bonus
+            name.append(f"appearance={bonus:g}")
+        scenario['name'] = ', '.join(name) or 'default'
+        scenarios.append(scenario)
+    return scenarios
+
+
+def compile_scenarios(scenarios, n_difficulties):
+    """Turns scenario dicts into (weights, factors, appearance) arrays.
+
+    ``weights`` is (scenarios, types + 1, 4): goal, assist, clean-sheet and
+    per-minute points by element type, with a last row for unknown types
+    (minutes only). ``factors`` is (scenarios, n_difficulties).
+    """
+    n_types = max(POSITION_POINTS) + 1
+    weights = np.zeros((len(scenarios), n_types + 1, 4))
+    factors = np.ones((len(scenarios), n_difficulties))
+    appearance = np.empty(len(scenarios))
+    for index, scenario in enumerate(scenarios):
+        position_points = {position: dict(points) for position, points in POSITION_POINTS.items()}
+        for position, points in scenario.get('position_points', {}).items():
+            position_points.setdefault(int(position), {'goal': 0, 'assist': 0, 'clean_sheet': 0}).update(points)
+        lookup = position_lookup(position_points)[:n_types]
+        weights[index, :len(lookup), :3] = lookup
+        weights[index, :, 3] = scenario.get('minutes_points', MINUTES_POINTS)
+        multipliers = scenario.get('difficulty_multiplier', DIFFICULTY_MULTIPLIER)
+        lookup = multiplier_lookup({int(difficulty): factor for difficulty, factor in multipliers.items()})
+        factors[index, :min(len(lookup), n_difficulties)] = lookup[:n_difficulties]
+        appearance[index] = scenario.get('appearance_bonus', APPEARANCE_BONUS)
+    return weights, factors, appearance
+
+
+class ScenarioSweep:
+    """Class to score every player under a batch of scoring-rule scenarios at once.
+
+    Points are summed over every gameweek of ``fixture_matrix`` and match
+    ``project_expected_points`` for the same constants.
+    """
+
+    def __init__(self, player_df, fixture_matrix, rule='clip'):
+        self.player_df = player_df
+        # Players are held grouped by element type, so each type's points are one contiguous block
+        n_types = max(POSITION_POINTS) + 1
+        element_type = player_df['element_type'].to_numpy(dtype=np.int64)
+        element_type = np.where((element_type >= 0) & (element_type < n_types), element_type, n_types)
+        self.order = np.argsort(element_type, kind='stable')
+        types, starts = np.unique(element_type[self.order], return_index=True)
+        stops = np.append(starts[1:], len(self.order))
+        self.type_slices = {int(position): slice(start, stop) for position, start, stop in zip(types, starts, stops)}
+
+        players = player_df.iloc[self.order]
+        minutes = players['minutes'].to_numpy(dtype=np.float64)
+        games = games_played(minutes, rule)
+        self.rates = np.stack([players['goals_scored'].to_numpy(dtype=np.float64) / games,
+                               players['assists'].to_numpy(dtype=np.float64) / games,
+                               players['clean_sheets'].to_numpy(dtype=np.float64) / games,
+                               minutes / games])
+
+        # Fixtures per player and difficulty over the horizon (difficulty 0 is no fixture)
+        teams = players['team'].to_numpy(dtype=np.int64)
+        known = (teams >= 0) & (teams < fixture_matrix.difficulty.shape[0])
+        difficulty = np.zeros((len(teams),) + fixture_matrix.difficulty.shape[1:], dtype=np.int64)
+        difficulty[known] = fixture_matrix.difficulty[teams[known]]
+        difficulty = difficulty.reshape(len(teams), -1)
+        self.n_difficulties = max(int(difficulty.max(initial=0)), max(DIFFICULTY_MULTIPLIER)) + 1
+        cells = np.arange(len(teams))[:, None] * self.n_difficulties + difficulty
+        self.counts = np.bincount(cells[difficulty > 0], minlength=len(teams) * self.n_difficulties)
+        self.counts = self.counts.reshape(len(teams), self.n_difficulties).astype(np.float64)
+        self.appearances = (difficulty > 0).sum(axis=1) * (minutes >= 60)
+
+    def points(self, scenarios):
+        """Returns the (scenarios, players) expected points for one batch of scenarios, in ``player_df`` order."""
+        points = np.empty((len(scenarios), len(self.order)))
+        points[:, self.order] = self._points(scenarios)
+        return points
+
+    def _points(self, scenarios):
+        """Points with players grouped by type (``self.order``)."""
+        weights, factors, appearance = compile_scenarios(scenarios, self.n_difficulties)
+        points = np.empty((len(scenarios), len(self.order)))
+        for position, rows in self.type_slices.items():
+            np.matmul(weights[:, position], self.rates[:, rows], out=points[:, rows])
+        points *= factors @ self.counts.T
+        points += appearance[:, None] * self.appearances
+        return points
+
+    def run(self, scenarios, top_n=10, max_cells=MAX_CELLS):
+        """Scores every scenario and returns (per-scenario summary, per-player summary).
+
+        Each scenario is compared with the default rules: its captain pick,
+        best player per position, how many of the default top ``top_n`` it
+        keeps and the Spearman correlation of its ranking with the default
+        one. Per player, points ranges and how often they make the top
+        ``top_n`` or the captaincy show who is sensitive to the rules.
+        """
+        n_players = len(self.order)
+        baseline = self._points([{}])[0]
+        baseline_rank = _ranks(baseline[None])[0]
+        baseline_top = baseline_rank <= top_n
+        chunk = max(1, max_cells // max(n_players, 1))
+
+        summaries = []
+        total = np.zeros(n_players)
+        low, high = np.full(n_players, np.inf), np.full(n_players, -np.inf)
+        top_count, captain_count = np.zeros(n_players, dtype=np.int64), np.zeros(n_players, dtype=np.int64)
+        with stage('scenario_sweep', rows=len(scenarios) * n_players):
+            for start in range(0, len(scenarios), chunk):
+                points = self._points(scenarios[start:start + chunk])
+                ranks = _ranks(points)
+                in_top = ranks <= top_n
+                captain = np.argmax(points, axis=1)
+                summary = {
+                    'captain': self.order[captain],
+                    'captain_points': points[np.arange(len(points)), captain],
+                    'top_overlap': (in_top & baseline_top).sum(axis=1),
+                    'rank_correlation': 1 - 6 * ((ranks - baseline_rank) ** 2).sum(axis=1) /
+                                        (n_players * (n_players ** 2 - 1)),
+                }
+                for position, name in POSITION_NAMES.items():
+                    rows = self.type_slices.get(position)
+                    if rows is not None:
+                        summary[f"best_{name.lower()}"] = self.order[rows.start + np.argmax(points[:, rows], axis=1)]
+                summaries.append(summary)
+
+                total += points.sum(axis=0)
+                np.minimum(low, points.min(axis=0), out=low)
+                np.maximum(high, points.max(axis=0), out=high)
+                top_count += in_top.sum(axis=0)
+                captain_count += np.bincount(captain, minlength=n_players)
+        per_player = [baseline, baseline_rank, total, low, high, top_count, captain_count]
+        for index, values in enumerate(per_player):  # Back to player_df order
+            per_player[index] = np.empty_like(values)
+            per_player[index][self.order] = values
+        return self._scenario_frame(scenarios, summaries), self._player_frame(*per_player, len(scenarios))
+
+    def _label(self, rows):
+        column = 'web_name' if 'web_name' in self.player_df else 'id'
+        return self.player_df[column].to_numpy()[rows]
+
+    def _scenario_frame(self, scenarios, summaries):
+        merged = {key: np.concatenate([summary[key] for summary in summaries]) for key in summaries[0]}
+        frame = pd.DataFrame({'scenario': [scenario.get('name', index) for index, scenario in enumerate(scenarios)]})
+        frame['captain'] = self._label(merged.pop('captain'))
+        for key, values in merged.items():
+            frame[key] = self._label(values) if key.startswith('best_') else values
+        return frame
+
+    def _player_frame(self, baseline, baseline_rank, total, low, high, top_count, captain_count, n_scenarios):
+        frame = pd.DataFrame({'id': self.player_df['id'].to_numpy()}, index=self.player_df.index)
+        for column in ('web_name', 'position'):
+            if column in self.player_df:
+                frame[column] = self.player_df[column].to_numpy()
+        frame['baseline_points'] = baseline
+        frame['baseline_rank'] = baseline_rank
+        frame['mean_points'] = total / n_scenarios
+        frame['min_points'] = low
+        frame['max_points'] = high
+        frame['top_share'] = top_count / n_scenarios
+        frame['captain_share'] = captain_count / n_scenarios
+        return frame.sort_values(['top_share', 'baseline_points'], ascending=False)
+
+
+def _ranks(points):
+    """Returns 1-based ranks (1 = most points) along each row; tied players are ranked in any order."""
+    order = np.argsort(-points, axis=1)
+    ranks = np.empty_like(order)
+    np.put_along_axis(ranks, order, np.arange(1, points.shape[1] + 1)[None], axis=1)
+    return ranks
@@ -0,0 +1,209 @@
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .xp_engine import DIFFICULTY_MULTIPLIER, POSITION_POINTS, multiplier_lookup, position_lookup
+
+CAMEO_SHARE = 0.3      # Chance a non-starter who has played this season comes off the bench
+CAMEO_MINUTES = 0.25   # Fraction of a full game a cameo lasts, scaling scoring rates
+MAX_BONUS = 3
+SAVES_PER_POINT = 3
+GOALS_CONCEDED_PER_POINT = 2
+MIN_POINTS, MAX_POINTS = -10, 60  # Histogram range; draws outside are clipped
+MAX_DRAW = 8  # Cap on goals/assists/bonus drawn per player per fixture
+CDF_EPSILON = 1 - 2 ** -24  # float32 uniforms never exceed this
+
+
+def _column(player_df, name, default=0.0):
+    if name not in player_df:
+        return np.full(len(player_df), default)
+    return pd.to_numeric(player_df[name], errors='coerce').fillna(default).to_numpy(dtype=np.float64)
+
+
+def player_rates(player_df, n_teams=0):
+    """Derives per-player, per-90 event rates from the bootstrap-static columns.
+
+    Team rates cover at least ``n_teams`` teams, so they line up with the
+    fixture matrix whichever players are passed in.
+    """
+    minutes = _column(player_df, 'minutes')
+    games = np.maximum(minutes / 90, 1)
+    chance = pd.to_numeric(player_df['chance_of_playing_next_round'], errors='coerce').to_numpy(dtype=np.float64)
+    status = player_df['status'].to_numpy() if 'status' in player_df else np.full(len(player_df), 'a')
+    # No news means fully available for active players and unavailable otherwise
+    available = np.where(np.isnan(chance), (status == 'a').astype(np.float64), chance / 100)
+    start = np.clip(_column(player_df, 'starts_per_90'), 0, 1) * (minutes > 0)
+    cameo = CAMEO_SHARE * (1 - start) * (minutes > 0)
+
+    # Goals conceded is a team event: use the minutes-weighted team average
+    team = player_df['team'].to_numpy(dtype=np.int64)
+    conceded = _column(player_df, 'expected_goals_conceded_per_90')
+    weight = np.bincount(team, weights=minutes, minlength=n_teams)
+    team_conceded = np.divide(np.bincount(team, weights=conceded * minutes, minlength=n_teams), weight,
+                              out=np.ones(len(weight)), where=weight > 0)
+    return {
+        'element_type': player_df['element_type'].to_numpy(dtype=np.int64),
+        'team': team,
+        'start': available * start,
+        'cameo': available * cameo,
+        'goals': _column(player_df, 'expected_goals_per_90'),
+        'assists': _column(player_df, 'expected_assists_per_90'),
+        'saves': _column(player_df, 'saves_per_90'),
+        'bonus': _column(player_df, 'bonus') / games,
+        'team_conceded': team_conceded,
+    }
+
+
+def _fixture_slots(rates, fixture_matrix, gameweek_index, difficulty_multiplier):
+    """Returns per-slot (plays, attack factor) arrays of shape (slots, teams)."""
+    difficulty = fixture_matrix.difficulty[:, gameweek_index].T.astype(np.int64)
+    lookup = multiplier_lookup(difficulty_multiplier)
+    factor = lookup[np.clip(difficulty, 0, len(lookup) - 1)]
+    size = max(len(rates['team_conceded']), difficulty.shape[1])
+    plays = np.zeros((difficulty.shape[0], size), dtype=bool)
+    padded_factor = np.ones((difficulty.shape[0], size))
+    plays[:, :difficulty.shape[1]] = difficulty > 0
+    padded_factor[:, :difficulty.shape[1]] = factor
+    return plays, padded_factor
+
+
+def _poisson_counts(uniform, cdf):
+    """Inverse-CDF Poisson draw: counts how many precomputed CDF steps ``uniform`` exceeds."""
+    counts = np.zeros(uniform.shape, dtype=np.int8)
+    for step in cdf:
+        counts += uniform > step
+    return counts
+
+
+def _poisson_cdf(rate, max_count=MAX_DRAW):
+    """Returns the CDF of Poisson(``rate``) at 0..max_count-1, shaped (steps, *rate.shape).
+
+    Steps past the point where every CDF has reached 1 in float32 are dropped,
+    since no uniform draw can exceed them.
+    """
+    term = np.exp(-rate)
+    cdf = [term]
+    for k in range(1, max_count):
+        if cdf[-1].min(initial=1.0) >= CDF_EPSILON:
+            break
+        term = term * rate / k
+        cdf.append(cdf[-1] + term)
+    return np.array(cdf, dtype=np.float32)
+
+
+def _simulate_chunk(rates, plays, factor, n_sims, seed, position_points):
+    """Simulates ``n_sims`` gameweeks and returns (histogram, sum, sum of squares) per player."""
+    rng = np.random.default_rng(seed)
+    n_players = len(rates['team'])
+    total = np.zeros((n_sims, n_players), dtype=np.int16)
+
+    # Only players who can take the field need draws
+    active = np.flatnonzero(rates['start'] + rates['cameo'] > 0)
+    team = rates['team'][active]
+    element_type = rates['element_type'][active]
+    points_table = position_lookup(position_points)
+    element_index = np.clip(element_type, 0, len(points_table) - 1)
+    goal_points = points_table[element_index, 0].astype(np.int16)
+    assist_points = points_table[element_index, 1].astype(np.int16)
+    clean_sheet_points = points_table[element_index, 2].astype(np.int16)
+    defends = np.isin(element_type, (1, 2))
+    keepers = np.flatnonzero(element_type == 1)
+    shape = (n_sims, len(active))
+
+    for slot_plays, slot_factor in zip(plays, factor):
+        playing = slot_plays[team]
+        attack = slot_factor[team]
+        roll = rng.random(shape, dtype=np.float32)
+        starts = roll < (rates['start'][active] * playing)
+        cameo = ~starts & (roll < (rates['start'][active] + rates['cameo'][active]) * playing)
+
+        def draw(rate, max_count=MAX_DRAW):
+            uniform = rng.random(shape, dtype=np.float32)
+            full = _poisson_counts(uniform, _poisson_cdf(rate * attack, max_count))
+            partial = _poisson_counts(uniform, _poisson_cdf(rate * attack * CAMEO_MINUTES, max_count))
+            return np.where(starts, full, np.where(cameo, partial, 0)).astype(np.int16)
+
+        goals = draw(rates['goals'][active])
+        assists = draw(rates['assists'][active])
+        bonus = draw(rates['bonus'][active], MAX_BONUS)  # MAX_BONUS CDF steps cap the count at MAX_BONUS
+        conceded = rng.poisson(rates['team_conceded'] / slot_factor, (n_sims, len(slot_factor)))[:, team]
+
+        points = starts * np.int16(2) + cameo * np.int16(1)
+        points += goals * goal_points + assists * assist_points + bonus
+        points += starts * ((conceded == 0) * clean_sheet_points
+                            - defends * (conceded // GOALS_CONCEDED_PER_POINT)).astype(np.int16)
+        if len(keepers):
+            saves = rng.poisson(rates['saves'][active][keepers], (n_sims, len(keepers)))
+            points[:, keepers] += (starts[:, keepers] * (saves // SAVES_PER_POINT)).astype(np.int16)
+        total[:, active] += points
+
+    n_bins = MAX_POINTS - MIN_POINTS + 1
+    binned = np.clip(total, MIN_POINTS, MAX_POINTS) - MIN_POINTS
+    offsets = np.arange(n_players) * n_bins
+    histogram = np.bincount((binned + offsets).ravel(), minlength=n_players * n_bins).reshape(n_players, n_bins)
+    as_float = total.astype(np.float64)
+    return histogram, as_float.sum(axis=0), (as_float ** 2).sum(axis=0)
+
+
+class PointsSimulator:
+    """Class to simulate gameweek points distributions with batched NumPy draws.
+
+    Every player's goals, assists, goals conceded, saves, appearances and bonus
+    are drawn per fixture from rates derived from the player table, so double
+    gameweeks add a second draw. Simulations run in chunks of ``chunk_size``
+    to bound memory. Results are kept as per-player points histograms, so the
+    quantiles are exact whatever the number of simulations.
+    """
+
+    def __init__(self, player_df, fixture_matrix, gameweek_index=0,
+                 difficulty_multiplier=DIFFICULTY_MULTIPLIER, position_points=POSITION_POINTS):
+        self.player_df = player_df
+        self.rates = player_rates(player_df, fixture_matrix.difficulty.shape[0])
+        self.plays, self.factor = _fixture_slots(self.rates, fixture_matrix, gameweek_index, difficulty_multiplier)
+        self.position_points = position_points
+
+    def simulate(self, n_sims=100_000, chunk_size=10_000, workers=1, seed=0,
+                 quantiles=(0.1, 0.25, 0.5, 0.75, 0.9), thresholds=(6, 10)):
+        """Runs ``n_sims`` simulations and returns per-player summary statistics.
+
+        Chunks are independent, seeded from one ``SeedSequence``, so results
+        do not depend on ``workers``. With ``workers > 1`` chunks are spread
+        over a process pool. Points are only tracked up to ``MAX_POINTS``,
+        so a higher threshold raises ``ValueError``.
+        """
+        if any(threshold > MAX_POINTS for threshold in thresholds):
+            raise ValueError(f"Thresholds above MAX_POINTS ({MAX_POINTS}) cannot be estimated: {list(thresholds)}")
+        chunks = [min(chunk_size, n_sims - start) for start in range(0, n_sims, chunk_size)]
+        seeds = np.random.SeedSequence(seed).spawn(len(chunks))
+        args = [(self.rates, self.plays, self.factor, size, chunk_seed, self.position_points)
+                for size, chunk_seed in zip(chunks, seeds)]
+        if workers > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                results = list(pool.map(_simulate_chunk, *zip(*args)))
+        else:
+            results = [_simulate_chunk(*chunk_args) for chunk_args in args]
+
+        histogram = sum(result[0] for result in results)
+        total = sum(result[1] for result in results)
+        total_squared = sum(result[2] for result in results)
+        return self._summarize(histogram, total, total_squared, n_sims, quantiles, thresholds)
+
+    def _summarize(self, histogram, total, total_squared, n_sims, quantiles, thresholds):
+        mean = total / n_sims
+        summary = pd.DataFrame({
+            'id': self.player_df['id'].to_numpy(),
+            'mean_points': mean,
+            'std_points': np.sqrt(np.maximum(total_squared / n_sims - mean ** 2, 0)),
+        }, index=self.player_df.index)
+        if 'web_name' in self.player_df:
+            summary.insert(1, 'web_name', self.player_df['web_name'].to_numpy())
+
+        cumulative = np.cumsum(histogram, axis=1) / n_sims
+        points = np.arange(MIN_POINTS, MAX_POINTS + 1)
+        for q in quantiles:
+            summary[f"q{int(round(q * 100))}"] = points[np.argmax(cumulative >= q, axis=1)]
+        for threshold in thresholds:
+            below = cumulative[:, threshold - MIN_POINTS - 1] if threshold > MIN_POINTS else 0.0
+            summary[f"p_{threshold}_plus"] = 1 - below
+        return summary
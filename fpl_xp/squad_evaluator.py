@@ -0,0 +1,209 @@
+"""Expected points of 15-man squads: best formation, captaincy and auto-substitutions.
+
+Only NumPy is needed, so the squad rules defined here are shared with the
+scipy-based optimizer without importing it.
+"""
+
+import itertools
+
+import numpy as np
+
+SQUAD_QUOTAS = {1: 2, 2: 5, 3: 5, 4: 3}  # Goalkeepers, defenders, midfielders, forwards
+XI_LIMITS = {1: (1, 1), 2: (3, 5), 3: (2, 5), 4: (1, 3)}  # Valid formations for the starting XI
+XI_SIZE = 11
+SQUAD_SIZE = sum(SQUAD_QUOTAS.values())
+MAX_PER_CLUB = 3
+FORMATIONS = [
+    (d, m, XI_SIZE - 1 - d - m)
+    for d in range(XI_LIMITS[2][0], XI_LIMITS[2][1] + 1)
+    for m in range(XI_LIMITS[3][0], XI_LIMITS[3][1] + 1)
+    if XI_LIMITS[4][0] <= XI_SIZE - 1 - d - m <= XI_LIMITS[4][1]
+]
+BENCH_ORDERS = list(itertools.permutations(range(SQUAD_SIZE - XI_SIZE - 1)))  # Outfield bench priorities
+N_SIMS = 1000
+MAX_CELLS = 2 ** 24  # Simulation x squad x slot draws held at once
+
+
+def play_probability(status, chance=None):
+    """Returns each player's chance of playing next gameweek.
+
+    ``chance_of_playing_next_round`` (percent) is used when set. Without
+    it, available players ('a') play and everyone else does not.
+    """
+    status = np.asarray(status).astype(str)
+    probability = (status == 'a').astype(np.float64)
+    if chance is not None:
+        chance = np.asarray(chance, dtype=np.float64)
+        known = ~np.isnan(chance)
+        probability[known] = np.clip(chance[known] / 100, 0, 1)
+    return probability
+
+
+def check_squad(rows, element_type, team, max_per_club=MAX_PER_CLUB):
+    """Raises ``ValueError`` unless ``rows`` are 15 distinct players meeting the position and club limits."""
+    if len(rows) != SQUAD_SIZE or len(set(rows)) != len(rows):
+        raise ValueError(f"Expected a {SQUAD_SIZE}-man squad of distinct players, got {len(rows)} "
+                         f"players ({len(set(rows))} distinct)")
+    rows = np.asarray(rows, dtype=np.int64)
+    element_type, team = np.asarray(element_type)[rows], np.asarray(team)[rows]
+    counts = {position: int((element_type == position).sum()) for position in SQUAD_QUOTAS}
+    if counts != SQUAD_QUOTAS:
+        raise ValueError(f"A squad needs {SQUAD_QUOTAS} players per position, got {counts}")
+    clubs, club_counts = np.unique(team, return_counts=True)
+    over = {int(club): int(count) for club, count in zip(clubs, club_counts) if count > max_per_club}
+    if over:
+        raise ValueError(f"A squad may have at most {max_per_club} players per club, got {over} (club: players)")
+
+
+class SquadEvaluator:
+    """Class to pick and score the starting XI of many squads at once.
+
+    ``points`` are each player's expected points if the player plays and
+    ``probability`` the chance of playing (see ``play_probability``).
+
+    A lineup is 15 player rows in FPL order: the starting XI in slots
+    0-10, the reserve goalkeeper in slot 11 and the outfield bench in
+    priority order in slots 12-14. A starter who does not play is replaced
+    by the first playing bench player (goalkeeper for goalkeeper) who
+    keeps the formation valid. The captain's points count twice, passing
+    to the vice-captain when the captain does not play.
+
+    Starters, captaincy and the reserve keeper are valued exactly. Outfield
+    auto-substitutions are simulated for the squads where one can happen,
+    on ``n_sims`` draws of who plays shared by every squad, so squads and
+    bench orders are compared on the same draws. If every player is
+    certain to play or not, one draw is exact.
+    """
+
+    def __init__(self, points, probability, element_type, n_sims=N_SIMS, seed=0, captain=True):
+        self.points = np.asarray(points, dtype=np.float64)
+        self.probability = np.asarray(probability, dtype=np.float64)
+        self.element_type = np.asarray(element_type, dtype=np.int64)
+        self.captain = captain
+
+        # Draw only for uncertain players; the last two columns are "never" and "always"
+        uncertain = np.flatnonzero((self.probability > 0) & (self.probability < 1))
+        n_sims = n_sims if len(uncertain) else 1
+        draws = np.random.default_rng(seed).random((n_sims, len(uncertain)), dtype=np.float32)
+        self.plays = np.hstack([draws < self.probability[uncertain], np.zeros((n_sims, 1), dtype=bool),
+                                np.ones((n_sims, 1), dtype=bool)])
+        self.column = np.where(self.probability >= 1, len(uncertain) + 1, len(uncertain))
+        self.column[uncertain] = np.arange(len(uncertain))
+
+    def lineups(self, squads):
+        """Returns (lineups, captain slots, vice-captain slots) for (squads, 15) player rows.
+
+        The XI is the valid formation with the most probability-weighted
+        points and the bench is ordered by the same. The captain and vice
+        maximise ``p_c * x_c + (1 - p_c) * p_v * x_v`` over the XI.
+        """
+        squads = np.atleast_2d(np.asarray(squads, dtype=np.int64))
+        element_type = self.element_type[squads]
+        invalid = np.zeros(len(squads), dtype=bool)
+        for position, quota in SQUAD_QUOTAS.items():
+            invalid |= (element_type == position).sum(axis=1) != quota
+        if invalid.any():
+            raise ValueError(f"A squad needs {SQUAD_QUOTAS} players per position; squads "
+                             f"{np.flatnonzero(invalid)[:5].tolist()} do not")
+        expected = self.points[squads] * self.probability[squads]
+
+        # Slots by position, best first: GK 0-1, DEF 2-6, MID 7-11, FWD 12-14
+        order = np.lexsort((-expected, element_type), axis=-1)
+        squads, expected = np.take_along_axis(squads, order, 1), np.take_along_axis(expected, order, 1)
+        starts = {position: sum(SQUAD_QUOTAS[p] for p in SQUAD_QUOTAS if p < position) for position in SQUAD_QUOTAS}
+        best = {position: np.cumsum(expected[:, starts[position]:starts[position] + quota], axis=1)
+                for position, quota in SQUAD_QUOTAS.items()}
+        scores = np.stack([best[2][:, d - 1] + best[3][:, m - 1] + best[4][:, f - 1] for d, m, f in FORMATIONS], 1)
+        formation = np.asarray(FORMATIONS)[np.argmax(scores, axis=1)]
+
+        # Starters first (in slot order), then the reserve keeper, then the outfield bench best first
+        rank = np.arange(SQUAD_SIZE) - np.repeat([starts[p] for p in SQUAD_QUOTAS], list(SQUAD_QUOTAS.values()))
+        limit = np.column_stack([np.ones(len(squads), dtype=np.int64), formation])
+        starting = rank < np.repeat(limit, list(SQUAD_QUOTAS.values()), axis=1)
+        group = np.where(starting, 0, np.where(np.arange(SQUAD_SIZE) < SQUAD_QUOTAS[1], 1, 2))
+        lineup_order = np.lexsort((np.where(group == 2, -expected, 0), np.arange(SQUAD_SIZE) * (group == 0), group),
+                                  axis=-1)
+        lineups = np.take_along_axis(squads, lineup_order, 1)
+        captain, vice_captain = self._captaincy(lineups)
+        return lineups, captain, vice_captain
+
+    def _captaincy(self, lineups):
+        """Returns the XI slots of the captain and vice with the highest expected armband bonus."""
+        points, probability = self.points[lineups[:, :XI_SIZE]], self.probability[lineups[:, :XI_SIZE]]
+        bonus = (probability * points)[:, :, None] + ((1 - probability)[:, :, None] *
+                                                      (probability * points)[:, None, :])
+        bonus[:, np.arange(XI_SIZE), np.arange(XI_SIZE)] = -np.inf
+        best = np.argmax(bonus.reshape(len(lineups), -1), axis=1)
+        return best // XI_SIZE, best % XI_SIZE
+
+    def expected_points(self, lineups, captain=None, vice_captain=None):
+        """Returns (expected points, expected points from auto-substitutions) per lineup."""
+        lineups = np.atleast_2d(np.asarray(lineups, dtype=np.int64))
+        rows = np.arange(len(lineups))
+        points, probability = self.points[lineups], self.probability[lineups]
+        element_type = self.element_type[lineups]
+
+        # Starters and the reserve keeper (who only replaces the starting keeper) are exact
+        keeper = np.argmax(element_type[:, :XI_SIZE] == 1, axis=1)
+        substituted = (1 - probability[rows, keeper]) * probability[:, XI_SIZE] * points[:, XI_SIZE]
+
+        # Outfield substitutions are simulated where one can happen
+        outfield = element_type[:, :XI_SIZE] != 1
+        possible = ((probability[:, :XI_SIZE] < 1) & outfield).any(axis=1) & \
+                   (probability[:, XI_SIZE + 1:] > 0).any(axis=1)
+        possible = np.flatnonzero(possible)
+        chunk = max(1, MAX_CELLS // (len(self.plays) * SQUAD_SIZE))
+        for start in range(0, len(possible), chunk):
+            selected = possible[start:start + chunk]
+            substituted[selected] += self._outfield_substitutions(lineups[selected])
+        total = (probability[:, :XI_SIZE] * points[:, :XI_SIZE]).sum(axis=1) + substituted
+
+        if self.captain:
+            if captain is None:
+                captain, vice_captain = self._captaincy(lineups)
+            captain_row, vice_row = lineups[rows, captain], lineups[rows, vice_captain]
+            p_captain = self.probability[captain_row]
+            total += (p_captain * self.points[captain_row] +
+                      (1 - p_captain) * self.probability[vice_row] * self.points[vice_row])
+        return total, substituted
+
+    def _outfield_substitutions(self, lineups):
+        """Mean points of outfield bench players coming on, over the shared draws."""
+        plays = self.plays[:, self.column[lineups]]  # (sims, squads, 15)
+        points = self.points[lineups]
+        element_type = self.element_type[lineups]
+
+        # Bench in order, each filling an empty slot if the formation can still be completed
+        starters = plays[:, :, :XI_SIZE]
+        counts = {position: (starters & (element_type[:, :XI_SIZE] == position)).sum(axis=2, dtype=np.int8)
+                  for position in (2, 3, 4)}
+        empty = XI_SIZE - 1 - sum(counts.values())
+        substituted = np.zeros(empty.shape)
+        for slot in range(XI_SIZE + 1, SQUAD_SIZE):
+            position = element_type[:, slot]
+            # Players still needed to reach the formation minimums once this one is on
+            missing = sum(np.maximum(XI_LIMITS[p][0] - counts[p] - (position == p).astype(np.int8), 0) for p in counts)
+            comes_on = plays[:, :, slot] & (missing < empty)
+            substituted += comes_on * points[:, slot]
+            for p in counts:
+                counts[p] += comes_on & (position == p)
+            empty -= comes_on
+        return substituted.mean(axis=0)
+
+    def best(self, squads, bench_orders=True):
+        """Returns (lineups, captain slots, vice slots, expected points, auto-sub points) for each squad.
+
+        With ``bench_orders`` every order of the outfield bench is scored on
+        the shared draws and the best one kept.
+        """
+        lineups, captain, vice_captain = self.lineups(squads)
+        total, substituted = self.expected_points(lineups, captain, vice_captain)
+        if bench_orders:
+            for bench in BENCH_ORDERS[1:]:
+                candidate = lineups.copy()
+                candidate[:, XI_SIZE + 1:] = lineups[:, XI_SIZE + 1 + np.asarray(bench)]
+                candidate_total, candidate_substituted = self.expected_points(candidate, captain, vice_captain)
+                better = candidate_total > total + 1e-12
+                lineups[better] = candidate[better]
+                total[better], substituted[better] = candidate_total[better], candidate_substituted[better]
+        return lineups, captain, vice_captain, total, substituted
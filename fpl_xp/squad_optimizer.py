@@ -0,0 +1,136 @@
+import numpy as np
+from scipy.optimize import Bounds, LinearConstraint, milp
+from scipy.sparse import csr_matrix, hstack, identity
+
+from .squad_evaluator import MAX_PER_CLUB, SQUAD_QUOTAS, SQUAD_SIZE, XI_LIMITS, XI_SIZE
+
+
+class SquadSelection:
+    """Result of a squad optimization: the 15-man squad with its starting XI flagged."""
+
+    def __init__(self, squad, objective):
+        self.squad = squad
+        self.objective = objective
+
+    @property
+    def starting_xi(self):
+        return self.squad[self.squad['starting']]
+
+    @property
+    def bench(self):
+        return self.squad[~self.squad['starting']]
+
+    @property
+    def total_cost(self):
+        return self.squad['now_cost'].sum() / 10
+
+    @property
+    def formation(self):
+        counts = self.starting_xi['element_type'].value_counts()
+        return '-'.join(str(counts.get(element_type, 0)) for element_type in (2, 3, 4))
+
+
+def prune_dominated(element_type, team, cost, points, keep=None, max_per_club=MAX_PER_CLUB):
+    """Returns a mask of players that can appear in some optimal squad.
+
+    A player is dropped when enough same-position players are at least as good
+    and no more expensive that one of them can always be swapped in. Dominators
+    from the player's own club are never blocked by the club cap. Every other
+    club can be blocked by being full or by already supplying a squad player.
+    So ``own + other_clubs >= quota + full_clubs`` keeps the pruning exact.
+    """
+    full_clubs = (SQUAD_SIZE - 1) // max_per_club  # Clubs that can be full besides the player's own
+    n = len(points)
+    mask = np.zeros(n, dtype=bool)
+    keep = np.zeros(n, dtype=bool) if keep is None else keep
+    order = np.lexsort((np.arange(n), cost, -points))  # Best first, ties broken by price then index
+    rank = np.empty(n, dtype=np.int64)
+    rank[order] = np.arange(n)
+    for position, quota in SQUAD_QUOTAS.items():
+        # Player j dominates player i when it is ranked earlier (so at least as good) and no more expensive
+        idx = np.flatnonzero(element_type == position)
+        if not len(idx):
+            continue
+        idx = idx[np.argsort(rank[idx])]
+        position_cost = cost[idx]
+        clubs = np.unique(team[idx], return_inverse=True)[1]
+        m, rows = len(idx), np.arange(len(idx))
+        # A club holds a dominator of i iff its cheapest player ranked before i costs no more than i
+        club_cost = np.full((m + 1, clubs.max() + 1), np.inf)
+        club_cost[rows + 1, clubs] = position_cost
+        cheapest_before = np.minimum.accumulate(club_cost, axis=0)[:-1]
+        covered = cheapest_before <= position_cost[:, None]
+        covered[rows, clubs] = False
+        other_clubs = covered.sum(axis=1)
+        # Own-club dominators are counted pairwise, one club at a time
+        own_club = np.zeros(m, dtype=np.int64)
+        for club in range(clubs.max() + 1):
+            members = np.flatnonzero(clubs == club)
+            club_member_cost = position_cost[members]
+            own_club[members] = np.tril(club_member_cost[None, :] <= club_member_cost[:, None], k=-1).sum(axis=1)
+        mask[idx] = (own_club + other_clubs < quota + full_clubs) | keep[idx]
+    return mask
+
+
+def optimize_squad(player_df, budget=100, points_column='expected_points', bench_weight=0.1,
+                   locked=(), excluded=(), max_per_club=MAX_PER_CLUB, prune=True, time_limit=None):
+    """Finds the squad and starting XI that maximise XI points plus ``bench_weight`` x bench points.
+
+    The squad respects the budget (in millions, ``now_cost`` is in tenths), the
+    2/5/5/3 position quotas, ``max_per_club`` and a valid starting formation.
+    Players listed by ``id`` in ``locked`` must be picked and those in ``excluded``
+    may not be. The problem is solved exactly as a 0-1 integer program with
+    HiGHS branch-and-bound after pruning provably dominated players. Returns a
+    ``SquadSelection``, or None when no valid squad exists.
+    """
+    locked, excluded = set(locked), set(excluded)
+    if locked & excluded:
+        raise ValueError(f"Players both locked and excluded: {sorted(locked & excluded)}")
+
+    ids = player_df['id'].to_numpy()
+    element_type = player_df['element_type'].to_numpy(dtype=np.int64)
+    team = player_df['team'].to_numpy(dtype=np.int64)
+    cost = player_df['now_cost'].to_numpy(dtype=np.int64)
+    points = np.nan_to_num(player_df[points_column].to_numpy(dtype=np.float64), nan=0.0)
+    is_locked = np.isin(ids, list(locked))
+
+    rows = np.flatnonzero(np.isin(element_type, list(SQUAD_QUOTAS)) & ~np.isin(ids, list(excluded)))
+    if prune and 0 <= bench_weight <= 1:
+        # The exchange argument behind pruning needs non-negative weights on both XI and bench
+        rows = rows[prune_dominated(element_type[rows], team[rows], cost[rows], points[rows], keep=is_locked[rows], max_per_club=max_per_club)]
+    n = len(rows)
+    if n == 0 or is_locked[rows].sum() != len(locked):
+        return None
+
+    element_type, team, cost, points = element_type[rows], team[rows], cost[rows], points[rows]
+    identity_matrix = identity(n, format='csr')
+    zeros = csr_matrix((1, n))
+    constraints = []
+
+    # Variables: first n select the squad, next n select the starting XI
+    constraints.append(LinearConstraint(hstack([csr_matrix(cost[None, :]), zeros]), -np.inf, round(budget * 10)))
+    for position, quota in SQUAD_QUOTAS.items():
+        in_position = csr_matrix((element_type == position).astype(np.float64)[None, :])
+        low, high = XI_LIMITS[position]
+        constraints.append(LinearConstraint(hstack([in_position, zeros]), quota, quota))
+        constraints.append(LinearConstraint(hstack([zeros, in_position]), low, high))
+    constraints.append(LinearConstraint(hstack([zeros, csr_matrix(np.ones((1, n)))]), XI_SIZE, XI_SIZE))
+    clubs, club_index = np.unique(team, return_inverse=True)
+    club_matrix = csr_matrix((np.ones(n), (club_index, np.arange(n))), shape=(len(clubs), n))
+    constraints.append(LinearConstraint(hstack([club_matrix, csr_matrix((len(clubs), n))]), -np.inf, max_per_club))
+    constraints.append(LinearConstraint(hstack([-identity_matrix, identity_matrix]), -np.inf, 0))  # XI within squad
+
+    lower = np.zeros(2 * n)
+    lower[:n][is_locked[rows]] = 1
+    objective = -np.concatenate([bench_weight * points, (1 - bench_weight) * points])
+    options = {'time_limit': time_limit} if time_limit else {}
+    result = milp(objective, integrality=np.ones(2 * n), bounds=Bounds(lower, np.ones(2 * n)),
+                  constraints=constraints, options=options)
+    if result.x is None:
+        return None
+
+    chosen = np.round(result.x).astype(bool)
+    squad = player_df.iloc[rows[chosen[:n]]].copy()
+    squad['starting'] = chosen[n:][chosen[:n]]
+    squad = squad.sort_values(['starting', 'element_type', points_column], ascending=[False, True, False])
+    return SquadSelection(squad, -result.fun)
@@ -0,0 +1,230 @@
+"""Typed columnar tables for the player, fixture and history frames.
+
+A table is a directory holding ``schema.json`` and one ``.npy`` file per
+column. Types are decided once when a frame is written (from an explicit
+schema, or inferred for columns the API adds later):
+
+* ``int``: the smallest signed integer type that holds the values
+  (``float32`` when the column has gaps)
+* ``float32``, ``bool``
+* ``datetime``: UTC timestamps, parsed from the API's ISO strings
+* ``category``: strings stored as integer codes plus a category list
+* ``repr``: nested lists (fixture ``stats``), stored as categorical text in
+  the same layout the CSV files use
+
+Reading is a ``np.load`` per column; with ``mmap=True`` the columns are
+mapped copy-on-write instead of read. CSV remains as an export: any path
+ending in ``.csv`` is read or written as CSV (with the schema applied on
+read).
+"""
+
+import json
+import os
+import shutil
+
+import numpy as np
+import pandas as pd
+
+from .profiling import stage
+
+TABLE_SUFFIX = '.table'
+SCHEMA_FILE = 'schema.json'
+FORMAT_VERSION = 1
+
+PLAYER_SCHEMA = {
+    'id': 'int', 'code': 'int', 'element_type': 'int', 'team': 'int', 'team_code': 'int',
+    'now_cost': 'int', 'status': 'category', 'news': 'category', 'news_added': 'datetime',
+    'first_name': 'category', 'second_name': 'category', 'web_name': 'category', 'photo': 'category',
+    'chance_of_playing_next_round': 'float32', 'chance_of_playing_this_round': 'float32',
+    'form': 'float32', 'points_per_game': 'float32', 'selected_by_percent': 'float32',
+    'ep_next': 'float32', 'ep_this': 'float32', 'value_form': 'float32', 'value_season': 'float32',
+    'influence': 'float32', 'creativity': 'float32', 'threat': 'float32', 'ict_index': 'float32',
+    'expected_goals': 'float32', 'expected_assists': 'float32', 'expected_goal_involvements': 'float32',
+    'expected_goals_conceded': 'float32', 'in_dreamteam': 'bool', 'special': 'bool',
+    'minutes': 'int', 'goals_scored': 'int', 'assists': 'int', 'clean_sheets': 'int', 'total_points': 'int',
+}
+FIXTURE_SCHEMA = {
+    'id': 'int', 'code': 'int', 'event': 'int', 'team_h': 'int', 'team_a': 'int',
+    'team_h_difficulty': 'int', 'team_a_difficulty': 'int', 'team_h_score': 'int', 'team_a_score': 'int',
+    'kickoff_time': 'datetime', 'finished': 'bool', 'finished_provisional': 'bool', 'started': 'bool',
+    'provisional_start_time': 'bool', 'minutes': 'int', 'pulse_id': 'int', 'stats': 'repr',
+}
+HISTORY_SCHEMA = {
+    'element': 'int', 'fixture': 'int', 'opponent_team': 'int', 'round': 'int', 'total_points': 'int',
+    'minutes': 'int', 'was_home': 'bool', 'kickoff_time': 'datetime', 'value': 'int', 'goals_scored': 'int',
+    'assists': 'int', 'bps': 'int', 'expected_goals': 'float32',
+}
+PICKS_SCHEMA = {
+    'entry': 'int', 'element': 'int', 'position': 'int', 'multiplier': 'int', 'is_captain': 'bool',
+    'is_vice_captain': 'bool',
+}
+
+_INT_TYPES = (np.int8, np.int16, np.int32, np.int64)
+
+
+def _is_nested(values):
+    return any(isinstance(value, (list, dict)) for value in values[:50])
+
+
+def infer_kind(series):
+    """Returns the storage kind for a column that has no schema entry."""
+    if pd.api.types.is_bool_dtype(series):
+        return 'bool'
+    if pd.api.types.is_integer_dtype(series):
+        return 'int'
+    if pd.api.types.is_float_dtype(series):
+        return 'float32'
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return 'datetime'
+    if _is_nested(series.dropna().to_numpy()):
+        return 'repr'
+    return 'category'
+
+
+def _smallest_int(values):
+    low, high = (values.min(), values.max()) if len(values) else (0, 0)
+    return next(dtype for dtype in _INT_TYPES if np.iinfo(dtype).min <= low and high <= np.iinfo(dtype).max)
+
+
+def _bool_values(series):
+    if pd.api.types.is_bool_dtype(series):
+        return series.to_numpy(dtype=bool)
+    if not pd.api.types.is_numeric_dtype(series):
+        # API booleans that went through text ("True"/"False")
+        return series.astype(str).str.lower().isin(('true', '1')).to_numpy()
+    return series.fillna(0).to_numpy(dtype=bool)
+
+
+def coerce_column(series, kind):
+    """Returns ``series`` converted to the pandas dtype of ``kind``."""
+    if kind == 'bool':
+        return pd.Series(_bool_values(series), index=series.index, name=series.name)
+    if kind in ('int', 'float32'):
+        numeric = series if pd.api.types.is_numeric_dtype(series) else pd.to_numeric(series, errors='coerce')
+        numeric = numeric.astype(np.float64) if pd.api.types.is_bool_dtype(numeric) else numeric
+        if kind == 'float32' or numeric.isna().any():
+            return numeric.astype(np.float32)
+        return numeric.astype(_smallest_int(numeric.to_numpy()))
+    if kind == 'datetime':
+        if pd.api.types.is_datetime64_any_dtype(series):
+            return series.dt.tz_localize('UTC') if series.dt.tz is None else series.dt.tz_convert('UTC')
+        return pd.to_datetime(series, utc=True, format='ISO8601')
+    if kind == 'repr':
+        series = series.map(lambda value: value if isinstance(value, str) or value is None else repr(value))
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return series
+    return series.astype('category')
+
+
+def apply_schema(frame, schema=None):
+    """Returns ``frame`` with every column in its storage dtype.
+
+    ``schema`` maps column names to kinds; other columns are inferred.
+    """
+    schema = schema or {}
+    return pd.DataFrame({column: coerce_column(frame[column], schema.get(column) or infer_kind(frame[column]))
+                         for column in frame.columns}, index=frame.index)
+
+
+def _kind_of(series):
+    """Returns the kind of a column already in its storage dtype."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        return 'category'
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return 'datetime'
+    if pd.api.types.is_bool_dtype(series):
+        return 'bool'
+    return 'int' if pd.api.types.is_integer_dtype(series) else 'float32'
+
+
+def _replace_dir(tmp_path, path):
+    """Moves the directory ``tmp_path`` to ``path``, replacing whatever is there."""
+    old_path = f"{path}.{os.getpid()}.old"
+    if os.path.exists(path):
+        os.replace(path, old_path)
+    os.replace(tmp_path, path)
+    shutil.rmtree(old_path, ignore_errors=True)
+
+
+def write_table(frame, path, schema=None):
+    """Writes ``frame`` to ``path``: a typed table, or a CSV export if ``path`` ends in ``.csv``."""
+    with stage('write_table', rows=len(frame)):
+        if path.endswith('.csv'):
+            frame.to_csv(path, index=False)
+        else:
+            _write_table(frame, path, schema)
+
+
+def _write_table(frame, path, schema):
+    typed = apply_schema(frame.reset_index(drop=True), schema)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    shutil.rmtree(tmp_path, ignore_errors=True)
+    os.makedirs(tmp_path)
+    columns = []
+    for number, column in enumerate(typed.columns):
+        series = typed[column]
+        entry = {'name': column, 'kind': _kind_of(series), 'file': f"{number}.npy"}
+        if entry['kind'] == 'category':
+            entry['categories'] = series.cat.categories.astype(str).tolist()
+            values = series.cat.codes.to_numpy()
+        elif entry['kind'] == 'datetime':
+            values = series.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy()
+        else:
+            values = series.to_numpy()
+        entry['dtype'] = values.dtype.str
+        np.save(os.path.join(tmp_path, entry['file']), values, allow_pickle=False)
+        columns.append(entry)
+    with open(os.path.join(tmp_path, SCHEMA_FILE), 'w') as f:
+        json.dump({'version': FORMAT_VERSION, 'rows': len(typed), 'columns': columns}, f, indent=1)
+    _replace_dir(tmp_path, path)
+
+
+def read_schema(path):
+    """Returns the stored schema of the table at ``path``."""
+    with open(os.path.join(path, SCHEMA_FILE)) as f:
+        schema = json.load(f)
+    if schema.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported table format version {schema.get('version')} in {path}")
+    return schema
+
+
+def read_table(path, columns=None, mmap=False, schema=None):
+    """Reads a table (or a CSV file, typed with ``schema``) into a DataFrame.
+
+    ``columns`` limits the read to those columns. With ``mmap`` numeric
+    columns are memory-mapped copy-on-write, so only the pages used are read
+    and edits stay private to the process. If ``path`` does not exist but a
+    CSV export next to it does (``players.table`` -> ``players.csv``), the
+    CSV is read instead.
+    """
+    with stage('load_table') as timed:
+        frame = _read_table(path, columns, mmap, schema)
+        timed.rows = len(frame)
+    return frame
+
+
+def _read_table(path, columns, mmap, schema):
+    if not os.path.exists(path) and path.endswith(TABLE_SUFFIX):
+        csv_path = path[:-len(TABLE_SUFFIX)] + '.csv'
+        if os.path.exists(csv_path):
+            path = csv_path
+    if path.endswith('.csv'):
+        return apply_schema(pd.read_csv(path, usecols=columns), schema)
+
+    entries = read_schema(path)['columns']
+    if columns is not None:
+        by_name = {entry['name']: entry for entry in entries}
+        missing = [column for column in columns if column not in by_name]
+        if missing:
+            raise KeyError(f"Columns not in {path}: {missing}")
+        entries = [by_name[column] for column in columns]
+    data = {}
+    for entry in entries:
+        values = np.load(os.path.join(path, entry['file']), mmap_mode='c' if mmap else None, allow_pickle=False)
+        if entry['kind'] == 'category':
+            values = pd.Categorical.from_codes(values, categories=entry['categories'], validate=False)
+        elif entry['kind'] == 'datetime':
+            values = pd.DatetimeIndex(values).tz_localize('UTC')
+        data[entry['name']] = values
+    # copy=False keeps each column backed by its (possibly mapped) array
+    return pd.DataFrame(data, copy=False)
@@ -0,0 +1,382 @@
+"""Synthetic ``bootstrap-static`` elements and fixtures for benchmarks.
+
+``synthetic_dataset`` returns frames shaped like ``FPLDataFetcher``'s
+(same columns, in the same order, as ``fpl_player_data.csv`` and
+``fixture_info.csv``) for any pool size and number of seasons. Finished
+fixtures carry match events (goals, assists, cards, saves, bonus, bps)
+in the API's ``stats`` layout, and the players' season totals are summed
+from those events, so history reconstruction, scoring and the models see
+coherent data. ``synthetic_picks`` adds managers' squads for league
+projections. Everything is driven by one seed, so a run is reproducible.
+
+Seasons are stacked with events numbered on from the previous season
+(season 2 gameweek 1 is event 39), so a multi-season archive windows like
+one long season.
+"""
+
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from .match_events import IDENTIFIERS
+
+BASE_PLAYERS = 670  # Size of the real pool, i.e. scale 1
+N_TEAMS = 20
+GAMEWEEKS = 38
+POSITION_SHARES = (0.11, 0.33, 0.45, 0.11)  # GK, DEF, MID, FWD
+BASE_COST = {1: 40, 2: 40, 3: 45, 4: 45}
+GOAL_POINTS = {1: 10, 2: 6, 3: 5, 4: 4}
+CLEAN_SHEET_POINTS = {1: 4, 2: 4, 3: 1, 4: 0}
+SCORER_WEIGHT = {1: 0.0, 2: 0.3, 3: 1.0, 4: 2.2}
+FIRST_NAMES = ('Alex', 'Ben', 'Carlos', 'Daniel', 'Emile', 'Fábio', 'Gabriel', 'Harry', 'Ivan', 'Jamal',
+               'Kai', 'Luis', 'Mohamed', 'Nathan', 'Oliver', 'Pedro', 'Rayan', 'Son', 'Tomás', 'Virgil')
+STATUS_CODES = ('a', 'd', 'i', 's', 'u', 'n')
+STATUS_SHARES = (0.70, 0.05, 0.08, 0.01, 0.155, 0.005)
+NEWS = {'d': 'Knock - 75% chance of playing', 'i': 'Hamstring injury - Unknown return date',
+        's': 'Suspended until the next gameweek', 'u': 'Has joined another club on loan',
+        'n': 'Not included in the registered squad'}
+
+PLAYER_COLUMNS = [
+    'chance_of_playing_next_round', 'chance_of_playing_this_round', 'code', 'cost_change_event',
+    'cost_change_event_fall', 'cost_change_start', 'cost_change_start_fall', 'dreamteam_count', 'element_type',
+    'ep_next', 'ep_this', 'event_points', 'first_name', 'form', 'id', 'in_dreamteam', 'news', 'news_added',
+    'now_cost', 'photo', 'points_per_game', 'second_name', 'selected_by_percent', 'special', 'squad_number',
+    'status', 'team', 'team_code', 'total_points', 'transfers_in', 'transfers_in_event', 'transfers_out',
+    'transfers_out_event', 'value_form', 'value_season', 'web_name', 'region', 'minutes', 'goals_scored',
+    'assists', 'clean_sheets', 'goals_conceded', 'own_goals', 'penalties_saved', 'penalties_missed',
+    'yellow_cards', 'red_cards', 'saves', 'bonus', 'bps', 'influence', 'creativity', 'threat', 'ict_index',
+    'starts', 'expected_goals', 'expected_assists', 'expected_goal_involvements', 'expected_goals_conceded',
+    'influence_rank', 'influence_rank_type', 'creativity_rank', 'creativity_rank_type', 'threat_rank',
+    'threat_rank_type', 'ict_index_rank', 'ict_index_rank_type', 'corners_and_indirect_freekicks_order',
+    'corners_and_indirect_freekicks_text', 'direct_freekicks_order', 'direct_freekicks_text', 'penalties_order',
+    'penalties_text', 'expected_goals_per_90', 'saves_per_90', 'expected_assists_per_90',
+    'expected_goal_involvements_per_90', 'expected_goals_conceded_per_90', 'goals_conceded_per_90',
+    'now_cost_rank', 'now_cost_rank_type', 'form_rank', 'form_rank_type', 'points_per_game_rank',
+    'points_per_game_rank_type', 'selected_rank', 'selected_rank_type', 'starts_per_90', 'clean_sheets_per_90',
+]
+FIXTURE_COLUMNS = [
+    'code', 'event', 'finished', 'finished_provisional', 'id', 'kickoff_time', 'minutes',
+    'provisional_start_time', 'started', 'team_a', 'team_a_score', 'team_h', 'team_h_score', 'stats',
+    'team_h_difficulty', 'team_a_difficulty', 'pulse_id',
+]
+# Per-player event counters accumulated from the match events
+_COUNTERS = ('minutes', 'starts', 'goals_scored', 'assists', 'clean_sheets', 'goals_conceded', 'own_goals',
+             'penalties_saved', 'penalties_missed', 'yellow_cards', 'red_cards', 'saves', 'bonus', 'bps',
+             'total_points')
+
+
+def round_robin(n_teams=N_TEAMS):
+    """Returns a double round robin as a list of rounds of (home, away) team ids (circle method)."""
+    teams = list(range(1, n_teams + 1))
+    rounds = []
+    for number in range(n_teams - 1):
+        pairs = [(teams[i], teams[n_teams - 1 - i]) for i in range(n_teams // 2)]
+        rounds.append([(home, away) if (number + i) % 2 else (away, home) for i, (home, away) in enumerate(pairs)])
+        teams = [teams[0], teams[-1]] + teams[1:-1]
+    return rounds + [[(away, home) for home, away in matches] for matches in rounds]
+
+
+class _MatchSimulator:
+    """Plays fixtures between the synthetic squads and accumulates per-player counters."""
+
+    def __init__(self, team, element_type, regular, strength, rng):
+        self.element_type = element_type
+        self.regular = regular
+        self.strength = strength
+        self.rng = rng
+        self.squads = {}
+        for team_id in range(1, N_TEAMS + 1):
+            rows = np.flatnonzero(team == team_id)
+            keepers, outfield = rows[element_type[rows] == 1], rows[element_type[rows] != 1]
+            self.squads[team_id] = (keepers, regular[keepers] / regular[keepers].sum(),
+                                    outfield, regular[outfield] / regular[outfield].sum())
+
+    def _lineup(self, team_id):
+        """Returns (starters, substitutes) rows for one side."""
+        keepers, keeper_p, outfield, outfield_p = self.squads[team_id]
+        keeper = keepers[self.rng.choice(len(keepers), p=keeper_p)] if len(keepers) else None
+        picked = outfield[self.rng.choice(len(outfield), size=min(13, len(outfield)), replace=False, p=outfield_p)]
+        starters = picked[:10] if keeper is None else np.r_[keeper, picked[:10]]
+        return starters, picked[10:]
+
+    def play(self, home, away, counters, points):
+        """Simulates one fixture, adds to ``counters`` (when not None) and returns (scores, stats)."""
+        rng = self.rng
+        sides = {'h': self._lineup(home), 'a': self._lineup(away)}
+        ratio = self.strength[home] / self.strength[away]
+        goals = {'h': rng.poisson(1.45 * ratio), 'a': rng.poisson(1.15 / ratio)}
+        events = {identifier: {'h': {}, 'a': {}} for identifier in IDENTIFIERS}
+        minutes = {}
+        for side, (starters, subs) in sides.items():
+            for row in starters:
+                minutes[row] = 90 if rng.random() < 0.8 else int(rng.integers(55, 90))
+            for row in subs:
+                minutes[row] = int(rng.integers(1, 35))
+            players = np.r_[starters, subs]
+            weights = np.array([SCORER_WEIGHT[self.element_type[row]] for row in players]) * self.regular[players]
+            for _ in range(goals[side]):
+                scorer = players[rng.choice(len(players), p=weights / weights.sum())]
+                events['goals_scored'][side][scorer] = events['goals_scored'][side].get(scorer, 0) + 1
+                if rng.random() < 0.8:
+                    helper = players[rng.integers(len(players))]
+                    if helper != scorer:
+                        events['assists'][side][helper] = events['assists'][side].get(helper, 0) + 1
+            for row in players[rng.integers(len(players), size=rng.poisson(1.6))]:
+                events['yellow_cards'][side][row] = 1
+            if rng.random() < 0.04:
+                events['red_cards'][side][players[rng.integers(len(players))]] = 1
+            if self.element_type[starters[0]] == 1:
+                saves = rng.poisson(2.5)
+                if saves:
+                    events['saves'][side][starters[0]] = saves
+
+        for side, (starters, subs) in sides.items():
+            conceded = goals['a' if side == 'h' else 'h']
+            for row in np.r_[starters, subs]:
+                position = self.element_type[row]
+                clean_sheet = conceded == 0 and minutes[row] >= 60 and position != 4
+                scored = events['goals_scored'][side].get(row, 0)
+                assisted = events['assists'][side].get(row, 0)
+                events['bps'][side][row] = int(
+                    rng.integers(3, 20) + 24 * scored + 9 * assisted + 12 * clean_sheet +
+                    2 * events['saves'][side].get(row, 0) - 3 * events['yellow_cards'][side].get(row, 0))
+        ranked = sorted(((value, side, row) for side in sides for row, value in events['bps'][side].items()),
+                        key=lambda entry: -entry[0])
+        for bonus, (_, side, row) in zip((3, 2, 1), ranked):
+            events['bonus'][side][row] = bonus
+
+        if counters is not None:
+            for side, (starters, subs) in sides.items():
+                conceded = goals['a' if side == 'h' else 'h']
+                for row in np.r_[starters, subs]:
+                    self._count(row, side, minutes[row], row in starters, conceded, events, counters, points)
+
+        stats = [{'identifier': identifier,
+                  'a': [{'value': int(value), 'element': int(row) + 1}
+                        for row, value in sorted(events[identifier]['a'].items(), key=lambda item: -item[1])],
+                  'h': [{'value': int(value), 'element': int(row) + 1}
+                        for row, value in sorted(events[identifier]['h'].items(), key=lambda item: -item[1])]}
+                 for identifier in IDENTIFIERS]
+        return (goals['h'], goals['a']), stats
+
+    def _count(self, row, side, minutes, started, conceded, events, counters, points):
+        position = self.element_type[row]
+        played_60 = minutes >= 60
+        clean_sheet = int(played_60 and conceded == 0)
+        found = {identifier: events[identifier][side].get(row, 0) for identifier in IDENTIFIERS}
+        total = ((2 if played_60 else 1) + found['goals_scored'] * GOAL_POINTS[position] + 3 * found['assists'] +
+                 clean_sheet * CLEAN_SHEET_POINTS[position] + found['saves'] // 3 + found['bonus'] -
+                 found['yellow_cards'] - 3 * found['red_cards'] -
+                 (conceded // 2 if played_60 and position in (1, 2) else 0))
+        counters['minutes'][row] += minutes
+        counters['starts'][row] += started
+        counters['clean_sheets'][row] += clean_sheet
+        counters['goals_conceded'][row] += conceded if played_60 else 0
+        for identifier in IDENTIFIERS:
+            counters[identifier][row] += found[identifier]
+        counters['total_points'][row] += total
+        points[row] += total
+
+
+def _rank(values, groups=None):
+    """Returns 1-based descending ranks (ties broken by row), overall or within ``groups``."""
+    frame = pd.DataFrame({'value': values, 'group': 0 if groups is None else groups})
+    return frame.groupby('group')['value'].rank(method='first', ascending=False).astype(np.int64).to_numpy()
+
+
+def synthetic_dataset(scale=1, seasons=1, next_gameweek=10, seed=0):
+    """Returns (players, fixtures) frames for ``scale`` x the real pool and ``seasons`` seasons of fixtures.
+
+    Fixtures before ``next_gameweek`` of the last season (and every earlier
+    season) are finished; player totals cover the last season only.
+    """
+    rng = np.random.default_rng(seed)
+    n_players = max(int(round(BASE_PLAYERS * scale)), N_TEAMS * 15)
+    ids = np.arange(1, n_players + 1)
+    team = rng.permutation(np.arange(n_players) % N_TEAMS) + 1
+    element_type = rng.choice(np.arange(1, 5), size=n_players, p=POSITION_SHARES)
+    for team_id in range(1, N_TEAMS + 1):
+        # Every club needs at least two keepers and enough outfield players for a lineup
+        rows = np.flatnonzero(team == team_id)
+        element_type[rows[:2]] = 1
+        element_type[rows[2:15]] = np.maximum(element_type[rows[2:15]], 2)
+    regular = rng.lognormal(0, 1, n_players)
+    strength = np.r_[1.0, rng.uniform(0.6, 1.5, N_TEAMS)]  # Index 0 unused
+    # FPL difficulty of facing a team: 2 (weakest) to 5 (strongest)
+    difficulty = np.r_[3, 2 + np.searchsorted(np.quantile(strength[1:], [0.3, 0.65, 0.9]), strength[1:])]
+
+    simulator = _MatchSimulator(team, element_type, regular, strength, rng)
+    counters = {name: np.zeros(n_players, dtype=np.int64) for name in _COUNTERS}
+    gameweek_points = np.zeros((n_players, max(next_gameweek - 1, 1)), dtype=np.int64)
+    rounds = round_robin(N_TEAMS)
+    rows = []
+    for season in range(seasons):
+        season_start = datetime.datetime(2024 - seasons + 1 + season, 8, 16, 19, tzinfo=datetime.timezone.utc)
+        current = season == seasons - 1
+        for round_index, matches in enumerate(rounds):
+            event = season * GAMEWEEKS + round_index + 1
+            finished = not current or round_index + 1 < next_gameweek
+            for match_index, (home, away) in enumerate(matches):
+                scores, stats = (None, None), []
+                if finished:
+                    points = gameweek_points[:, round_index] if current else np.zeros(n_players, dtype=np.int64)
+                    scores, stats = simulator.play(home, away, counters if current else None, points)
+                kickoff = season_start + datetime.timedelta(days=7 * round_index, hours=match_index % 5 * 2.5)
+                fixture_id = len(rows) + 1
+                rows.append({
+                    'code': 2_400_000 + fixture_id, 'event': event, 'finished': finished,
+                    'finished_provisional': finished, 'id': fixture_id,
+                    'kickoff_time': kickoff.strftime('%Y-%m-%dT%H:%M:%SZ'), 'minutes': 90 if finished else 0,
+                    'provisional_start_time': False, 'started': finished, 'team_a': away, 'team_a_score': scores[1],
+                    'team_h': home, 'team_h_score': scores[0], 'stats': stats,
+                    'team_h_difficulty': int(difficulty[away]), 'team_a_difficulty': int(difficulty[home]),
+                    'pulse_id': 115_000 + fixture_id,
+                })
+    fixtures = pd.DataFrame(rows, columns=FIXTURE_COLUMNS)
+    players = _players_frame(ids, team, element_type, regular, counters, gameweek_points, next_gameweek, rng)
+    return players, fixtures
+
+
+def _players_frame(ids, team, element_type, regular, counters, gameweek_points, next_gameweek, rng):
+    n_players = len(ids)
+    played = max(next_gameweek - 1, 1)
+    total_points = counters['total_points']
+    minutes = counters['minutes']
+    appearances = (gameweek_points != 0).sum(axis=1)
+    form = np.round(gameweek_points[:, -4:].mean(axis=1), 1)
+    points_per_game = np.round(total_points / np.maximum(appearances, 1), 1)
+    quality = np.clip(total_points, 0, None) / played
+    now_cost = np.array([BASE_COST[position] for position in element_type]) + np.round(
+        quality * 6 + rng.gamma(1.5, 2, n_players)).astype(np.int64)
+    selected = np.round(np.clip(rng.gamma(0.5, 4, n_players) * (1 + quality), 0, 80), 1)
+    status = rng.choice(STATUS_CODES, size=n_players, p=STATUS_SHARES)
+    available = status == 'a'
+    chance = np.where(available, np.nan, rng.choice([0.0, 25.0, 50.0, 75.0], size=n_players))
+    news_added = pd.Timestamp('2024-10-01T12:00:00Z') + pd.to_timedelta(rng.integers(0, 90 * 86400, n_players), 's')
+    per_90 = 90 / np.maximum(minutes, 1)
+    expected_goals = np.round(counters['goals_scored'] * rng.uniform(0.6, 1.3, n_players), 2)
+    expected_assists = np.round(counters['assists'] * rng.uniform(0.6, 1.3, n_players), 2)
+    expected_conceded = np.round(counters['goals_conceded'] * rng.uniform(0.8, 1.2, n_players), 2)
+    influence = np.round(counters['bps'] * 1.6 + rng.uniform(0, 5, n_players) * (minutes > 0), 1)
+    creativity = np.round(counters['assists'] * 25 + minutes / 90 * rng.uniform(0, 12, n_players), 1)
+    threat = np.round(counters['goals_scored'] * 30 + minutes / 90 * rng.uniform(0, 10, n_players), 1)
+    ict_index = np.round((influence + creativity + threat) / 10, 1)
+    second_name = np.array([f"Player{player_id}" for player_id in ids], dtype=object)
+    code = 400_000 + ids * 7
+    cost_change_start = rng.integers(-3, 4, n_players)
+    set_pieces = np.where(rng.random(n_players) < 0.08, rng.integers(1, 4, n_players).astype(float), np.nan)
+
+    columns = {
+        'chance_of_playing_next_round': chance,
+        'chance_of_playing_this_round': chance,
+        'code': code,
+        'cost_change_event': np.zeros(n_players, dtype=np.int64),
+        'cost_change_event_fall': np.zeros(n_players, dtype=np.int64),
+        'cost_change_start': cost_change_start,
+        'cost_change_start_fall': -cost_change_start,
+        'dreamteam_count': rng.poisson(0.1, n_players),
+        'element_type': element_type,
+        'ep_next': np.where(available, form, 0.0),
+        'ep_this': np.where(available, form, 0.0),
+        'event_points': gameweek_points[:, -1],
+        'first_name': np.array(FIRST_NAMES, dtype=object)[ids % len(FIRST_NAMES)],
+        'form': form,
+        'id': ids,
+        'in_dreamteam': rng.random(n_players) < 0.01,
+        'news': np.where(available, '', np.vectorize(NEWS.get, otypes=[object])(np.where(available, 'd', status))),
+        'news_added': np.where(available, None, news_added.strftime('%Y-%m-%dT%H:%M:%S.%fZ').to_numpy()),
+        'now_cost': now_cost,
+        'photo': np.array([f"{value}.jpg" for value in code], dtype=object),
+        'points_per_game': points_per_game,
+        'second_name': second_name,
+        'selected_by_percent': selected,
+        'special': np.zeros(n_players, dtype=bool),
+        'squad_number': np.full(n_players, np.nan),
+        'status': status,
+        'team': team,
+        'team_code': team * 3,
+        'total_points': total_points,
+        'transfers_in': rng.integers(0, 2_000_000, n_players),
+        'transfers_in_event': rng.integers(0, 50_000, n_players),
+        'transfers_out': rng.integers(0, 2_000_000, n_players),
+        'transfers_out_event': rng.integers(0, 50_000, n_players),
+        'value_form': np.round(form / now_cost * 10, 1),
+        'value_season': np.round(total_points / now_cost * 10, 1),
+        'web_name': second_name,
+        'region': np.where(rng.random(n_players) < 0.8, rng.integers(1, 287, n_players).astype(float), np.nan),
+        'influence': influence,
+        'creativity': creativity,
+        'threat': threat,
+        'ict_index': ict_index,
+        'expected_goals': expected_goals,
+        'expected_assists': expected_assists,
+        'expected_goal_involvements': np.round(expected_goals + expected_assists, 2),
+        'expected_goals_conceded': expected_conceded,
+        'corners_and_indirect_freekicks_order': set_pieces,
+        'corners_and_indirect_freekicks_text': '',
+        'direct_freekicks_order': set_pieces,
+        'direct_freekicks_text': '',
+        'penalties_order': set_pieces,
+        'penalties_text': '',
+        'expected_goals_per_90': np.round(expected_goals * per_90, 2),
+        'saves_per_90': np.round(counters['saves'] * per_90, 2),
+        'expected_assists_per_90': np.round(expected_assists * per_90, 2),
+        'expected_goal_involvements_per_90': np.round((expected_goals + expected_assists) * per_90, 2),
+        'expected_goals_conceded_per_90': np.round(expected_conceded * per_90, 2),
+        'goals_conceded_per_90': np.round(counters['goals_conceded'] * per_90, 2),
+        'starts_per_90': np.round(counters['starts'] * per_90, 2),
+        'clean_sheets_per_90': np.round(counters['clean_sheets'] * per_90, 2),
+    }
+    for name in _COUNTERS:
+        if name != 'total_points':
+            columns[name] = counters[name]
+    for name, values in (('influence', influence), ('creativity', creativity), ('threat', threat),
+                         ('ict_index', ict_index), ('now_cost', now_cost), ('form', form),
+                         ('points_per_game', points_per_game), ('selected', selected)):
+        columns[f"{name}_rank"] = _rank(values)
+        columns[f"{name}_rank_type"] = _rank(values, element_type)
+    return pd.DataFrame({column: columns[column] for column in PLAYER_COLUMNS})
+
+
+def synthetic_picks(players, n_managers, seed=0, chunk_size=10_000):
+    """Returns a picks frame (``fpl_xp.league`` layout) for ``n_managers`` managers' squads.
+
+    Each manager picks 2/5/5/3 players per position, drawn without
+    replacement in proportion to ``selected_by_percent``, and lines up 4-4-2
+    with a random outfield captain and vice-captain (1% triple captain).
+    Budget and club limits are not enforced.
+    """
+    from .squad_evaluator import SQUAD_QUOTAS, XI_SIZE
+
+    rng = np.random.default_rng(seed)
+    ids = players['id'].to_numpy()
+    element_type = players['element_type'].to_numpy()
+    weight = np.log(players['selected_by_percent'].to_numpy(dtype=np.float64) + 0.05)
+    starters = {1: 1, 2: 4, 3: 4, 4: 2}
+    chunks = []
+    for start in range(0, n_managers, chunk_size):
+        n = min(chunk_size, n_managers - start)
+        xi, bench = [], []
+        for position, quota in SQUAD_QUOTAS.items():
+            rows = np.flatnonzero(element_type == position)
+            # Gumbel top-k: weighted sampling without replacement for every manager at once
+            keys = weight[rows] + rng.gumbel(size=(n, len(rows)))
+            chosen = rows[np.argpartition(-keys, quota - 1, axis=1)[:, :quota]]
+            xi.append(chosen[:, :starters[position]])
+            bench.append(chosen[:, starters[position]:])
+        squads = np.hstack(xi + bench)  # Pick order is the squad position, 1-15
+        captain = rng.integers(1, XI_SIZE, n)
+        vice_captain = (captain + rng.integers(1, XI_SIZE - 1, n) - 1) % (XI_SIZE - 1) + 1
+        slot = np.arange(15)[None, :]
+        multiplier = (slot < XI_SIZE).astype(np.int64)
+        multiplier = multiplier + (slot == captain[:, None]) * np.where(rng.random(n) < 0.01, 2, 1)[:, None]
+        chunks.append(pd.DataFrame({
+            'entry': np.repeat(np.arange(start, start + n) + 1, 15),
+            'element': ids[squads].ravel(),
+            'position': np.tile(np.arange(1, 16), n),
+            'multiplier': multiplier.ravel(),
+            'is_captain': (slot == captain[:, None]).ravel(),
+            'is_vice_captain': (slot == vice_captain[:, None]).ravel(),
+        }))
+    return pd.concat(chunks, ignore_index=True)
@@ -0,0 +1,177 @@
+import numpy as np
+import pandas as pd
+
+from .squad_evaluator import FORMATIONS, MAX_PER_CLUB, SQUAD_QUOTAS, check_squad
+
+HIT_COST = 4            # Points deducted per transfer beyond the free ones
+MAX_FREE_TRANSFERS = 5  # Free transfers that can be banked
+
+
+class TransferPlan:
+    """Result of a transfer search: the chosen moves per gameweek and their projected value."""
+
+    def __init__(self, steps, total_points):
+        self.steps = steps
+        self.total_points = total_points
+
+    def __repr__(self):
+        return f"TransferPlan(total_points={self.total_points:.2f}, gameweeks={len(self.steps)})"
+
+
+class TransferPlanner:
+    """Class to plan transfers over the next K gameweeks with a pruned beam search.
+
+    ``projected_points`` is a (players, gameweeks) array aligned with ``player_df``
+    (see ``PlayerAnalyzer.project_expected_points``). A squad's value for a
+    gameweek is its best valid XI, plus the captain's points and ``bench_weight``
+    times the bench. These values are memoized per squad, so squads reached by
+    several paths are scored once. Beams are ranked by points banked so far
+    plus the value of holding the current squad to the end of the horizon.
+    """
+
+    def __init__(self, player_df, projected_points, gameweeks=None, bench_weight=0.1, captain=True,
+                 shortlist_size=25, hit_cost=HIT_COST, max_free_transfers=MAX_FREE_TRANSFERS,
+                 max_per_club=MAX_PER_CLUB):
+        self.player_df = player_df.reset_index(drop=True)
+        self.points = np.asarray(projected_points, dtype=np.float64)
+        self.gameweeks = list(gameweeks) if gameweeks is not None else list(range(self.points.shape[1]))
+        self.ids = self.player_df['id'].to_numpy()
+        self.row_for_id = {player_id: row for row, player_id in enumerate(self.ids)}
+        self.element_type = self.player_df['element_type'].to_numpy()
+        self.team = self.player_df['team'].to_numpy()
+        self.cost = self.player_df['now_cost'].to_numpy(dtype=np.int64)
+        self.bench_weight = bench_weight
+        self.captain = captain
+        self.shortlist_size = shortlist_size
+        self.hit_cost = hit_cost
+        self.max_free_transfers = max_free_transfers
+        self.max_per_club = max_per_club
+        self._values = {}
+
+    def squad_values(self, squad):
+        """Returns the per-gameweek value of a squad (tuple of rows), memoized."""
+        values = self._values.get(squad)
+        if values is None:
+            rows = np.fromiter(squad, dtype=np.int64)
+            points = self.points[rows]
+            element_type = self.element_type[rows]
+            by_position = {position: np.sort(points[element_type == position], axis=0)[::-1]
+                           for position in SQUAD_QUOTAS}
+            cumulative = {position: np.cumsum(sorted_points, axis=0) for position, sorted_points in by_position.items()}
+            outfield = np.max([
+                cumulative[2][d - 1] + cumulative[3][m - 1] + cumulative[4][f - 1] for d, m, f in FORMATIONS
+            ], axis=0)
+            xi_points = by_position[1][0] + outfield
+            values = xi_points + self.bench_weight * (points.sum(axis=0) - xi_points)
+            if self.captain:
+                # The best player always starts in the best XI, so the best player is the captain
+                values = values + points.max(axis=0)
+            self._values[squad] = values
+        return values
+
+    def _shortlists(self, start):
+        """Returns the best candidates per position by points over the rest of the horizon."""
+        remaining = self.points[:, start:].sum(axis=1)
+        shortlists = {}
+        for position in SQUAD_QUOTAS:
+            rows = np.flatnonzero(self.element_type == position)
+            shortlists[position] = rows[np.argsort(-remaining[rows], kind='stable')[:self.shortlist_size]]
+        return shortlists, remaining
+
+    def _single_transfers(self, squad, bank, shortlists, remaining, limit):
+        """Returns the most promising (gain, out_row, in_row) single transfers for a squad."""
+        in_squad = set(squad)
+        club_counts = {}
+        for row in squad:
+            club_counts[self.team[row]] = club_counts.get(self.team[row], 0) + 1
+        moves = []
+        for out_row in squad:
+            budget = bank + self.cost[out_row]
+            for in_row in shortlists[self.element_type[out_row]]:
+                if in_row in in_squad or self.cost[in_row] > budget:
+                    continue
+                if self.team[in_row] != self.team[out_row] and club_counts.get(self.team[in_row], 0) >= self.max_per_club:
+                    continue
+                gain = remaining[in_row] - remaining[out_row]
+                if gain > 0:
+                    moves.append((gain, out_row, in_row))
+        moves.sort(reverse=True)
+        return moves[:limit]
+
+    def _valid(self, squad, bank):
+        if bank < 0:
+            return False
+        clubs = np.bincount(self.team[list(squad)])
+        return clubs.max() <= self.max_per_club
+
+    def _moves(self, squad, bank, shortlists, remaining, max_transfers, singles_limit):
+        """Yields (new_squad, new_bank, transfers) for rolling, single and double transfers."""
+        yield squad, bank, ()
+        singles = self._single_transfers(squad, bank, shortlists, remaining, singles_limit)
+        for _, out_row, in_row in singles:
+            new_squad = tuple(sorted(set(squad) - {out_row} | {in_row}))
+            yield new_squad, bank + self.cost[out_row] - self.cost[in_row], ((out_row, in_row),)
+        if max_transfers < 2:
+            return
+        for i, (_, out_a, in_a) in enumerate(singles):
+            for _, out_b, in_b in singles[i + 1:]:
+                if out_a == out_b or in_a == in_b:
+                    continue
+                new_squad = tuple(sorted(set(squad) - {out_a, out_b} | {in_a, in_b}))
+                new_bank = bank + self.cost[out_a] + self.cost[out_b] - self.cost[in_a] - self.cost[in_b]
+                if self._valid(new_squad, new_bank):
+                    yield new_squad, new_bank, ((out_a, in_a), (out_b, in_b))
+
+    def _check_squad(self, squad):
+        """Raises ``ValueError`` unless ``squad`` is 15 distinct players meeting the position and club limits."""
+        check_squad(squad, self.element_type, self.team, self.max_per_club)
+
+    def plan(self, squad_ids, bank=0.0, free_transfers=1, horizon=None, beam_width=40,
+             max_transfers=2, singles_limit=15):
+        """Searches transfer sequences and returns the best ``TransferPlan`` found.
+
+        ``bank`` is in millions. Each gameweek the search may roll the transfer,
+        make one transfer, or (with ``max_transfers=2``) two at once. Transfers
+        beyond the free ones cost ``hit_cost`` points. Unused free transfers are
+        banked up to ``max_free_transfers``.
+        """
+        horizon = min(horizon or len(self.gameweeks), len(self.gameweeks))
+        squad = tuple(sorted(self.row_for_id[player_id] for player_id in squad_ids))
+        self._check_squad(squad)
+
+        # Beam entries: (score, banked points, squad, bank, free transfers, history)
+        beam = [(0.0, 0.0, squad, int(round(bank * 10)), free_transfers, ())]
+        for week in range(horizon):
+            shortlists, remaining = self._shortlists(week)
+            candidates = {}
+            for _, banked, squad, bank_tenths, free, history in beam:
+                for new_squad, new_bank, transfers in self._moves(squad, bank_tenths, shortlists, remaining,
+                                                                  max_transfers, singles_limit):
+                    hits = max(0, len(transfers) - free) * self.hit_cost
+                    next_free = min(self.max_free_transfers, max(free - len(transfers), 0) + 1)
+                    values = self.squad_values(new_squad)
+                    new_banked = banked + values[week] - hits
+                    score = new_banked + values[week + 1:horizon].sum()
+                    key = (new_squad, next_free, new_bank)
+                    if key not in candidates or candidates[key][0] < score:
+                        step = (self.gameweeks[week], transfers, hits, values[week])
+                        candidates[key] = (score, new_banked, new_squad, new_bank, next_free, history + (step,))
+            beam = sorted(candidates.values(), key=lambda entry: entry[0], reverse=True)[:beam_width]
+
+        best = max(beam, key=lambda entry: entry[1])
+        return TransferPlan(self._steps_frame(best[5]), best[1])
+
+    def _steps_frame(self, history):
+        """Turns a search history into one row per gameweek with readable transfers."""
+        names = self.player_df['web_name'] if 'web_name' in self.player_df else self.player_df['id'].astype(str)
+        rows = []
+        for gameweek, transfers, hits, points in history:
+            rows.append({
+                'gameweek': gameweek,
+                'transfers_out': [int(self.ids[out_row]) for out_row, _ in transfers],
+                'transfers_in': [int(self.ids[in_row]) for _, in_row in transfers],
+                'summary': ', '.join(f"{names.iloc[out_row]} -> {names.iloc[in_row]}" for out_row, in_row in transfers),
+                'hits': hits,
+                'expected_points': points,
+            })
+        return pd.DataFrame(rows)
@@ -0,0 +1,93 @@
+import numpy as np
+
+# Scoring constants shared by every model
+DIFFICULTY_MULTIPLIER = {1: 1.2, 2: 1.1, 3: 1.0, 4: 0.9, 5: 0.8}
+POSITION_POINTS = {
+    1: {'goal': 10, 'assist': 3, 'clean_sheet': 4},  # Goalkeeper
+    2: {'goal': 6, 'assist': 3, 'clean_sheet': 4},   # Defender
+    3: {'goal': 5, 'assist': 3, 'clean_sheet': 1},   # Midfielder
+    4: {'goal': 4, 'assist': 3, 'clean_sheet': 0},   # Forward
+}
+NEUTRAL_DIFFICULTY = 3
+MINUTES_POINTS = 0.01  # Playing time contribution per minute per game
+APPEARANCE_BONUS = 1   # Added when a player has 60+ minutes
+
+
+def position_lookup(position_points=POSITION_POINTS):
+    """Returns an (n_types, 3) array of goal/assist/clean-sheet points indexed by element_type."""
+    lookup = np.zeros((max(position_points) + 1, 3), dtype=np.float64)
+    for element_type, points in position_points.items():
+        lookup[element_type] = (points['goal'], points['assist'], points['clean_sheet'])
+    return lookup
+
+
+def multiplier_lookup(difficulty_multiplier=DIFFICULTY_MULTIPLIER):
+    """Returns an array of difficulty factors indexed by fixture difficulty (unknown -> 1.0)."""
+    lookup = np.ones(max(difficulty_multiplier) + 1, dtype=np.float64)
+    for difficulty, factor in difficulty_multiplier.items():
+        lookup[difficulty] = factor
+    return lookup
+
+
+def games_played(minutes, rule='clip'):
+    """Approximates games played from minutes using one of the legacy rules.
+
+    ``'clip'`` floors the estimate at one game (``PlayerAnalyzer``), while
+    ``'positive'`` and ``'above_one'`` only use ``minutes / 90`` when minutes are
+    above 0 or 1 respectively (``ml_xp`` and ``xp_fpl``).
+    """
+    games = minutes / 90
+    if rule == 'clip':
+        return np.maximum(games, 1)
+    if rule == 'positive':
+        return np.where(minutes > 0, games, 1.0)
+    if rule == 'above_one':
+        return np.where(minutes > 1, games, 1.0)
+    raise ValueError(f"Unknown games played rule: {rule}")
+
+
+def _take(lookup, index, default):
+    """Looks up ``index`` in ``lookup``, returning ``default`` for out-of-range entries."""
+    index = np.asarray(index)
+    valid = (index >= 0) & (index < len(lookup))
+    out = np.full(index.shape + lookup.shape[1:], default, dtype=lookup.dtype)
+    out[valid] = lookup[index[valid]]
+    return out
+
+
+def base_points(player_df, rule='clip', position_points=POSITION_POINTS, minutes_points=MINUTES_POINTS):
+    """Returns per-game expected points before the fixture adjustment for every player."""
+    minutes = np.asarray(player_df['minutes'], dtype=np.float64)
+    games = games_played(minutes, rule)
+    points = _take(position_lookup(position_points), np.asarray(player_df['element_type'], dtype=np.int64), 0.0)
+    return (
+        (np.asarray(player_df['goals_scored'], dtype=np.float64) / games) * points[:, 0] +
+        (np.asarray(player_df['assists'], dtype=np.float64) / games) * points[:, 1] +
+        (np.asarray(player_df['clean_sheets'], dtype=np.float64) / games) * points[:, 2] +
+        (minutes / games) * minutes_points
+    )
+
+
+def project_expected_points(player_df, fixture_matrix, rule='clip',
+                            difficulty_multiplier=DIFFICULTY_MULTIPLIER, position_points=POSITION_POINTS, base=None,
+                            minutes_points=MINUTES_POINTS, appearance_bonus=APPEARANCE_BONUS):
+    """Projects expected points for every player over every gameweek of ``fixture_matrix``.
+
+    Returns a (players, gameweeks) array computed in one broadcast pass. Each
+    fixture in a double gameweek is scored separately and summed, and a blank
+    gameweek scores zero. ``player_df`` may be any mapping of column arrays.
+    ``base`` reuses ``base_points`` already computed for the same players.
+    ``minutes_points`` and ``appearance_bonus`` override the module constants.
+    """
+    minutes = np.asarray(player_df['minutes'], dtype=np.float64)
+    teams = np.asarray(player_df['team'], dtype=np.int64)
+    known = (teams >= 0) & (teams < fixture_matrix.difficulty.shape[0])
+    difficulty = np.zeros((len(teams),) + fixture_matrix.difficulty.shape[1:], dtype=np.int64)
+    difficulty[known] = fixture_matrix.difficulty[teams[known]]
+
+    factor = _take(multiplier_lookup(difficulty_multiplier), difficulty, 1.0)
+    if base is None:
+        base = base_points(player_df, rule, position_points, minutes_points)
+    per_fixture = base[:, None, None] * factor
+    per_fixture += np.where(minutes >= 60, appearance_bonus, 0)[:, None, None]
+    return np.where(difficulty > 0, per_fixture, 0.0).sum(axis=2)
@@ -0,0 +1,252 @@
+import asyncio
+import json
+import logging
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import numpy as np
+
+from .analyzers import FixtureAnalyzer, PlayerAnalyzer
+from .fpl_data import FPLDataFetcher
+from .query_index import PlayerIndex
+from .squad_evaluator import SquadEvaluator, check_squad, play_probability
+from .storage import FIXTURE_SCHEMA, PLAYER_SCHEMA, read_table
+
+PLAYER_FIELDS = ['id', 'web_name', 'position', 'team', 'now_cost', 'minutes', 'expected_points']
+REASONS = {200: 'OK', 202: 'Accepted', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           500: 'Internal Server Error'}
+
+logger = logging.getLogger(__name__)
+
+
+class ScoredSnapshot:
+    """Immutable, fully scored view of the player pool that request handlers read from.
+
+    Everything a query needs is computed up front: expected points, plain
+    per-column arrays, an id -> row lookup, a ``PlayerIndex`` for top-N,
+    price-bounded and value queries and a ``SquadEvaluator`` for squads. With a ``model_store`` the Random Forest's
+    ``predicted_points`` are added too. Readers never see a half-built
+    snapshot, because the service swaps in a new one with a single assignment.
+    """
+
+    def __init__(self, player_df, fixtures_df, model_store=None):
+        fixture_analyzer = FixtureAnalyzer(fixtures_df)
+        player_analyzer = PlayerAnalyzer(player_df, fixture_analyzer)
+        self.player_df = player_analyzer.player_df.reset_index(drop=True)
+        self.next_gameweek = int(fixture_analyzer.next_gameweek)
+        self.built_at = time.time()
+        self.fields = list(PLAYER_FIELDS)
+        if model_store is not None:
+            from .ml_model import predict_form_points
+
+            self.player_df['predicted_points'], _ = predict_form_points(self.player_df, fixtures_df,
+                                                                        self.next_gameweek, model_store=model_store)
+            self.fields.append('predicted_points')
+
+        self.columns = {field: self.player_df[field].to_numpy() for field in self.fields}
+        self.row_for_id = {int(player_id): row for row, player_id in enumerate(self.columns['id'])}
+        self.index = PlayerIndex(self.player_df)
+        self.element_type = self.player_df['element_type'].to_numpy()
+        self.team = self.player_df['team'].to_numpy()
+        chance = self.player_df.get('chance_of_playing_next_round')
+        self.evaluator = SquadEvaluator(self.columns['expected_points'],
+                                        play_probability(self.player_df['status'], chance), self.element_type)
+
+    def player(self, row):
+        record = {field: self.columns[field][row] for field in self.fields}
+        return {key: value.item() if hasattr(value, 'item') else value for key, value in record.items()}
+
+    def top(self, n=10, position=None, max_cost=None, min_minutes=0, by='points'):
+        """Returns the top ``n`` players by expected points (or points per million) matching the filters."""
+        return [self.player(row) for row in self.index.top(n, position, max_cost, min_minutes, by)]
+
+    def frontier(self, position=None):
+        """Returns the players no cheaper player outscores, cheapest first."""
+        return [self.player(row) for row in self.index.frontier(position)]
+
+    def evaluate_squad(self, player_ids):
+        """Returns the expected points of a 15-man squad, scored like ``fpl-xp team``.
+
+        The squad must be 15 distinct known players meeting the position and
+        club limits. Its best XI, bench order and captaincy come from the
+        ``SquadEvaluator``, so the bench only counts through auto-substitutions
+        weighted by each player's chance of playing. Players are listed in
+        lineup order: the XI, then the bench.
+        """
+        unknown = [player_id for player_id in player_ids if player_id not in self.row_for_id]
+        if unknown:
+            raise ValueError(f"Unknown players {unknown}")
+        rows = [self.row_for_id[player_id] for player_id in player_ids]
+        check_squad(rows, self.element_type, self.team)
+        lineups, captain, vice_captain, total, substituted = self.evaluator.best([rows])
+        lineup = lineups[0].tolist()
+        return {
+            'expected_points': float(total[0]),
+            'substitution_points': float(substituted[0]),
+            'total_cost': float(self.columns['now_cost'][rows].sum() / 10),
+            'captain': int(self.columns['id'][lineup[captain[0]]]),
+            'vice_captain': int(self.columns['id'][lineup[vice_captain[0]]]),
+            'players': [self.player(row) for row in lineup],
+        }
+
+
+def load_from_api(fetcher=None):
+    """Returns fresh (players, fixtures) frames, revalidating the fetcher's cache."""
+    FPLDataFetcher.clear_memory_cache()
+    fetcher = fetcher or FPLDataFetcher()
+    return fetcher.fetch_player_data(), fetcher.fetch_fixture_data()
+
+
+def load_from_files(players_path='fpl_player_data.table', fixtures_path='fixture_info.table'):
+    """Returns (players, fixtures) frames from the tables (or CSV files) ``fpl-xp fetch`` writes."""
+    return read_table(players_path, schema=PLAYER_SCHEMA), read_table(fixtures_path, schema=FIXTURE_SCHEMA)
+
+
+class XPService:
+    """Small asyncio HTTP service answering xP queries from an in-memory snapshot.
+
+    Snapshots are built in a worker thread, so the event loop keeps serving
+    the current one while a refresh runs, and are swapped in atomically.
+
+    Endpoints: ``GET /xp/<id>``, ``GET /top?n=&position=&max_cost=&min_minutes=&by=points|value``,
+    ``GET /frontier?position=``, ``GET /squad?ids=1,2,...``, ``GET /health`` and ``POST /refresh``.
+    """
+
+    def __init__(self, loader=load_from_api, refresh_interval=900, model_store=None):
+        self.loader = loader
+        self.model_store = model_store
+        self.refresh_interval = refresh_interval
+        self.snapshot = None
+        self.refreshes = 0
+        self.last_refresh_error = None
+        self._refresh_lock = asyncio.Lock()
+        self._refresh_tasks = set()
+
+    def _build(self):
+        player_df, fixtures_df = self.loader()
+        return ScoredSnapshot(player_df, fixtures_df, self.model_store)
+
+    async def refresh(self):
+        """Builds a new snapshot off the event loop and swaps it in."""
+        async with self._refresh_lock:
+            snapshot = await asyncio.get_running_loop().run_in_executor(None, self._build)
+            self.snapshot = snapshot
+            self.refreshes += 1
+            self.last_refresh_error = None
+        return snapshot
+
+    def _schedule_refresh(self):
+        """Starts a refresh in the background, keeping the task until it is done."""
+        task = asyncio.ensure_future(self.refresh())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_done)
+
+    def _refresh_failed(self, kind, error):
+        """Logs a failed refresh and keeps it for ``/health``; the last good snapshot stays in service."""
+        logger.error("%s refresh failed", kind, exc_info=error)
+        self.last_refresh_error = {'at': time.time(), 'error': repr(error)}
+
+    def _refresh_done(self, task):
+        self._refresh_tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            self._refresh_failed('Scheduled', task.exception())
+
+    async def _refresh_periodically(self):
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            try:
+                await self.refresh()
+            except Exception as error:
+                self._refresh_failed('Background', error)
+
+    def handle(self, method, target):
+        """Routes one request and returns (status, payload)."""
+        url = urlsplit(target)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        parts = [part for part in url.path.split('/') if part]
+        snapshot = self.snapshot
+        if method == 'POST' and parts == ['refresh']:
+            return 202, None  # Handled asynchronously by the connection handler
+        if method != 'GET':
+            return 405, {'error': f"Method {method} not allowed"}
+        if parts == ['health']:
+            return 200, {'gameweek': snapshot.next_gameweek, 'players': len(snapshot.player_df),
+                         'built_at': snapshot.built_at, 'refreshes': self.refreshes,
+                         'last_refresh_error': self.last_refresh_error}
+        if len(parts) == 2 and parts[0] == 'xp':
+            row = snapshot.row_for_id.get(int(parts[1]))
+            if row is None:
+                return 404, {'error': f"Unknown player {parts[1]}"}
+            return 200, snapshot.player(row)
+        if parts == ['top']:
+            max_cost = float(query['max_cost']) if 'max_cost' in query else None
+            players = snapshot.top(int(query.get('n', 10)), query.get('position'), max_cost,
+                                   int(query.get('min_minutes', 0)), query.get('by', 'points'))
+            return 200, {'gameweek': snapshot.next_gameweek, 'players': players}
+        if parts == ['frontier']:
+            return 200, {'gameweek': snapshot.next_gameweek, 'players': snapshot.frontier(query.get('position'))}
+        if parts == ['squad']:
+            ids = [int(player_id) for player_id in query.get('ids', '').split(',') if player_id]
+            return 200, snapshot.evaluate_squad(ids)
+        return 404, {'error': f"No route for {url.path}"}
+
+    async def _handle_connection(self, reader, writer):
+        """Serves HTTP/1.1 requests on one keep-alive connection."""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                keep_alive, length = True, 0
+                while True:
+                    header = await reader.readline()
+                    if header in (b'\r\n', b'\n', b''):
+                        break
+                    name, _, value = header.decode('latin-1').partition(':')
+                    name, value = name.strip().lower(), value.strip()
+                    if name == 'connection' and value.lower() == 'close':
+                        keep_alive = False
+                    elif name == 'content-length':
+                        length = int(value) if value.isdigit() else 0
+                        keep_alive = keep_alive and value.isdigit()  # Without a length the next request is lost
+                # Bodies are not used by any route, but must be read to reach the next request
+                await reader.readexactly(length)
+                try:
+                    request = request_line.decode('latin-1').split(' ', 2)
+                    if len(request) != 3:
+                        raise ValueError(f"Malformed request line: {request_line[:100]!r}")
+                    method, target, _ = request
+                    status, payload = self.handle(method, target)
+                    if status == 202:
+                        self._schedule_refresh()
+                        payload = {'status': 'refresh scheduled'}
+                except (KeyError, ValueError) as error:
+                    status, payload = 400, {'error': str(error)}
+                except Exception as error:
+                    status, payload = 500, {'error': repr(error)}
+                body = json.dumps(payload).encode()
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode() + body
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host='127.0.0.1', port=8080):
+        """Loads the first snapshot, starts the background refresh and returns the server."""
+        await self.refresh()
+        self._refresher = asyncio.ensure_future(self._refresh_periodically())
+        return await asyncio.start_server(self._handle_connection, host, port)
+
+    async def serve_forever(self, host='127.0.0.1', port=8080):
+        server = await self.start(host, port)
+        address = server.sockets[0].getsockname()
+        print(f"Serving xP for gameweek {self.snapshot.next_gameweek} on http://{address[0]}:{address[1]}")
+        async with server:
+            await server.serve_forever()
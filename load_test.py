@@ -0,0 +1,128 @@
+import argparse
+import asyncio
+import json
+import random
+import time
+
+import numpy as np
+
+from fpl_xp.model_store import ModelStore
+from fpl_xp.query_index import POSITIONS
+from fpl_xp.squad_evaluator import MAX_PER_CLUB
+from fpl_xp.xp_service import XPService, load_from_files
+
+
+async def _request(reader, writer, host, target):
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n\r\n".encode())
+    await writer.drain()
+    status = int((await reader.readline()).split()[1])
+    length = 0
+    while True:
+        header = await reader.readline()
+        if header in (b'\r\n', b'\n', b''):
+            break
+        name, _, value = header.decode('latin-1').partition(':')
+        if name.strip().lower() == 'content-length':
+            length = int(value)
+    body = await reader.readexactly(length)
+    return status, body
+
+
+async def _client(host, port, targets, latencies, errors):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for target in targets:
+            start = time.perf_counter()
+            status, _ = await _request(reader, writer, host, target)
+            latencies.append(time.perf_counter() - start)
+            if status != 200:
+                errors.append((status, target))
+    finally:
+        writer.close()
+
+
+def query_mix(snapshot, n_requests, seed=0):
+    """Returns a random mix of xP, top-N and squad queries against ``snapshot``."""
+    rng = random.Random(seed)
+    ids = [int(player_id) for player_id in snapshot.columns['id']]
+    positions = list(POSITIONS)
+    by_position = {position: [int(snapshot.columns['id'][row])
+                              for row in snapshot.index.partitions[element_type].by_points]
+                   for position, element_type in POSITIONS.items()}
+    quotas = dict(zip(positions, (2, 5, 5, 3)))
+    targets = []
+    for _ in range(n_requests):
+        kind = rng.random()
+        if kind < 0.6:
+            targets.append(f"/xp/{rng.choice(ids)}")
+        elif kind < 0.9:
+            max_cost = rng.choice([4.5, 5.5, 7.0, 9.0, 15.0])
+            targets.append(f"/top?position={rng.choice(positions)}&max_cost={max_cost}&n=10")
+        else:
+            squad, clubs = [], {}  # Random valid squad: position quotas and at most MAX_PER_CLUB per club
+            for position, quota in quotas.items():
+                candidates = rng.sample(by_position[position], len(by_position[position]))
+                picked = 0
+                for player_id in candidates:
+                    club = snapshot.team[snapshot.row_for_id[player_id]]
+                    if picked < quota and clubs.get(club, 0) < MAX_PER_CLUB:
+                        squad.append(player_id)
+                        clubs[club] = clubs.get(club, 0) + 1
+                        picked += 1
+            targets.append(f"/squad?ids={','.join(map(str, squad))}")
+    return targets
+
+
+async def run_load_test(service, host='127.0.0.1', port=0, clients=50, requests_per_client=200, refresh=True):
+    """Serves ``service`` in-process, fires concurrent keep-alive clients at it and returns latency stats.
+
+    With ``refresh`` a snapshot refresh is triggered mid-run, so the numbers
+    include readers served while a new snapshot is being built.
+    """
+    server = await service.start(host, port)
+    port = server.sockets[0].getsockname()[1]
+    targets = query_mix(service.snapshot, clients * requests_per_client)
+    latencies, errors = [], []
+    try:
+        start = time.perf_counter()
+        tasks = [_client(host, port, targets[i::clients], latencies, errors) for i in range(clients)]
+        if refresh:
+            tasks.append(service.refresh())
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - start
+    finally:
+        server.close()
+        await server.wait_closed()
+
+    latencies = np.array(latencies) * 1000
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'clients': clients,
+        'seconds': elapsed,
+        'throughput': len(latencies) / elapsed,
+        'p50_ms': float(np.percentile(latencies, 50)),
+        'p90_ms': float(np.percentile(latencies, 90)),
+        'p99_ms': float(np.percentile(latencies, 99)),
+        'max_ms': float(latencies.max()),
+        'refreshes': service.refreshes,
+    }
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Load test the xP query service with concurrent clients.')
+    parser.add_argument('--clients', type=int, default=50)
+    parser.add_argument('--requests', type=int, default=200, help='Requests per client')
+    parser.add_argument('--players', default='fpl_player_data.table')
+    parser.add_argument('--fixtures', default='fixture_info.table')
+    parser.add_argument('--no-model', action='store_true', help='Skip the Random Forest predictions')
+    parser.add_argument('--no-refresh', action='store_true', help='Do not refresh the snapshot during the run')
+    args = parser.parse_args()
+
+    service = XPService(lambda: load_from_files(args.players, args.fixtures), refresh_interval=3600,
+                        model_store=None if args.no_model else ModelStore())
+    stats = asyncio.run(run_load_test(service, clients=args.clients, requests_per_client=args.requests,
+                                      refresh=not args.no_refresh))
+    print(json.dumps(stats, indent=1))
+    print(f"{stats['requests']} requests from {stats['clients']} clients: "
+          f"p50 {stats['p50_ms']:.2f} ms, p99 {stats['p99_ms']:.2f} ms, {stats['throughput']:.0f} req/s")